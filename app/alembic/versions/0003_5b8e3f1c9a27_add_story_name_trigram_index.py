@@ -0,0 +1,34 @@
+"""add story name trigram index
+
+Revision ID: 5b8e3f1c9a27
+Revises: 124dd29824ec
+Create Date: 2024-03-18 11:24:06.513942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e3f1c9a27'
+down_revision: Union[str, None] = '124dd29824ec'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    op.create_index(
+        'ix_story_name_trgm',
+        'story',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_story_name_trgm', table_name='story', postgresql_using='gin')
@@ -0,0 +1,40 @@
+"""cascade page story foreign key
+
+Revision ID: 9c4d2a7e1f3b
+Revises: 5b8e3f1c9a27
+Create Date: 2024-03-25 10:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d2a7e1f3b'
+down_revision: Union[str, None] = '5b8e3f1c9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('fk_page_story_id_story', 'page', type_='foreignkey')
+    op.create_foreign_key(
+        'fk_page_story_id_story',
+        'page',
+        'story',
+        ['story_id'],
+        ['id'],
+        ondelete='CASCADE',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_page_story_id_story', 'page', type_='foreignkey')
+    op.create_foreign_key(
+        'fk_page_story_id_story',
+        'page',
+        'story',
+        ['story_id'],
+        ['id'],
+    )
@@ -0,0 +1,73 @@
+"""add story filter indexes
+
+Revision ID: e1a6b3c8d402
+Revises: 9c4d2a7e1f3b
+Create Date: 2024-03-27 14:05:19.734520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a6b3c8d402'
+down_revision: Union[str, None] = '9c4d2a7e1f3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_page_story_id',
+            'page',
+            ['story_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_story_story_type_id',
+            'story',
+            ['story_type', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_story_enabled_id',
+            'story',
+            ['id'],
+            unique=False,
+            postgresql_where=sa.text('NOT is_disabled'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_story_enabled_publication_window',
+            'story',
+            ['publication_start_time', 'publication_end_time'],
+            unique=False,
+            postgresql_where=sa.text('NOT is_disabled'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name in (
+            ('ix_story_enabled_publication_window', 'story'),
+            ('ix_story_enabled_id', 'story'),
+            ('ix_story_story_type_id', 'story'),
+            ('ix_page_story_id', 'page'),
+        ):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,95 @@
+"""add story published window index
+
+The upgrade fails, changing nothing, while any story has a publication
+end before its start. Those rows have to be fixed by hand first, the
+error lists their ids.
+
+Revision ID: 3f7b9d15c2e8
+Revises: e1a6b3c8d402
+Create Date: 2024-04-02 16:48:33.120947
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7b9d15c2e8'
+down_revision: Union[str, None] = 'e1a6b3c8d402'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Ids of stories with an inverted publication window listed in the error
+_REPORTED_IDS = 100
+
+
+def upgrade() -> None:
+    # tstzrange() rejects an upper bound below the lower one, and rewriting
+    # such windows here could not be undone by the downgrade
+    inverted = op.get_bind().execute(
+        sa.text(
+            'SELECT id FROM story WHERE publication_end_time < publication_start_time ORDER BY id',
+        ),
+    ).scalars().all()
+    if inverted:
+        listed = ', '.join(map(str, inverted[:_REPORTED_IDS]))
+        more = f' and {len(inverted) - _REPORTED_IDS} more' if len(inverted) > _REPORTED_IDS else ''
+        msg = (
+            f'{len(inverted)} stories have a publication end before their start: {listed}{more}. '
+            'Fix their publication windows before upgrading.'
+        )
+        raise RuntimeError(msg)
+
+    # Checked for new writes right away, existing rows are validated below
+    # without blocking writes meanwhile
+    op.create_check_constraint(
+        'publication_window',
+        'story',
+        'publication_start_time <= publication_end_time',
+        postgresql_not_valid=True,
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text('ALTER TABLE story VALIDATE CONSTRAINT ck_story_publication_window'))
+
+        op.create_index(
+            'ix_story_published_window',
+            'story',
+            [sa.text("tstzrange(publication_start_time, publication_end_time, '[)')")],
+            unique=False,
+            postgresql_using='gist',
+            postgresql_where=sa.text('NOT is_disabled'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Superseded, a B-tree cannot answer "now is inside the window"
+        op.drop_index(
+            'ix_story_enabled_publication_window',
+            table_name='story',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_story_enabled_publication_window',
+            'story',
+            ['publication_start_time', 'publication_end_time'],
+            unique=False,
+            postgresql_where=sa.text('NOT is_disabled'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_story_published_window',
+            table_name='story',
+            postgresql_using='gist',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    op.drop_constraint(op.f('ck_story_publication_window'), 'story', type_='check')
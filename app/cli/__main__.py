@@ -0,0 +1,21 @@
+import argparse
+import asyncio
+import sys
+from collections.abc import Sequence
+
+from app.cli import import_stories
+from app.infrastructure.logging import configure_logging
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m app.cli')
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_stories.add_parser(commands)
+
+    args = parser.parse_args(argv)
+    configure_logging()
+    return asyncio.run(args.handler(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
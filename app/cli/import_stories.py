@@ -0,0 +1,292 @@
+"""Bulk import of stories and their pages with binary `COPY`.
+
+Input is read and validated in chunks, each chunk is loaded in its own
+transaction. Progress is saved to a state file after every committed
+chunk, so an interrupted import resumes from the first chunk that was
+not loaded. The state file is removed once the import completes. A
+crash between a commit and the state file write replays that chunk,
+which then fails on the primary key of the story table.
+
+Story and page ids from the input are kept, missing story ids are taken
+from the story sequence, so a file should either carry all ids or none.
+Both sequences are moved past the largest id once the import is done.
+
+Formats:
+    ndjson - one story resource object per line, as produced by
+        `GET /api/manager/stories/export/`
+    csv - a header row with story attribute names (`story-type` or
+        `story_type`), nullable ones may be left out, optional `id` and
+        `pages` columns, page ids in `pages` are separated by spaces
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+import types
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Final, Literal, TextIO
+
+import asyncpg
+import orjson
+from pydantic import ValidationError
+
+from app.config import settings
+from app.rest_api.manager.story.schemas import StoryAttributes, StoryObject
+from app.rest_api.utils import to_kebab_case
+from app.seedwork.utils.dt import get_utc_now
+from app.seedwork.utils.types import DictStrAny
+
+
+__all__ = [
+    'ImportOptions',
+    'StoryImportError',
+    'add_parser',
+    'import_stories',
+]
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal['ndjson', 'csv']
+
+_STORY_COLUMNS: Final = (
+    'id',
+    *StoryAttributes.model_fields,
+    'created_at',
+    'modified_at',
+)
+_PAGE_COLUMNS: Final = ('id', 'story_id', 'created_at', 'modified_at')
+
+# Exported documents and CSV files may leave out null attributes
+_NULLABLE_ATTRIBUTES: Final = tuple(
+    name
+    for name, field in StoryAttributes.model_fields.items()
+    if isinstance(field.annotation, types.UnionType) and types.NoneType in field.annotation.__args__
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ImportOptions:
+    path: Path
+    format: ImportFormat
+    chunk_size: int
+    state_path: Path
+    restart: bool
+    skip_invalid: bool
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class _StoryRow:
+    id: int | None
+    attributes: StoryAttributes
+    page_ids: list[int]
+
+
+class StoryImportError(Exception):
+    pass
+
+
+def add_parser(commands: 'argparse._SubParsersAction[Any]') -> None:
+    parser = commands.add_parser(
+        'import-stories',
+        help='load stories and pages from a CSV or NDJSON file',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('path', type=Path)
+    parser.add_argument('--format', choices=('ndjson', 'csv'), help='defaults to the file extension')
+    parser.add_argument('--chunk-size', type=int, default=settings.story.IMPORT_CHUNK_SIZE)
+    parser.add_argument('--state-file', type=Path, help='defaults to <path>.import-state.json')
+    parser.add_argument('--restart', action='store_true', help='ignore the saved progress')
+    parser.add_argument('--skip-invalid', action='store_true', help='log and skip invalid rows')
+    parser.set_defaults(handler=_handle)
+
+
+async def _handle(args: argparse.Namespace) -> int:
+    path: Path = args.path
+    options = ImportOptions(
+        path=path,
+        format=args.format or ('csv' if path.suffix.lower() == '.csv' else 'ndjson'),
+        chunk_size=args.chunk_size,
+        state_path=args.state_file or path.with_name(f'{path.name}.import-state.json'),
+        restart=args.restart,
+        skip_invalid=args.skip_invalid,
+    )
+    try:
+        await import_stories(options)
+    except StoryImportError as e:
+        logger.error('Import failed: %s', e)  # noqa: TRY400
+        return 1
+    return 0
+
+
+async def import_stories(options: ImportOptions) -> None:
+    done = 0 if options.restart else _load_state(options)
+    if done:
+        logger.info('Resuming %s after chunk %d', options.path, done)
+
+    db = settings.database
+    conn = await asyncpg.connect(
+        host=db.HOST,
+        port=db.PORT,
+        user=db.USER,
+        password=db.PASSWORD,
+        database=db.NAME,
+    )
+    try:
+        started = time.monotonic()
+        stories = pages = 0
+        with options.path.open(newline='', encoding='utf-8') as file:
+            chunks = _iter_chunks(_read_rows(file, options.format), options.chunk_size)
+            for number, chunk in enumerate(chunks, start=1):
+                if number <= done:
+                    continue
+                rows = _validate(chunk, skip_invalid=options.skip_invalid)
+                chunk_stories, chunk_pages = await _copy_chunk(conn, rows)
+                _save_state(options, number)
+
+                stories += chunk_stories
+                pages += chunk_pages
+                elapsed = time.monotonic() - started
+                logger.info(
+                    'Chunk %d loaded: %d stories, %d pages in total, %.0f rows/s',
+                    number,
+                    stories,
+                    pages,
+                    (stories + pages) / elapsed if elapsed else 0,
+                )
+
+        await _reset_sequences(conn)
+        options.state_path.unlink(missing_ok=True)
+    finally:
+        await conn.close()
+    logger.info('Imported %d stories and %d pages from %s', stories, pages, options.path)
+
+
+def _read_rows(file: TextIO, format_: ImportFormat) -> Iterator[tuple[int, Any]]:
+    """Yield raw rows with their line numbers."""
+    if format_ == 'csv':
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(file, start=1):
+        if line.strip():
+            yield line_number, line
+
+
+def _iter_chunks(
+    rows: Iterable[tuple[int, Any]],
+    size: int,
+) -> Iterator[list[tuple[int, Any]]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _validate(chunk: list[tuple[int, Any]], *, skip_invalid: bool) -> list[_StoryRow]:
+    rows = []
+    for line_number, raw in chunk:
+        try:
+            rows.append(_parse_line(raw) if isinstance(raw, str) else _parse_csv_row(raw))
+        except (ValidationError, ValueError) as e:
+            if not skip_invalid:
+                msg = f'line {line_number}: {e}'
+                raise StoryImportError(msg) from e
+            logger.warning('Skipping invalid line %d: %s', line_number, e)
+    return rows
+
+
+def _parse_line(line: str) -> _StoryRow:
+    document = orjson.loads(line)
+    if isinstance(document, dict) and isinstance(attributes := document.get('attributes'), dict):
+        _fill_nullable(attributes)
+    story = StoryObject.model_validate(document)
+    pages = story.relationships.pages
+    return _StoryRow(
+        id=int(story.id) if story.id else None,
+        attributes=story.attributes,
+        page_ids=[int(page.id) for page in pages.data if page.id] if pages else [],
+    )
+
+
+def _parse_csv_row(row: dict[str, str]) -> _StoryRow:
+    values: DictStrAny = {key: value or None for key, value in row.items() if key}
+    id_ = values.pop('id', None)
+    page_ids = values.pop('pages', None) or ''
+    _fill_nullable(values)
+    return _StoryRow(
+        id=int(id_) if id_ else None,
+        attributes=StoryAttributes.model_validate(values),
+        page_ids=[int(page_id) for page_id in page_ids.split()],
+    )
+
+
+def _fill_nullable(attributes: DictStrAny) -> None:
+    """Set left out nullable attributes to `None`, given in either case."""
+    for name in _NULLABLE_ATTRIBUTES:
+        if name not in attributes and (key := to_kebab_case(name)) not in attributes:
+            attributes[key] = None
+
+
+async def _copy_chunk(conn: asyncpg.Connection, rows: list[_StoryRow]) -> tuple[int, int]:
+    now = get_utc_now()
+    async with conn.transaction():
+        missing = sum(row.id is None for row in rows)
+        new_ids = iter(
+            await conn.fetchval(
+                "SELECT array_agg(nextval(pg_get_serial_sequence('story', 'id'))) "
+                'FROM generate_series(1, $1)',
+                missing,
+            )
+            if missing
+            else (),
+        )
+
+        stories = []
+        pages = []
+        for row in rows:
+            story_id = row.id if row.id is not None else next(new_ids)
+            stories.append((story_id, *row.attributes.model_dump().values(), now, now))
+            pages.extend((page_id, story_id, now, now) for page_id in row.page_ids)
+
+        if stories:
+            await conn.copy_records_to_table('story', records=stories, columns=_STORY_COLUMNS)
+        if pages:
+            await conn.copy_records_to_table('page', records=pages, columns=_PAGE_COLUMNS)
+    return len(stories), len(pages)
+
+
+async def _reset_sequences(conn: asyncpg.Connection) -> None:
+    for table in ('story', 'page'):
+        await conn.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "  # noqa: S608
+            f'coalesce(max(id), 1), max(id) IS NOT NULL) FROM {table}',
+        )
+
+
+def _load_state(options: ImportOptions) -> int:
+    try:
+        state = json.loads(options.state_path.read_text())
+    except FileNotFoundError:
+        return 0
+    if state.get('path') != str(options.path.resolve()) or state.get('chunk_size') != options.chunk_size:
+        msg = f'{options.state_path} belongs to another import, pass --restart to ignore it'
+        raise StoryImportError(msg)
+    return int(state['chunks'])
+
+
+def _save_state(options: ImportOptions, chunks: int) -> None:
+    state = {
+        'path': str(options.path.resolve()),
+        'chunk_size': options.chunk_size,
+        'chunks': chunks,
+    }
+    tmp_path = options.state_path.with_name(f'{options.state_path.name}.tmp')
+    tmp_path.write_text(json.dumps(state))
+    os.replace(tmp_path, options.state_path)
@@ -1,10 +1,10 @@
 import logging
 from enum import StrEnum
 from pathlib import Path
-from typing import Final
+from typing import Final, Self
 from urllib.parse import quote_plus
 
-from pydantic import Field, RedisDsn
+from pydantic import Field, RedisDsn, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from sqlalchemy.engine.url import URL
 
@@ -18,6 +18,22 @@ class Environment(StrEnum):
     prod = 'prod'
 
 
+class StatementCacheMode(StrEnum):
+    # Named prepared statements, cached per connection
+    direct = 'direct'
+    # Uniquely named statements, safe behind pgbouncer in transaction mode
+    pgbouncer = 'pgbouncer'
+    # Unnamed statements, prepared again on every execution
+    disabled = 'disabled'
+
+
+class TracingExporter(StrEnum):
+    # Spans as JSON lines appended to `TRACING_FILE_PATH`
+    file = 'file'
+    # Spans kept in process, see `app.infrastructure.tracing.configure_tracing`
+    memory = 'memory'
+
+
 class BaseEnvSettings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=ROOT_DIR / '.env',
@@ -48,12 +64,37 @@ class DatabaseSettings(BaseEnvSettings):
     # DB connection
     ECHO: bool = False
 
-    # DB Pool
-    POOL_MIN_SIZE: int = 1
-    POOL_MAX_SIZE: int = 10
+    # DB Pool, connections kept open and upper bound of open connections
+    POOL_MIN_SIZE: int = Field(1, ge=1)
+    POOL_MAX_SIZE: int = Field(10, ge=1)
     POOL_TIMEOUT: int = 30
     POOL_PRE_PING: bool = False
 
+    # Prepared statements, see `StatementCacheMode`. Behind pgbouncer the
+    # cache only pays off with `max_prepared_statements` enabled there,
+    # otherwise use `disabled`.
+    STATEMENT_CACHE_MODE: StatementCacheMode = StatementCacheMode.direct
+    # Prepared statements kept per connection
+    STATEMENT_CACHE_SIZE: int = Field(500, ge=1)
+
+    # Read replicas, as `host` or `host:port`, sharing the primary credentials
+    REPLICA_HOSTS: list[str] = []
+    # Reads of a client stay on the primary this long after its last write
+    REPLICA_STICKY_SECONDS: float = 5
+    # Replicas are checked in the background this often, see `REPLICA_MAX_LAG_SECONDS`
+    REPLICA_CHECK_INTERVAL_SECONDS: float = Field(5, gt=0)
+    # A replica replaying writes later than this gets no reads until it catches up
+    REPLICA_MAX_LAG_SECONDS: float = 10
+    # Bounds the availability check, a replica that does not answer is skipped
+    REPLICA_CONNECT_TIMEOUT_SECONDS: float = 2
+
+    @model_validator(mode='after')
+    def check_pool_sizes(self) -> Self:
+        if self.POOL_MIN_SIZE > self.POOL_MAX_SIZE:
+            msg = 'POOL_MIN_SIZE must not exceed POOL_MAX_SIZE'
+            raise ValueError(msg)
+        return self
+
     def dsn(self) -> URL:
         return URL.create(
             drivername='postgresql+asyncpg',
@@ -64,6 +105,13 @@ class DatabaseSettings(BaseEnvSettings):
             database=self.NAME,
         )
 
+    def replica_dsns(self) -> list[URL]:
+        dsns = []
+        for replica in self.REPLICA_HOSTS:
+            host, _, port = replica.partition(':')
+            dsns.append(self.dsn().set(host=host, port=int(port) if port else self.PORT))
+        return dsns
+
 
 class RedisSettings(BaseEnvSettings):
     """Redis settings for the application.
@@ -113,6 +161,39 @@ class OpenAPISettings(BaseEnvSettings):
     CONTACT_NAME: str = 'GS-Labs'
 
 
+class LocalCacheSettings(BaseEnvSettings):
+    """Per-process in-memory caches.
+
+    Prefix all environment variables with `LOCAL_CACHE_`, e.g., `LOCAL_CACHE_MAX_ITEMS`.
+    """
+
+    model_config = SettingsConfigDict(env_prefix='LOCAL_CACHE_')
+
+    ENABLED: bool = True
+    # Upper bound of cached stories per worker process
+    MAX_ITEMS: int = 10_000
+    # Safety net in case an invalidation message is lost
+    TTL_SECONDS: int = 30
+    # Redis pub/sub channel used to invalidate entries in every worker
+    INVALIDATION_CHANNEL: str = 'story-invalidation'
+    # Rendered JSON:API documents, checked against the story version on read
+    RENDER_MAX_ITEMS: int = 10_000
+    RENDER_TTL_SECONDS: int = 300
+
+
+class HttpCacheSettings(BaseEnvSettings):
+    """Cache-Control headers of conditional GET routes.
+
+    Prefix all environment variables with `HTTP_CACHE_`, e.g., `HTTP_CACHE_STORY_LIST`.
+    """
+
+    model_config = SettingsConfigDict(env_prefix='HTTP_CACHE_')
+
+    STORY_LIST: str = 'no-cache'
+    STORY_DETAIL: str = 'no-cache'
+    STORY_FEED: str = 'no-cache'
+
+
 class TaskSettings(BaseEnvSettings):
     model_config = SettingsConfigDict(env_prefix='TASK_')
 
@@ -127,12 +208,65 @@ class TaskSettings(BaseEnvSettings):
 class StorySettings(BaseEnvSettings):
     model_config = SettingsConfigDict(env_prefix='STORY_')
 
+    # Redis read-through cache of single stories
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 300
+    # Invalidated entries are held back this long, so reads that started
+    # before a write cannot cache the old story again. Must exceed the
+    # duration of a single-story read.
+    CACHE_TOMBSTONE_SECONDS: int = 10
+
+    # Rows fetched from the server-side cursor per export chunk
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # Rows validated and loaded per transaction by `python -m app.cli import-stories`
+    IMPORT_CHUNK_SIZE: int = 5000
+
+    # Upper bound of operations in one atomic operations request
+    ATOMIC_MAX_OPERATIONS: int = 5000
+
+
+class FeedSettings(BaseEnvSettings):
+    """In-memory snapshot behind the client story feed.
+
+    Prefix all environment variables with `FEED_`, e.g., `FEED_MAX_AGE_SECONDS`.
+    """
+
+    model_config = SettingsConfigDict(env_prefix='FEED_')
+
+    ENABLED: bool = True
+    # Rebuild at least this often, in case an invalidation message is lost
+    MAX_AGE_SECONDS: float = 60
+    # Wait after an invalidation so a burst of writes triggers a single rebuild
+    DEBOUNCE_SECONDS: float = 0.5
+    # Delay before retrying a failed rebuild, the previous snapshot is kept meanwhile
+    RETRY_SECONDS: float = 5
+
+
+class TracingSettings(BaseEnvSettings):
+    """OpenTelemetry tracing of requests and worker jobs.
+
+    Prefix all environment variables with `TRACING_`, e.g., `TRACING_SAMPLE_RATE`.
+    """
+
+    model_config = SettingsConfigDict(env_prefix='TRACING_')
+
+    ENABLED: bool = False
+    # Share of new traces recorded, spans continuing a trace follow its decision
+    SAMPLE_RATE: float = Field(1.0, ge=0, le=1)
+    EXPORTER: TracingExporter = TracingExporter.file
+    FILE_PATH: Path = ROOT_DIR / 'traces.jsonl'
+
 
 app = AppSettings()
 database = DatabaseSettings()
 redis = RedisSettings()
+local_cache = LocalCacheSettings()
+http_cache = HttpCacheSettings()
 sentry = SentrySettings()
 server = ServerSettings()
 openapi = OpenAPISettings()
 task = TaskSettings()
 story = StorySettings()
+feed = FeedSettings()
+tracing = TracingSettings()
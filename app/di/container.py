@@ -1,26 +1,42 @@
 from collections.abc import Iterable
 from functools import cache
 from itertools import chain
-from typing import Any
+from typing import Any, TypeVar
 
-from aioinject import Container
+from aioinject import Container, InjectionContext
 from aioinject.providers import Provider
 
 from app import infrastructure
+from app.config import settings
+from app.infrastructure.tracing import tracer
 from app.modules import story
 
 
 __all__ = ['create_container']
 
+_T = TypeVar('_T')
+
 _modules: Iterable[Iterable[Provider[Any]]] = (
     infrastructure.providers,
     story.providers,
 )
 
 
+class _TracedInjectionContext(InjectionContext):
+    async def resolve(self, type_: type[_T]) -> _T:
+        # Dependencies are resolved recursively, so spans nest like the graph
+        with tracer.start_as_current_span(f'resolve {getattr(type_, "__name__", type_)}'):
+            return await super().resolve(type_)
+
+
+class _TracedContainer(Container):
+    def context(self) -> InjectionContext:
+        return _TracedInjectionContext(container=self, singletons=self._singletons)
+
+
 @cache
 def create_container() -> Container:
-    container = Container()
+    container = _TracedContainer() if settings.tracing.ENABLED else Container()
 
     for provider in chain.from_iterable(_modules):
         container.register(provider)
@@ -1,8 +1,22 @@
 from .base import Base
-from .manager import db_manager
+from .manager import (
+    ReadOnlySession,
+    db_manager,
+    is_read_only,
+    on_commit,
+    pin_to_primary,
+    read_snapshot,
+    release_connection,
+)
 
 
 __all__ = [
     'Base',
+    'ReadOnlySession',
     'db_manager',
+    'is_read_only',
+    'on_commit',
+    'pin_to_primary',
+    'read_snapshot',
+    'release_connection',
 ]
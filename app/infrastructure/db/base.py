@@ -27,8 +27,8 @@ class Base(AsyncAttrs, DeclarativeBase):
         },
     )
 
-    created_at: Mapped[datetime] = mapped_column(default=get_utc_now())
+    created_at: Mapped[datetime] = mapped_column(default=get_utc_now)
     modified_at: Mapped[datetime] = mapped_column(
-        default=get_utc_now(),
-        onupdate=get_utc_now(),
+        default=get_utc_now,
+        onupdate=get_utc_now,
     )
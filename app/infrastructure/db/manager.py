@@ -1,7 +1,16 @@
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+import asyncio
+import itertools
+import logging
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Sequence
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Final, NewType, cast
 
+from sqlalchemy import text
 from sqlalchemy.engine.url import URL
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncEngine,
@@ -10,46 +19,266 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from app.config.settings import database
+from app.config.settings import StatementCacheMode, database, tracing
+from app.infrastructure.db.pool import InstrumentedPool
+from app.infrastructure.tracing import instrument_engine
+from app.seedwork.utils.types import DictStrAny
+
+
+__all__ = [
+    'DatabaseSessionManager',
+    'ReadOnlySession',
+    'db_manager',
+    'is_read_only',
+    'on_commit',
+    'pin_to_primary',
+    'read_snapshot',
+    'release_connection',
+]
+
+logger = logging.getLogger(__name__)
+
+_ON_COMMIT_KEY: Final = 'on_commit'
+_READ_ONLY_KEY: Final = 'read_only'
+_SNAPSHOT_KEY: Final = 'snapshot'
+
+# Reads spanning several statements, see `read_snapshot()`
+_SNAPSHOT_OPTIONS: Final = {'isolation_level': 'REPEATABLE READ', 'postgresql_readonly': True}
+
+# Seconds the replica's replay is behind the primary. With everything it
+# received replayed it is caught up, pg_last_xact_replay_timestamp() does
+# not move while the primary is idle. NULL when not replicating at all.
+_SELECT_REPLICATION_LAG: Final = text(
+    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END',
+)
+
+# Session of `DatabaseSessionManager.read_session`, provided apart from the
+# primary `AsyncSession` so that only code asking for it reads from replicas
+ReadOnlySession = NewType('ReadOnlySession', AsyncSession)
+
+# Set for scopes that must see the latest writes, see `pin_to_primary()`
+_primary_pinned: ContextVar[bool] = ContextVar('db_primary_pinned', default=False)
+
+
+@contextmanager
+def pin_to_primary() -> Iterator[None]:
+    """Open the read-only sessions of the block on the primary.
+
+    Replicas lag behind the primary, this lets a client read its own
+    recent writes.
+    """
+    token = _primary_pinned.set(True)
+    try:
+        yield
+    finally:
+        _primary_pinned.reset(token)
+
+
+@dataclass(slots=True, kw_only=True)
+class _Replica:
+    engine: AsyncEngine
+    # Read-only sessions, replicas are never written to
+    session_factory: async_sessionmaker[AsyncSession]
+    # Set by `DatabaseSessionManager.check_replicas()`, unavailable
+    # replicas get no reads
+    available: bool = True
+
+    def set_available(self, available: bool, reason: object = None) -> None:
+        if available and not self.available:
+            logger.info('Replica %s is available again', self.engine.url)
+        elif not available and self.available:
+            logger.warning('Replica %s is unavailable: %s', self.engine.url, reason)
+        self.available = available
 
 
 class DatabaseSessionManager:
     def __init__(self) -> None:
         self._engine: AsyncEngine | None = None
         self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._read_session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._replicas: list[_Replica] = []
+        self._next_replica: Iterator[_Replica] = iter(())
 
-    def init(self, db_dsn: URL) -> None:
-        self._engine = create_async_engine(
-            db_dsn,
-            echo=database.ECHO,
-            pool_size=database.POOL_MIN_SIZE,
-            max_overflow=database.POOL_MAX_SIZE,
-            pool_timeout=database.POOL_TIMEOUT,
-            pool_pre_ping=database.POOL_PRE_PING,
-        )
-        self._session_factory = async_sessionmaker(
-            bind=self._engine,
-            expire_on_commit=False,  # don't expire objects after transaction commit
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replicas)
+
+    def init(self, db_dsn: URL, replica_dsns: Sequence[URL] = ()) -> None:
+        self._engine = self._create_engine(db_dsn)
+        self._session_factory = _create_session_factory(self._engine)
+        self._read_session_factory = _create_read_session_factory(self._engine)
+        for replica_dsn in replica_dsns:
+            # Replicas reject writes anyway, read-only transactions fail earlier
+            engine = self._create_engine(
+                replica_dsn,
+                execution_options={'postgresql_readonly': True},
+                connect_args={'timeout': database.REPLICA_CONNECT_TIMEOUT_SECONDS},
+            )
+            self._replicas.append(
+                _Replica(engine=engine, session_factory=_create_read_session_factory(engine)),
+            )
+        self._next_replica = itertools.cycle(self._replicas)
+
+    async def warm_up(self) -> None:
+        """Open `POOL_MIN_SIZE` connections of every pool ahead of the first requests.
+
+        Failures are only logged, the pools connect on demand as before.
+        """
+        for name, engine in self._engines():
+            connections = [engine.connect() for _ in range(database.POOL_MIN_SIZE)]
+            results = await asyncio.gather(
+                *(connection.start() for connection in connections),
+                return_exceptions=True,
+            )
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                logger.warning('Failed to warm up the %s connection pool: %s', name, errors[0])
+            for connection, result in zip(connections, results, strict=True):
+                if not isinstance(result, BaseException):
+                    await connection.close()
+
+    async def check_replicas(self) -> None:
+        """Take replicas out of rotation while unreachable or lagging behind.
+
+        A replica gets reads while it answers within
+        `REPLICA_CONNECT_TIMEOUT_SECONDS` and replays the primary's writes
+        at most `REPLICA_MAX_LAG_SECONDS` late.
+        """
+        lags = await asyncio.gather(
+            *(_replication_lag(replica.engine) for replica in self._replicas),
+            return_exceptions=True,
         )
+        for replica, lag in zip(self._replicas, lags, strict=True):
+            if isinstance(lag, OSError | DBAPIError):
+                replica.set_available(False, lag)
+            elif isinstance(lag, BaseException):
+                raise lag
+            elif lag > database.REPLICA_MAX_LAG_SECONDS:
+                replica.set_available(False, f'replication lags {lag:.1f}s behind')
+            else:
+                replica.set_available(True)
+
+    async def monitor_replicas(self) -> None:
+        """Run `check_replicas()` every `REPLICA_CHECK_INTERVAL_SECONDS` until cancelled.
+
+        Requests only pick among the replicas found available here, they
+        never wait for a health check.
+        """
+        while True:
+            try:
+                await self.check_replicas()
+            except Exception:
+                logger.exception('Failed to check the replicas')
+            await asyncio.sleep(database.REPLICA_CHECK_INTERVAL_SECONDS)
+
+    def pools(self) -> Iterator[tuple[str, InstrumentedPool]]:
+        for name, engine in self._engines():
+            yield name, cast(InstrumentedPool, engine.pool)
+
+    def pool_stats(self) -> dict[str, DictStrAny]:
+        return {name: pool.status_dict() for name, pool in self.pools()}
 
     async def close(self) -> None:
         if self._engine is None:
             return
+        for replica in self._replicas:
+            await replica.engine.dispose()
         await self._engine.dispose()
         self._engine = None
         self._session_factory = None
+        self._read_session_factory = None
+        self._replicas = []
+        self._next_replica = iter(())
 
     @asynccontextmanager
     async def session(self) -> AsyncIterator[AsyncSession]:
+        """Session of the current scope on the primary.
+
+        The session runs in a transaction committed on exit. No connection
+        is checked out until the first query, scopes that never reach the
+        database don't touch the pool.
+        """
         if self._session_factory is None:
             msg = 'DatabaseSessionManager is not initialized'
             raise OSError(msg)
+
         async with self._session_factory.begin() as session:
             try:
                 yield session
             except Exception:
+                session.info.pop(_ON_COMMIT_KEY, None)
                 await session.rollback()
                 raise
+        await _run_on_commit(session)
+
+    @asynccontextmanager
+    async def read_session(self) -> AsyncIterator[ReadOnlySession]:
+        """Read-only session of the current scope, on a replica when one is healthy.
+
+        The session runs in autocommit mode, without BEGIN and COMMIT round
+        trips, and checks out a connection on its first query only.
+        `release_connection()` hands it back after each statement, so none
+        is held while the response is rendered. Reads spanning several
+        statements use `read_snapshot()`.
+
+        Replicas lag behind the primary, so only reads that can tolerate
+        slightly stale data should use this session. Inside
+        `pin_to_primary()` the primary is used instead, as it is when no
+        replica is configured or all of them are unavailable, see
+        `check_replicas()`. Picking a replica does no I/O.
+        """
+        if self._read_session_factory is None:
+            msg = 'DatabaseSessionManager is not initialized'
+            raise OSError(msg)
+
+        replica = None if _primary_pinned.get() else self._pick_replica()
+        session_factory = replica.session_factory if replica is not None else self._read_session_factory
+        async with session_factory() as session:
+            try:
+                yield ReadOnlySession(session)
+            except (OSError, DBAPIError) as exc:
+                # Don't wait for the next check to stop sending reads there
+                if replica is not None and (isinstance(exc, OSError) or exc.connection_invalidated):
+                    replica.set_available(False, exc)
+                raise
+
+    def _engines(self) -> Iterator[tuple[str, AsyncEngine]]:
+        if self._engine is not None:
+            yield 'primary', self._engine
+        for index, replica in enumerate(self._replicas):
+            yield f'replica-{index}', replica.engine
+
+    def _pick_replica(self) -> _Replica | None:
+        """Next available replica in turn, without touching the network."""
+        for replica in itertools.islice(self._next_replica, len(self._replicas)):
+            if replica.available:
+                return replica
+        return None
+
+    @staticmethod
+    def _create_engine(
+        db_dsn: URL,
+        *,
+        connect_args: DictStrAny | None = None,
+        **kwargs: Any,
+    ) -> AsyncEngine:
+        engine = create_async_engine(
+            db_dsn,
+            **kwargs,
+            connect_args={**_statement_cache_args(), **(connect_args or {})},
+            echo=database.ECHO,
+            poolclass=InstrumentedPool,
+            # `pool_size` connections are kept open, up to `max_overflow`
+            # more are opened under load and closed once returned
+            pool_size=database.POOL_MIN_SIZE,
+            max_overflow=database.POOL_MAX_SIZE - database.POOL_MIN_SIZE,
+            pool_timeout=database.POOL_TIMEOUT,
+            pool_pre_ping=database.POOL_PRE_PING,
+        )
+        if tracing.ENABLED:
+            instrument_engine(engine)
+        return engine
 
     @asynccontextmanager
     async def connection(self) -> AsyncIterator[AsyncConnection]:
@@ -64,4 +293,111 @@ class DatabaseSessionManager:
                 raise
 
 
+async def _replication_lag(engine: AsyncEngine) -> float:
+    async with asyncio.timeout(database.REPLICA_CONNECT_TIMEOUT_SECONDS), engine.connect() as connection:
+        lag = await connection.scalar(_SELECT_REPLICATION_LAG)
+    return float(lag or 0)
+
+
+def _statement_cache_args() -> DictStrAny:
+    """asyncpg connect arguments of `STATEMENT_CACHE_MODE`.
+
+    SQLAlchemy prepares every statement itself and caches it in
+    `prepared_statement_cache_size`. The `statement_cache_size` of asyncpg
+    covers its own introspection queries, with it set to 0 statements
+    are prepared unnamed unless given a name.
+    """
+    match database.STATEMENT_CACHE_MODE:
+        case StatementCacheMode.direct:
+            return {
+                'prepared_statement_cache_size': database.STATEMENT_CACHE_SIZE,
+                'statement_cache_size': database.STATEMENT_CACHE_SIZE,
+            }
+        case StatementCacheMode.pgbouncer:
+            # A server connection serves many clients, numbered names collide
+            return {
+                'prepared_statement_cache_size': database.STATEMENT_CACHE_SIZE,
+                'prepared_statement_name_func': _unique_statement_name,
+                'statement_cache_size': 0,
+            }
+        case StatementCacheMode.disabled:
+            return {'prepared_statement_cache_size': 0, 'statement_cache_size': 0}
+
+
+def _unique_statement_name() -> str:
+    return f'__asyncpg_{uuid.uuid4().hex}__'
+
+
+def _create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=engine,
+        expire_on_commit=False,  # don't expire objects after transaction commit
+    )
+
+
+def _create_read_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    # Shares the pool of `engine`, the isolation level is reset on checkin
+    return async_sessionmaker(
+        bind=engine.execution_options(isolation_level='AUTOCOMMIT'),
+        expire_on_commit=False,
+        info={_READ_ONLY_KEY: True},
+    )
+
+
+def is_read_only(session: AsyncSession) -> bool:
+    return bool(session.info.get(_READ_ONLY_KEY))
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """Return the connection of a read-only session to its pool.
+
+    Autocommit connections have no transaction to end, so this costs
+    no round trip, the next query checks a connection out again. Inside
+    `read_snapshot()`, and for sessions of other scopes, the connection
+    is kept until their transaction ends.
+    """
+    if is_read_only(session) and not session.info.get(_SNAPSHOT_KEY):
+        await session.commit()
+
+
+@asynccontextmanager
+async def read_snapshot(session: AsyncSession) -> AsyncIterator[None]:
+    """Let all statements of the block read a single snapshot.
+
+    Read-only sessions run the block in a `REPEATABLE READ READ ONLY`
+    transaction on a connection they hold for the block only. Sessions of
+    other scopes are in one transaction already and are left as they are.
+    """
+    if not is_read_only(session) or session.info.get(_SNAPSHOT_KEY):
+        yield
+        return
+
+    # Execution options only apply to a newly checked out connection
+    await release_connection(session)
+    await session.connection(execution_options=_SNAPSHOT_OPTIONS)
+    session.info[_SNAPSHOT_KEY] = True
+    try:
+        yield
+    finally:
+        session.info.pop(_SNAPSHOT_KEY, None)
+        # Nothing was written, ending the transaction releases the connection
+        await session.rollback()
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Run `callback` after the session transaction is committed.
+
+    Callbacks are dropped if the transaction is rolled back.
+    """
+    session.info.setdefault(_ON_COMMIT_KEY, []).append(callback)
+
+
+async def _run_on_commit(session: AsyncSession) -> None:
+    for callback in session.info.pop(_ON_COMMIT_KEY, ()):
+        try:
+            await callback()
+        except Exception:
+            logger.exception('On commit callback %r failed', callback)
+
+
 db_manager = DatabaseSessionManager()
@@ -0,0 +1,113 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Final, cast
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, PoolProxiedConnection
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+from app.infrastructure.metrics import Histogram
+
+
+__all__ = [
+    'InstrumentedPool',
+    'PoolStats',
+]
+
+
+# Upper bounds of the checkout wait buckets, in milliseconds
+_WAIT_BUCKETS_MS: Final = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass(slots=True)
+class PoolStats:
+    """Per-process counters of a connection pool."""
+
+    checkout_wait_ms: Histogram = field(default_factory=lambda: Histogram(_WAIT_BUCKETS_MS))
+    timeouts: int = 0
+    connects: int = 0
+    closes: int = 0
+    invalidations: int = 0
+    # id() of each open DBAPI connection -> time.monotonic() it was opened at
+    connected_at: dict[int, float] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        now = time.monotonic()
+        ages = [now - opened_at for opened_at in self.connected_at.values()]
+        return {
+            'checkout-wait-ms': self.checkout_wait_ms.as_dict(),
+            'timeouts': self.timeouts,
+            'connects': self.connects,
+            'closes': self.closes,
+            'invalidations': self.invalidations,
+            'connection-age-seconds': {
+                'min': min(ages, default=0),
+                'max': max(ages, default=0),
+            },
+        }
+
+
+class _WaitTimedQueue(AsyncAdaptedQueue[ConnectionPoolEntry]):
+    """Queue of idle connections that records how long each `get` waited."""
+
+    wait_ms: Histogram
+
+    def get(self, block: bool = True, timeout: float | None = None) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            self.wait_ms.observe((time.perf_counter() - started_at) * 1000)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """`AsyncAdaptedQueuePool` that records its activity in `stats`.
+
+    Connection lifecycle is tracked through pool events. Checkout waits
+    have no event, so the idle connection queue times its `get`: only the
+    wait for a connection to be returned is recorded, not opening a new
+    one when the pool grows, nor the pre-ping.
+    """
+
+    _queue_class = _WaitTimedQueue
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        cast(_WaitTimedQueue, self._pool).wait_ms = self.stats.checkout_wait_ms
+        event.listen(self, 'connect', self._on_connect)
+        event.listen(self, 'close', self._on_close)
+        event.listen(self, 'close_detached', self._on_close_detached)
+        event.listen(self, 'invalidate', self._on_invalidate)
+
+    def status_dict(self) -> dict[str, Any]:
+        return {
+            'size': self.size(),
+            'max-overflow': self._max_overflow,
+            'in-use': self.checkedout(),
+            'idle': self.checkedin(),
+            # Negative while fewer than `size` connections are open
+            'overflow': max(self.overflow(), 0),
+            **self.stats.as_dict(),
+        }
+
+    def connect(self) -> PoolProxiedConnection:
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+
+    def _on_connect(self, dbapi_connection: Any, _: ConnectionPoolEntry) -> None:
+        self.stats.connects += 1
+        self.stats.connected_at[id(dbapi_connection)] = time.monotonic()
+
+    def _on_close(self, dbapi_connection: Any, _: ConnectionPoolEntry) -> None:
+        self._on_close_detached(dbapi_connection)
+
+    def _on_close_detached(self, dbapi_connection: Any) -> None:
+        self.stats.closes += 1
+        self.stats.connected_at.pop(id(dbapi_connection), None)
+
+    def _on_invalidate(self, *_: Any) -> None:
+        self.stats.invalidations += 1
@@ -0,0 +1,78 @@
+import bisect
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Final
+
+
+__all__ = [
+    'METRICS_MEDIA_TYPE',
+    'Histogram',
+    'MetricsWriter',
+]
+
+
+METRICS_MEDIA_TYPE: Final = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@dataclass(slots=True)
+class Histogram:
+    """Cumulative histogram, in the shape Prometheus expects."""
+
+    bounds: tuple[float, ...]
+    counts: list[int] = field(init=False)
+    total: float = 0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        # One bucket per bound, plus +Inf
+        self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        cumulative, buckets = 0, {}
+        for bound, count in zip((*self.bounds, '+Inf'), self.counts, strict=True):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {'buckets': buckets, 'sum': self.total, 'count': self.count}
+
+
+class MetricsWriter:
+    """Builds a document in the Prometheus text exposition format.
+
+    Every metric is declared with `metric` before its samples are written.
+    """
+
+    def __init__(self) -> None:
+        self._lines: list[str] = []
+
+    def metric(self, name: str, type_: str, help_: str) -> None:
+        self._lines.append(f'# HELP {name} {help_}')
+        self._lines.append(f'# TYPE {name} {type_}')
+
+    def sample(self, name: str, value: float, labels: Mapping[str, str] | None = None) -> None:
+        self._lines.append(f'{name}{_format_labels(labels)} {value}')
+
+    def histogram(self, name: str, histogram: Histogram, labels: Mapping[str, str] | None = None) -> None:
+        data = histogram.as_dict()
+        for bound, count in data['buckets'].items():
+            self.sample(f'{name}_bucket', count, {**(labels or {}), 'le': bound})
+        self.sample(f'{name}_sum', data['sum'], labels)
+        self.sample(f'{name}_count', data['count'], labels)
+
+    def render(self) -> str:
+        return '\n'.join(self._lines) + '\n'
+
+
+def _format_labels(labels: Mapping[str, str] | None) -> str:
+    if not labels:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return f'{{{pairs}}}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
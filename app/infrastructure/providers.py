@@ -9,7 +9,7 @@ from app.config.settings import (
     StorySettings,
     TaskSettings,
 )
-from app.infrastructure.db import db_manager
+from app.infrastructure.db import ReadOnlySession, db_manager
 from app.infrastructure.redis import RedisClient, get_redis_client
 from app.infrastructure.saq import SaqQueue, saq_queue
 
@@ -20,6 +20,7 @@ __all__ = ['providers']
 providers: Iterable[Provider[Any]] = (
     # Postgres
     Scoped(db_manager.session),
+    Scoped(db_manager.read_session, ReadOnlySession),
     # Redis
     Object(settings.redis, RedisSettings),
     Singleton(get_redis_client, RedisClient),
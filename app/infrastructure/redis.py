@@ -1,10 +1,12 @@
-from typing import TYPE_CHECKING, TypeAlias
+from typing import TYPE_CHECKING, Any, TypeAlias
 
+from opentelemetry.trace import SpanKind
 from redis.asyncio import Redis
 from redis.asyncio.retry import Retry
 from redis.backoff import ExponentialBackoff
 
-from app.config.settings import RedisSettings
+from app.config.settings import RedisSettings, tracing
+from app.infrastructure.tracing import tracer
 
 
 if TYPE_CHECKING:
@@ -13,8 +15,21 @@ else:
     RedisClient = Redis
 
 
+class TracedRedisClient(RedisClient):
+    """Redis client that runs every command in a client span."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        with tracer.start_as_current_span(
+            str(args[0]),
+            kind=SpanKind.CLIENT,
+            attributes={'db.system': 'redis'},
+        ):
+            return await super().execute_command(*args, **options)
+
+
 def get_redis_client(settings: RedisSettings) -> RedisClient:
-    return RedisClient.from_url(
+    client_cls = TracedRedisClient if tracing.ENABLED else RedisClient
+    return client_cls.from_url(
         url=str(settings.HOST),
         decode_responses=True,
         retry=Retry(ExponentialBackoff(), 3),  # type: ignore
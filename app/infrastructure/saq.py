@@ -1,26 +1,77 @@
-from typing import Any, Required
+from typing import Any, Final, Required
 
 import msgspec.json
 import saq
 from aioinject import Container
+from opentelemetry import context, propagate, trace
+from opentelemetry.trace import Span, SpanKind
+from saq.queue.redis import RedisQueue
 from saq.types import Context
 
 from app.config import settings
+from app.infrastructure.tracing import tracer
+
+
+# Job metadata key of the trace context of the enqueuing span
+_TRACE_CONTEXT_KEY: Final = 'trace_context'
 
 
 class TaskContext(Context, total=False):
     container: Required[Container]
+    # Span of the job being processed, while tracing is enabled
+    trace_span: Span
+    trace_token: object
 
 
-class SaqQueue(saq.Queue):
+# `saq.Queue.from_url` returns a plain `RedisQueue`, subclass it so the
+# overrides below apply. Jobs were queued by such a queue before, so the
+# name and the `saq:<name>:` key namespace stay the `RedisQueue` defaults.
+class SaqQueue(RedisQueue):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         kwargs.setdefault('dump', msgspec.json.encode)
         kwargs.setdefault('load', msgspec.json.decode)
-        kwargs.setdefault('name', settings.task.WORKER_NAME)
         super().__init__(*args, **kwargs)
 
-    def namespace(self, key: str) -> str:
-        return f'{settings.app.NAME}:{self.name}:{key}'
+    async def enqueue(self, job_or_func: str | saq.Job, **kwargs: Any) -> saq.Job | None:
+        if not settings.tracing.ENABLED:
+            return await super().enqueue(job_or_func, **kwargs)
+
+        function = job_or_func if isinstance(job_or_func, str) else job_or_func.function
+        with tracer.start_as_current_span(f'enqueue {function}', kind=SpanKind.PRODUCER):
+            # The worker continues the trace from the job payload
+            carrier: dict[str, str] = {}
+            propagate.inject(carrier)
+            if isinstance(job_or_func, saq.Job):
+                job_or_func.meta[_TRACE_CONTEXT_KEY] = carrier
+            else:
+                kwargs['meta'] = {**kwargs.get('meta', {}), _TRACE_CONTEXT_KEY: carrier}
+            return await super().enqueue(job_or_func, **kwargs)
+
+
+async def start_job_span(ctx: TaskContext) -> None:
+    """Open the span of the job in `ctx`, as a child of the span that enqueued it."""
+    job = ctx['job']
+    span = tracer.start_span(
+        f'process {job.function}',
+        context=propagate.extract(job.meta.get(_TRACE_CONTEXT_KEY, {})),
+        kind=SpanKind.CONSUMER,
+        attributes={'messaging.system': 'saq', 'messaging.message.id': job.key},
+    )
+    ctx['trace_span'] = span
+    # The job function runs in a task created after this hook, which
+    # inherits the span as current.
+    ctx['trace_token'] = context.attach(trace.set_span_in_context(span))
+
+
+async def end_job_span(ctx: TaskContext) -> None:
+    span = ctx.pop('trace_span', None)
+    if span is None:
+        return
+    if (exception := ctx.get('exception')) is not None:
+        span.record_exception(exception)
+        span.set_status(trace.Status(trace.StatusCode.ERROR))
+    span.end()
+    context.detach(ctx.pop('trace_token'))
 
 
 saq_queue = SaqQueue.from_url(str(settings.task.REDIS_HOST))
@@ -0,0 +1,179 @@
+"""OpenTelemetry tracing, off unless `TRACING_ENABLED` is set.
+
+Spans are created through the OpenTelemetry API, a no-op by itself. The
+SDK that samples and exports them is only imported by `configure_tracing`,
+so it is only needed where tracing is enabled.
+"""
+import functools
+import inspect
+from collections.abc import AsyncIterator, Callable, Coroutine
+from functools import cache
+from typing import TYPE_CHECKING, Any, Final, TypeVar
+
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.config.settings import TracingExporter
+from app.version import VERSION
+
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import ReadableSpan
+    from opentelemetry.sdk.trace.export import SpanExporter
+
+
+__all__ = [
+    'configure_tracing',
+    'instrument_engine',
+    'trace_methods',
+    'tracer',
+]
+
+
+# Spans of the statements running on a connection, innermost last
+_STATEMENT_SPANS_KEY: Final = 'trace_statement_spans'
+
+tracer: Final = trace.get_tracer('app', VERSION)
+
+ClassT = TypeVar('ClassT', bound=type)
+
+
+@cache
+def configure_tracing() -> 'SpanExporter | None':
+    """Install the tracer provider of `TRACING_*` and return its exporter.
+
+    The `memory` exporter keeps finished spans for `get_finished_spans()`.
+    """
+    if not settings.tracing.ENABLED:
+        return None
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+    )
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({'service.name': settings.app.NAME, 'service.version': VERSION}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing.SAMPLE_RATE)),
+    )
+    exporter: SpanExporter
+    match settings.tracing.EXPORTER:
+        case TracingExporter.file:
+            exporter = ConsoleSpanExporter(
+                out=settings.tracing.FILE_PATH.open('a', encoding='utf-8'),
+                formatter=_format_span,
+            )
+            provider.add_span_processor(BatchSpanProcessor(exporter))
+        case TracingExporter.memory:
+            # Finished spans are readable right away, without a flush
+            exporter = InMemorySpanExporter()
+            provider.add_span_processor(SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return exporter
+
+
+def trace_methods(cls: ClassT) -> ClassT:
+    """Wrap the public coroutine and async generator methods of `cls` in spans.
+
+    Spans are named `Class.method`, inherited methods included. Without
+    tracing the class is returned as is, so calls cost nothing extra.
+    """
+    if not settings.tracing.ENABLED:
+        return cls
+
+    for name in dir(cls):
+        if name.startswith('_'):
+            continue
+        method = inspect.getattr_static(cls, name)
+        span_name = f'{cls.__name__}.{name}'
+        if inspect.iscoroutinefunction(method):
+            setattr(cls, name, _traced_coroutine(method, span_name))
+        elif inspect.isasyncgenfunction(method):
+            setattr(cls, name, _traced_async_generator(method, span_name))
+    return cls
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Trace the statements of `engine` in client spans of the current trace.
+
+    Statement texts are recorded, their parameters are not.
+    """
+    attributes = {
+        'db.system': 'postgresql',
+        'db.name': engine.url.database or '',
+        'server.address': engine.url.host or '',
+    }
+
+    def before_cursor_execute(connection: Connection, _: Any, statement: str, *__: Any) -> None:
+        span = tracer.start_span(
+            statement.split(maxsplit=1)[0],
+            kind=SpanKind.CLIENT,
+            attributes={**attributes, 'db.statement': statement},
+        )
+        connection.info.setdefault(_STATEMENT_SPANS_KEY, []).append(span)
+
+    def after_cursor_execute(connection: Connection, *_: Any) -> None:
+        if spans := connection.info.get(_STATEMENT_SPANS_KEY):
+            spans.pop().end()
+
+    def handle_error(context: ExceptionContext) -> None:
+        if context.connection is None or not (spans := context.connection.info.get(_STATEMENT_SPANS_KEY)):
+            return
+        span = spans.pop()
+        span.record_exception(context.original_exception)
+        span.set_status(Status(StatusCode.ERROR))
+        span.end()
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(engine.sync_engine, 'after_cursor_execute', after_cursor_execute)
+    event.listen(engine.sync_engine, 'handle_error', handle_error)
+
+
+def _traced_coroutine(
+    function: Callable[..., Coroutine[Any, Any, Any]],
+    span_name: str,
+) -> Callable[..., Coroutine[Any, Any, Any]]:
+    @functools.wraps(function)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with tracer.start_as_current_span(span_name):
+            return await function(*args, **kwargs)
+
+    return wrapper
+
+
+def _traced_async_generator(
+    function: Callable[..., AsyncIterator[Any]],
+    span_name: str,
+) -> Callable[..., AsyncIterator[Any]]:
+    @functools.wraps(function)
+    async def wrapper(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        # Current only while the generator runs, the consumer keeps its own
+        # context between items.
+        span = tracer.start_span(span_name)
+        iterator = function(*args, **kwargs)
+        try:
+            while True:
+                with trace.use_span(span):
+                    try:
+                        item = await anext(iterator)
+                    except StopAsyncIteration:
+                        return
+                yield item
+        finally:
+            await iterator.aclose()
+            span.end()
+
+    return wrapper
+
+
+def _format_span(span: 'ReadableSpan') -> str:
+    return span.to_json(indent=None) + '\n'
@@ -0,0 +1,46 @@
+import abc
+
+from app.modules.story.application.dto import StoryOutDTO
+
+
+__all__ = ['IStoryCache', 'ReadOnlyStoryCache']
+
+
+class IStoryCache(metaclass=abc.ABCMeta):
+    """Read-through cache of `StoryOutDTO` by story id, used by `StoryService`."""
+
+    @abc.abstractmethod
+    async def get(self, id_: int) -> StoryOutDTO | None:
+        ...
+
+    @abc.abstractmethod
+    async def set(self, story: StoryOutDTO) -> None:
+        """Cache a story read from the repository.
+
+        Skipped if the story was invalidated since, the read may predate
+        the write that invalidated it.
+        """
+
+    @abc.abstractmethod
+    def invalidate_on_commit(self, *ids: int) -> None:
+        """Drop the cached stories once the current transaction commits."""
+
+
+class ReadOnlyStoryCache(IStoryCache):
+    """`IStoryCache` of reads that may lag behind the primary, never filled by them.
+
+    A replica further behind than invalidation tombstones live would
+    otherwise cache the old version of a story for the whole TTL.
+    """
+
+    def __init__(self, cache: IStoryCache) -> None:
+        self._cache = cache
+
+    async def get(self, id_: int) -> StoryOutDTO | None:
+        return await self._cache.get(id_)
+
+    async def set(self, story: StoryOutDTO) -> None:
+        pass
+
+    def invalidate_on_commit(self, *ids: int) -> None:
+        self._cache.invalidate_on_commit(*ids)
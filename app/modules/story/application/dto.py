@@ -1,13 +1,19 @@
 from dataclasses import dataclass
-from typing import Self
+from typing import Any, Self, TypeAlias
 
-from app.modules.story.domain.entities import PageEntity, StoryEntity
+from app.modules.story.domain.criteria import StoryCursor
+from app.modules.story.domain.entities import PageEntity, StoryEntity, StoryVersion
 
 
 __all__ = [
     'StoryCreateDTO',
     'StoryOutDTO',
+    'StoryOperationDTO',
+    'StoryPageDTO',
+    'StoryPatchDTO',
+    'StoryRemoveDTO',
     'StoryUpdateDTO',
+    'StoryVersionPageDTO',
 ]
 
 
@@ -62,6 +68,21 @@ class StoryUpdateDTO:
     pages: list[PageOutDTO] | None
 
 
+@dataclass(kw_only=True)
+class StoryPatchDTO:
+    id: int
+    # Only the attributes to change, keyed by `StoryCreateDTO` field names
+    changes: dict[str, Any]
+
+
+@dataclass(kw_only=True)
+class StoryRemoveDTO:
+    id: int
+
+
+StoryOperationDTO: TypeAlias = StoryCreateDTO | StoryPatchDTO | StoryRemoveDTO
+
+
 @dataclass(kw_only=True)
 class StoryOutDTO:
     id: int
@@ -77,6 +98,9 @@ class StoryOutDTO:
     publication_start_time: AwareDatetime | None
     publication_end_time: AwareDatetime | None
 
+    created_at: AwareDatetime | None
+    modified_at: AwareDatetime | None
+
     pages: list[PageOutDTO] | None
 
     @classmethod
@@ -93,7 +117,23 @@ class StoryOutDTO:
             is_autoscroll=entity.is_autoscroll,
             publication_start_time=entity.publication_start_time,
             publication_end_time=entity.publication_end_time,
+            created_at=entity.created_at,
+            modified_at=entity.modified_at,
             pages=[PageOutDTO.from_entity(page) for page in entity.pages]
             if entity.pages
             else [],
         )
+
+
+@dataclass(kw_only=True)
+class StoryPageDTO:
+    items: list[StoryOutDTO]
+    next_cursor: StoryCursor | None
+    prev_cursor: StoryCursor | None
+
+
+@dataclass(kw_only=True)
+class StoryVersionPageDTO:
+    items: list[StoryVersion]
+    next_cursor: StoryCursor | None
+    prev_cursor: StoryCursor | None
@@ -1,64 +1,293 @@
+from collections.abc import AsyncIterator, Collection, Iterator, Sequence
+from dataclasses import replace
+from datetime import datetime
+from typing import NewType, TypeVar, cast
+
 from app.config.settings import TaskSettings
 from app.infrastructure.saq import SaqQueue
-from app.modules.story.application.dto import StoryCreateDTO, StoryOutDTO, StoryUpdateDTO
-from app.modules.story.domain.entities import StoryEntity
+from app.infrastructure.tracing import trace_methods
+from app.modules.story.application.cache import IStoryCache
+from app.modules.story.application.dto import (
+    StoryCreateDTO,
+    StoryOperationDTO,
+    StoryOutDTO,
+    StoryPageDTO,
+    StoryPatchDTO,
+    StoryRemoveDTO,
+    StoryUpdateDTO,
+    StoryVersionPageDTO,
+)
+from app.modules.story.domain.criteria import StoryCriteria, StoryCursor
+from app.modules.story.domain.entities import StoryEntity, StoryId, StoryVersion
+from app.modules.story.domain.exceptions import StoryOperationsError
 from app.modules.story.domain.repositories import IStoryRepository
+from app.seedwork.domain.exceptions import EntityNotFoundException
+from app.seedwork.utils.dt import get_utc_now
 
 
+@trace_methods
 class StoryService:
     def __init__(
         self,
         repository: IStoryRepository,
+        cache: IStoryCache,
         saq_queue: SaqQueue,
         task_settings: TaskSettings,
     ) -> None:
         self._repository = repository
+        self._cache = cache
         self._saq_queue = saq_queue
         self._task_settings = task_settings
 
     async def get_story(self, id_: int) -> StoryOutDTO:
-        story = await self._repository.get_by_id(id_)
-        return StoryOutDTO.from_entity(story)
+        if (cached := await self._cache.get(id_)) is not None:
+            return cached
+
+        story = StoryOutDTO.from_entity(await self._repository.get_by_id(id_))
+        await self._cache.set(story)
+        return story
 
     async def get_all_stories(self) -> list[StoryOutDTO]:
         stories = await self._repository.get_all()
         return [StoryOutDTO.from_entity(story) for story in stories]
 
-    async def create_story(self, dto: StoryCreateDTO) -> StoryOutDTO:
-        entity = StoryEntity(
-            name=dto.name,
-            story_type=dto.story_type,
-            delay=dto.delay,
-            is_disabled=dto.is_disabled,
-            is_blocking=dto.is_blocking,
-            is_preview=dto.is_preview,
-            is_repetitive=dto.is_repetitive,
-            is_autoscroll=dto.is_autoscroll,
-            publication_start_time=dto.publication_start_time,
-            publication_end_time=dto.publication_end_time,
-            created_at=None,
-            modified_at=None,
-            pages=[],
+    async def get_published_story_ids(self) -> list[StoryId]:
+        """Ids of the stories live right now, in id order."""
+        versions = await self._repository.get_versions(StoryCriteria(is_published=True))
+        return [version.id for version in versions]
+
+    async def get_published_stories(self) -> list[StoryOutDTO]:
+        return await self.get_stories(StoryCriteria(is_published=True))
+
+    async def get_next_publication_change(self) -> datetime | None:
+        return await self._repository.get_next_publication_change(get_utc_now())
+
+    async def get_stories(self, criteria: StoryCriteria) -> list[StoryOutDTO]:
+        stories = await self._repository.get_list(criteria)
+        return [StoryOutDTO.from_entity(story) for story in stories]
+
+    async def get_stories_page(self, criteria: StoryCriteria) -> StoryPageDTO:
+        stories, next_cursor, prev_cursor = _paginate(
+            await self._repository.get_list(_with_lookahead(criteria)),
+            criteria,
+        )
+        return StoryPageDTO(
+            items=[StoryOutDTO.from_entity(story) for story in stories],
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+
+    async def get_stories_page_versions(self, criteria: StoryCriteria) -> StoryVersionPageDTO:
+        """Same page as `get_stories_page`, but only story ids and versions."""
+        versions, next_cursor, prev_cursor = _paginate(
+            await self._repository.get_versions(_with_lookahead(criteria)),
+            criteria,
+        )
+        return StoryVersionPageDTO(
+            items=versions,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
-        story = await self._repository.add(entity)
+
+    async def get_story_version(self, id_: int) -> StoryVersion:
+        return await self._repository.get_version(id_)
+
+    async def export_stories(
+        self,
+        criteria: StoryCriteria,
+        chunk_size: int,
+    ) -> AsyncIterator[list[StoryOutDTO]]:
+        async for stories in self._repository.iter_chunks(criteria, chunk_size):
+            yield [StoryOutDTO.from_entity(story) for story in stories]
+
+    async def count_stories(self, criteria: StoryCriteria) -> int:
+        return await self._repository.count(criteria)
+
+    async def create_story(self, dto: StoryCreateDTO) -> StoryOutDTO:
+        story = await self._repository.add(_new_entity(dto))
+        # Nothing cached yet, but the message tells feeds about the new story
+        self._cache.invalidate_on_commit(story.id)
         return StoryOutDTO.from_entity(story)
 
     async def update_story(self, dto: StoryUpdateDTO) -> StoryOutDTO:
-        entity = await self._repository.get_by_id(dto.id)
-
-        entity.name = dto.name
-        entity.story_type = dto.story_type
-        entity.delay = dto.delay
-        entity.is_disabled = dto.is_disabled
-        entity.is_blocking = dto.is_blocking
-        entity.is_preview = dto.is_preview
-        entity.is_repetitive = dto.is_repetitive
-        entity.is_autoscroll = dto.is_autoscroll
-        entity.publication_start_time = dto.publication_start_time
-        entity.publication_end_time = dto.publication_end_time
-
-        story = await self._repository.update(entity)
+        story = await self._repository.update_by_id(
+            dto.id,
+            {
+                'name': dto.name,
+                'story_type': dto.story_type,
+                'delay': dto.delay,
+                'is_disabled': dto.is_disabled,
+                'is_blocking': dto.is_blocking,
+                'is_preview': dto.is_preview,
+                'is_repetitive': dto.is_repetitive,
+                'is_autoscroll': dto.is_autoscroll,
+                'publication_start_time': dto.publication_start_time,
+                'publication_end_time': dto.publication_end_time,
+            },
+        )
+        self._cache.invalidate_on_commit(story.id)
+        return StoryOutDTO.from_entity(story)
+
+    async def patch_story(self, dto: StoryPatchDTO) -> StoryOutDTO:
+        if not dto.changes:
+            return await self.get_story(dto.id)
+
+        story = await self._repository.update_by_id(dto.id, dto.changes)
+        self._cache.invalidate_on_commit(story.id)
         return StoryOutDTO.from_entity(story)
 
     async def delete_story(self, id_: int) -> None:
         await self._repository.remove_by_id(id_)
+        self._cache.invalidate_on_commit(id_)
+
+    async def apply_operations(
+        self,
+        operations: Sequence[StoryOperationDTO],
+    ) -> list[StoryOutDTO | None]:
+        """Apply create, update and remove operations all or nothing.
+
+        Consecutive creates or removals run as one bulk statement. Updates
+        change only the attributes they give, so each runs on its own, like
+        `patch_story`. Results follow the order of `operations`, with `None`
+        for removals. If stories targeted by a run of operations are missing,
+        nothing is applied and `StoryOperationsError` reports every such
+        operation.
+        """
+        results: list[StoryOutDTO | None] = [None] * len(operations)
+        changed: set[int] = set()
+
+        async with self._repository.atomic():
+            for group in _group_operations(operations):
+                if isinstance(group[0][1], StoryCreateDTO):
+                    creates = cast(list[tuple[int, StoryCreateDTO]], group)
+                    stories = await self._repository.add_many([_new_entity(dto) for _, dto in creates])
+                    for (index, _), story in zip(creates, stories, strict=True):
+                        results[index] = StoryOutDTO.from_entity(story)
+                    changed.update(story.id for story in stories)
+                elif isinstance(group[0][1], StoryPatchDTO):
+                    patches = cast(list[tuple[int, StoryPatchDTO]], group)
+                    for index, story in await self._patch_many(patches):
+                        results[index] = StoryOutDTO.from_entity(story)
+                        changed.add(story.id)
+                else:
+                    removed = set(
+                        await self._repository.remove_many([StoryId(dto.id) for _, dto in group]),
+                    )
+                    _raise_for_missing(group, removed)
+                    changed.update(removed)
+
+        self._cache.invalidate_on_commit(*changed)
+        return results
+
+    async def _patch_many(
+        self,
+        patches: list[tuple[int, StoryPatchDTO]],
+    ) -> list[tuple[int, StoryEntity]]:
+        patched: list[tuple[int, StoryEntity]] = []
+        errors: dict[int, Exception] = {}
+        for index, dto in patches:
+            try:
+                if dto.changes:
+                    patched.append((index, await self._repository.update_by_id(dto.id, dto.changes)))
+                else:
+                    patched.append((index, await self._repository.get_by_id(dto.id)))
+            except EntityNotFoundException as e:
+                errors[index] = e
+        if errors:
+            raise StoryOperationsError(errors)
+        return patched
+
+
+_ItemT = TypeVar('_ItemT', StoryEntity, StoryVersion)
+
+
+# Service on a `ReadOnlyStoryRepository`, for reads that tolerate replica
+# lag. Its reads never fill the story cache, see `ReadOnlyStoryCache`.
+ReadOnlyStoryService = NewType('ReadOnlyStoryService', StoryService)
+
+
+def _new_entity(dto: StoryCreateDTO) -> StoryEntity:
+    return StoryEntity(
+        name=dto.name,
+        story_type=dto.story_type,
+        delay=dto.delay,
+        is_disabled=dto.is_disabled,
+        is_blocking=dto.is_blocking,
+        is_preview=dto.is_preview,
+        is_repetitive=dto.is_repetitive,
+        is_autoscroll=dto.is_autoscroll,
+        publication_start_time=dto.publication_start_time,
+        publication_end_time=dto.publication_end_time,
+        created_at=None,
+        modified_at=None,
+        pages=[],
+    )
+
+
+def _group_operations(
+    operations: Sequence[StoryOperationDTO],
+) -> Iterator[list[tuple[int, StoryOperationDTO]]]:
+    """Split operations into runs of the same kind that one statement can apply.
+
+    A run is also cut when a story comes up again, a single statement
+    cannot update or delete the same row twice.
+    """
+    group: list[tuple[int, StoryOperationDTO]] = []
+    ids: set[int] = set()
+    for index, operation in enumerate(operations):
+        id_ = None if isinstance(operation, StoryCreateDTO) else operation.id
+        if group and (type(operation) is not type(group[0][1]) or id_ in ids):
+            yield group
+            group, ids = [], set()
+        group.append((index, operation))
+        if id_ is not None:
+            ids.add(id_)
+    if group:
+        yield group
+
+
+def _raise_for_missing(
+    group: list[tuple[int, StoryOperationDTO]],
+    found: Collection[int],
+) -> None:
+    errors: dict[int, Exception] = {
+        index: EntityNotFoundException(entity_type=StoryEntity, kwargs={'id': operation.id})
+        for index, operation in group
+        if isinstance(operation, StoryRemoveDTO) and operation.id not in found
+    }
+    if errors:
+        raise StoryOperationsError(errors)
+
+
+def _with_lookahead(criteria: StoryCriteria) -> StoryCriteria:
+    # One extra row tells whether there is anything past the page
+    if criteria.limit is None:
+        return criteria
+    return replace(criteria, limit=criteria.limit + 1)
+
+
+def _paginate(
+    items: list[_ItemT],
+    criteria: StoryCriteria,
+) -> tuple[list[_ItemT], StoryCursor | None, StoryCursor | None]:
+    has_more = criteria.limit is not None and len(items) > criteria.limit
+    if has_more:
+        items = items[1:] if criteria.before is not None else items[:-1]
+
+    if not criteria.supports_cursor or not items:
+        return items, None, None
+
+    if criteria.before is not None:
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, criteria.after is not None or criteria.offset > 0
+
+    return (
+        items,
+        _cursor(items[-1]) if has_next else None,
+        _cursor(items[0]) if has_prev else None,
+    )
+
+
+def _cursor(item: StoryEntity | StoryVersion) -> StoryCursor:
+    return StoryCursor(key=item.id, id=item.id)
@@ -15,10 +15,10 @@ async def refresh_all_stories_job(ctx: TaskContext) -> None:
     async with ctx['container'].context() as container_ctx:  # type: InjectionContext
         service = await container_ctx.resolve(StoryService)
         task_settings = await container_ctx.resolve(TaskSettings)
-        for code in await service.get_all_stories():
+        for id_ in await service.get_published_story_ids():
             await queue.enqueue(
                 'refresh_story_task',
-                code=code,
+                id_=id_,
                 timeout=task_settings.RUNTIME_TIMEOUT_SECONDS,
             )
 
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import Literal
+
+
+__all__ = [
+    'StoryCriteria',
+    'StoryCursor',
+    'StoryOrdering',
+]
+
+
+StoryOrdering = Literal['id', '-id', 'relevance']
+
+
+@dataclass(frozen=True, slots=True)
+class StoryCursor:
+    """Position of a story in a listing: its ordering key and id."""
+
+    key: int
+    id: int
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class StoryCriteria:
+    """Filtering, ordering and pagination of a story listing.
+
+    Every field is optional, empty criteria selects the whole table.
+    `after` and `before` switch the listing to keyset pagination and
+    are mutually exclusive with `offset`. `relevance` ordering ranks by
+    similarity to `search` and only supports offset pagination.
+    Stories come with page ids only, unless `include_pages` is set.
+
+    `fields` and `page_fields` restrict the loaded story and page
+    attributes, `None` loads all of them. Story `fields` may name the
+    `pages` relationship, stories come without pages when it is left out.
+    Attributes outside the sets are left as `None` on returned entities.
+    """
+
+    ordering: StoryOrdering = 'id'
+    search: str | None = None
+
+    story_type: str | None = None
+    is_published: bool | None = None
+    is_disabled: bool | None = None
+
+    limit: int | None = None
+    offset: int = 0
+    after: StoryCursor | None = None
+    before: StoryCursor | None = None
+
+    include_pages: bool = False
+    fields: frozenset[str] | None = None
+    page_fields: frozenset[str] | None = None
+
+    @property
+    def with_pages(self) -> bool:
+        return self.include_pages or self.fields is None or 'pages' in self.fields
+
+    @property
+    def descending(self) -> bool:
+        return self.ordering.startswith('-')
+
+    @property
+    def supports_cursor(self) -> bool:
+        return self.ordering != 'relevance'
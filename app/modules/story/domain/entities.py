@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import NewType
 
 from pydantic import AwareDatetime
@@ -11,6 +12,7 @@ __all__ = [
     'PageId',
     'StoryEntity',
     'StoryId',
+    'StoryVersion',
 ]
 
 
@@ -44,3 +46,11 @@ class StoryEntity(Entity[StoryId]):
     modified_at: AwareDatetime | None
 
     pages: list[PageEntity] | None
+
+
+@dataclass(frozen=True, slots=True)
+class StoryVersion:
+    """Identity and last modification time of a story, without its data."""
+
+    id: StoryId
+    modified_at: datetime
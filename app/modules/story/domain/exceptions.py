@@ -1,5 +1,31 @@
-from app.seedwork.domain.exceptions import DomainException
+from typing import TypedDict
+
+from app.seedwork.domain.exceptions import BusinessLogicError, DomainError, DomainException
 
 
 class StoryValidationError(DomainException):
     pass
+
+
+class PublicationWindowContext(TypedDict):
+    id: int
+
+
+class StoryPublicationWindowError(BusinessLogicError[PublicationWindowContext]):
+    """A change would end the publication of a story before it starts."""
+
+    error = DomainError(
+        code=1001,
+        message='publication-end-time of story {id} must not be earlier than its publication-start-time',
+    )
+
+
+class StoryOperationsError(DomainException):
+    """Some operations of a batch failed, none of the batch was applied.
+
+    `errors` maps the position of each failed operation to its cause.
+    """
+
+    def __init__(self, errors: dict[int, Exception]) -> None:
+        super().__init__(f'{len(errors)} story operations failed')
+        self.errors = errors
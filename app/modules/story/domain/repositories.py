@@ -1,10 +1,14 @@
 import abc
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime
+from typing import Any, NewType
 
-from app.modules.story.domain.entities import StoryEntity
+from app.modules.story.domain.criteria import StoryCriteria
+from app.modules.story.domain.entities import StoryEntity, StoryVersion
 from app.seedwork.domain.repositories import IBaseRepository
 
 
-__all__ = ['IStoryRepository']
+__all__ = ['IStoryRepository', 'ReadOnlyStoryRepository']
 
 
 class IStoryRepository(IBaseRepository[StoryEntity], metaclass=abc.ABCMeta):
@@ -13,3 +17,44 @@ class IStoryRepository(IBaseRepository[StoryEntity], metaclass=abc.ABCMeta):
     @abc.abstractmethod
     async def get_all(self) -> list[StoryEntity]:
         ...
+
+    @abc.abstractmethod
+    async def get_list(self, criteria: StoryCriteria) -> list[StoryEntity]:
+        ...
+
+    @abc.abstractmethod
+    async def count(self, criteria: StoryCriteria) -> int:
+        ...
+
+    @abc.abstractmethod
+    async def update_by_id(self, entity_id: int, values: Mapping[str, Any]) -> StoryEntity:
+        """Set the given story attributes in place and return the updated story.
+
+        Raises `EntityNotFoundException` when there is no such story and
+        `StoryPublicationWindowError` when a single publication bound would
+        end the window before it starts.
+        """
+
+    @abc.abstractmethod
+    async def get_version(self, entity_id: int) -> StoryVersion:
+        ...
+
+    @abc.abstractmethod
+    async def get_versions(self, criteria: StoryCriteria) -> list[StoryVersion]:
+        ...
+
+    @abc.abstractmethod
+    async def get_next_publication_change(self, after: datetime) -> datetime | None:
+        """First moment after `after` at which an enabled story gets published or unpublished."""
+
+    @abc.abstractmethod
+    def iter_chunks(
+        self,
+        criteria: StoryCriteria,
+        chunk_size: int,
+    ) -> AsyncIterator[list[StoryEntity]]:
+        """Stream matching stories in chunks of at most `chunk_size`."""
+
+
+# Repository on a read-only session that may lag behind the latest writes
+ReadOnlyStoryRepository = NewType('ReadOnlyStoryRepository', IStoryRepository)
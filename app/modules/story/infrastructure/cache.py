@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from collections.abc import Callable, Collection
+from typing import Final
+
+from pydantic import TypeAdapter, ValidationError
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.config.settings import StorySettings
+from app.infrastructure.cache import CacheStats, LRUCache
+from app.infrastructure.db import on_commit
+from app.infrastructure.redis import RedisClient
+from app.modules.story.application.cache import IStoryCache
+from app.modules.story.application.dto import StoryOutDTO
+
+
+__all__ = [
+    'StoryCache',
+    'listen_for_invalidations',
+    'local_story_cache',
+    'story_cache_stats',
+]
+
+logger = logging.getLogger(__name__)
+
+story_cache_stats: Final = CacheStats()
+
+# Each worker process keeps its own copy in front of Redis
+local_story_cache: Final[LRUCache[int, StoryOutDTO]] = LRUCache(
+    max_size=settings.local_cache.MAX_ITEMS if settings.local_cache.ENABLED else 0,
+    ttl=settings.local_cache.TTL_SECONDS,
+)
+
+_story_adapter: Final = TypeAdapter(StoryOutDTO)
+
+# Stored in place of invalidated stories for `CACHE_TOMBSTONE_SECONDS`
+_TOMBSTONE: Final = 'invalidated'
+
+
+class StoryCache(IStoryCache):
+    """Two-level read-through cache of `StoryOutDTO` by story id.
+
+    The per-process `local_story_cache` is consulted first, then Redis.
+    Redis failures are logged and treated as misses, the database stays
+    the source of truth. Invalidation leaves a short-lived tombstone in
+    Redis that `set` never overwrites, so a read racing a write cannot
+    cache the old story. Returned objects may be shared between requests
+    and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        session: AsyncSession,
+        story_settings: StorySettings,
+    ) -> None:
+        self._redis = redis
+        self._session = session
+        self._enabled = story_settings.CACHE_ENABLED
+        self._ttl = story_settings.CACHE_TTL_SECONDS
+        self._tombstone_ttl = story_settings.CACHE_TOMBSTONE_SECONDS
+
+    async def get(self, id_: int) -> StoryOutDTO | None:
+        if not self._enabled:
+            return None
+
+        if (story := local_story_cache.get(id_)) is not None:
+            return story
+
+        try:
+            raw = await self._redis.get(self._key(id_))
+        except RedisError:
+            story_cache_stats.errors += 1
+            logger.warning('Failed to read story %s from cache', id_, exc_info=True)
+            return None
+
+        if raw is None or raw == _TOMBSTONE:
+            story_cache_stats.misses += 1
+            return None
+
+        try:
+            story = _story_adapter.validate_json(raw)
+        except ValidationError:
+            story_cache_stats.errors += 1
+            logger.warning('Dropping malformed cache entry for story %s', id_)
+            await self.invalidate(id_)
+            return None
+
+        story_cache_stats.hits += 1
+        local_story_cache.set(id_, story)
+        return story
+
+    async def set(self, story: StoryOutDTO) -> None:
+        if not self._enabled:
+            return
+
+        try:
+            stored = await self._redis.set(
+                self._key(story.id),
+                _story_adapter.dump_json(story),
+                ex=self._ttl,
+                nx=True,
+            )
+        except RedisError:
+            story_cache_stats.errors += 1
+            logger.warning('Failed to write story %s to cache', story.id, exc_info=True)
+            return
+        # Not stored over a tombstone, the story changed after it was read
+        if stored:
+            local_story_cache.set(story.id, story)
+
+    async def invalidate(self, id_: int) -> None:
+        await self.invalidate_many((id_,))
+
+    async def invalidate_many(self, ids: Collection[int]) -> None:
+        if not ids:
+            return
+
+        for id_ in ids:
+            local_story_cache.pop(id_)
+        if self._enabled:
+            try:
+                async with self._redis.pipeline(transaction=False) as pipeline:
+                    for id_ in ids:
+                        pipeline.set(self._key(id_), _TOMBSTONE, ex=self._tombstone_ttl)
+                    await pipeline.execute()
+            except RedisError:
+                story_cache_stats.errors += 1
+                logger.warning('Failed to invalidate stories %s in cache', ids, exc_info=True)
+
+        # Published even when the tombstones failed or the Redis cache is
+        # disabled, every process still drops its local copies and
+        # rebuilds its story feed on these messages
+        try:
+            await self._redis.publish(_invalidation_channel(), ','.join(map(str, ids)))
+        except RedisError:
+            story_cache_stats.errors += 1
+            logger.warning('Failed to publish invalidation of stories %s', ids, exc_info=True)
+
+    def invalidate_on_commit(self, *ids: int) -> None:
+        """Drop the cached stories once the current transaction commits.
+
+        Invalidating earlier would let a concurrent reader cache the
+        pre-commit row again.
+        """
+        on_commit(self._session, lambda: self.invalidate_many(ids))
+
+    @staticmethod
+    def _key(id_: int) -> str:
+        return f'{settings.app.NAME}:story:{id_}'
+
+
+async def listen_for_invalidations(
+    redis: RedisClient,
+    on_invalidation: Callable[[], None] | None = None,
+) -> None:
+    """Drop stories invalidated by any process from `local_story_cache`.
+
+    `on_invalidation` is called after each message, and after every
+    (re)subscription since messages may have been missed meanwhile.
+    Runs until cancelled, resubscribing after connection failures.
+    """
+    channel = _invalidation_channel()
+    while True:
+        try:
+            async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                await pubsub.subscribe(channel)
+                # Messages published while we were not subscribed are lost
+                local_story_cache.clear()
+                if on_invalidation is not None:
+                    on_invalidation()
+                async for message in pubsub.listen():
+                    _handle_invalidation(message['data'])
+                    if on_invalidation is not None:
+                        on_invalidation()
+        except RedisError:
+            logger.warning('Story invalidation subscription failed', exc_info=True)
+            await asyncio.sleep(1)
+
+
+def _handle_invalidation(payload: str) -> None:
+    for id_ in payload.split(','):
+        try:
+            local_story_cache.pop(int(id_))
+        except ValueError:
+            logger.warning('Malformed story invalidation message %r', payload)
+
+
+def _invalidation_channel() -> str:
+    return f'{settings.app.NAME}:{settings.local_cache.INVALIDATION_CHANNEL}'
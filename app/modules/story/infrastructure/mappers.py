@@ -1,10 +1,16 @@
+from sqlalchemy import RowMapping
+
 from app.modules.story.domain.entities import PageEntity, PageId, StoryEntity, StoryId
 from app.modules.story.infrastructure.models import PageModel, StoryModel
+from app.seedwork.utils.types import DictStrAny
 
 
 __all__ = [
     'map_entity_to_story_model',
+    'map_entity_to_story_values',
+    'map_page_row_to_entity',
     'map_story_model_to_entity',
+    'map_story_row_to_entity',
 ]
 
 
@@ -43,6 +49,21 @@ def map_entity_to_story_model(entity: StoryEntity) -> StoryModel:
     )
 
 
+def map_entity_to_story_values(entity: StoryEntity) -> DictStrAny:
+    return {
+        'name': entity.name,
+        'story_type': entity.story_type,
+        'delay': entity.delay,
+        'is_disabled': entity.is_disabled,
+        'is_blocking': entity.is_blocking,
+        'is_preview': entity.is_preview,
+        'is_repetitive': entity.is_repetitive,
+        'is_autoscroll': entity.is_autoscroll,
+        'publication_start_time': entity.publication_start_time,
+        'publication_end_time': entity.publication_end_time,
+    }
+
+
 def map_story_model_to_entity(model: StoryModel) -> StoryEntity:
     return StoryEntity(
         id=StoryId(model.id),
@@ -60,3 +81,32 @@ def map_story_model_to_entity(model: StoryModel) -> StoryEntity:
         modified_at=model.modified_at,
         pages=[map_page_model_to_entity(page) for page in model.pages],
     )
+
+
+def map_page_row_to_entity(row: RowMapping) -> PageEntity:
+    # Rows may hold only some of the columns, see `StoryCriteria.fields`
+    return PageEntity(
+        id=PageId(row['id']),
+        created_at=row.get('created_at'),
+        modified_at=row.get('modified_at'),
+        story_id=StoryId(row['story_id']),
+    )
+
+
+def map_story_row_to_entity(row: RowMapping, pages: list[PageEntity] | None) -> StoryEntity:
+    return StoryEntity(
+        id=StoryId(row['id']),
+        name=row.get('name'),
+        story_type=row.get('story_type'),
+        delay=row.get('delay'),
+        is_disabled=row.get('is_disabled'),
+        is_blocking=row.get('is_blocking'),
+        is_preview=row.get('is_preview'),
+        is_repetitive=row.get('is_repetitive'),
+        is_autoscroll=row.get('is_autoscroll'),
+        publication_start_time=row.get('publication_start_time'),
+        publication_end_time=row.get('publication_end_time'),
+        created_at=row.get('created_at'),
+        modified_at=row.get('modified_at'),
+        pages=pages,
+    )
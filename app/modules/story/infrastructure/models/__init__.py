@@ -1,8 +1,12 @@
 from app.modules.story.infrastructure.models.page import PageModel
-from app.modules.story.infrastructure.models.story import StoryModel
+from app.modules.story.infrastructure.models.story import (
+    STORY_PUBLICATION_WINDOW,
+    StoryModel,
+)
 
 
 __all__ = [
+    'STORY_PUBLICATION_WINDOW',
     'PageModel',
     'StoryModel',
 ]
@@ -14,9 +14,9 @@ class PageModel(Base):
     __tablename__ = 'page'
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    story_id: Mapped[int] = mapped_column(ForeignKey('story.id'))
+    story_id: Mapped[int] = mapped_column(ForeignKey('story.id', ondelete='CASCADE'), index=True)
 
     story: Mapped['StoryModel'] = relationship(
-        lazy='joined',
+        lazy='raise_on_sql',
         back_populates='pages',
     )
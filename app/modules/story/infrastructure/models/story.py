@@ -1,7 +1,17 @@
 import datetime
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Final, Literal
 
-from sqlalchemy import Boolean, String, sql
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    ColumnElement,
+    Index,
+    String,
+    func,
+    literal_column,
+    sql,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.infrastructure.db import Base
@@ -16,6 +26,25 @@ StoryType = Literal['install', 'update', 'info']
 
 class StoryModel(Base):
     __tablename__ = 'story'
+    __table_args__ = (
+        Index(
+            'ix_story_name_trgm',
+            'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+        ),
+        Index('ix_story_story_type_id', 'story_type', 'id'),
+        Index(
+            'ix_story_enabled_id',
+            'id',
+            postgresql_where=text('NOT is_disabled'),
+        ),
+        # NULLs pass, an open bound is always valid
+        CheckConstraint(
+            'publication_start_time <= publication_end_time',
+            name='publication_window',
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), server_default='')
@@ -29,8 +58,28 @@ class StoryModel(Base):
     publication_start_time: Mapped[datetime.datetime] = mapped_column(nullable=True)
     publication_end_time: Mapped[datetime.datetime] = mapped_column(nullable=True)
 
+    # Loaded explicitly by each query that needs pages
     pages: Mapped[list['PageModel']] = relationship(
-        lazy='selectin',
+        lazy='raise_on_sql',
         back_populates='story',
         cascade='all, delete-orphan',
+        # page.story_id is ON DELETE CASCADE, the database removes the pages
+        passive_deletes=True,
     )
+
+
+# Half-open `[start, end)` range of a story publication, NULL bounds are
+# unbounded. Queries must use this very expression (with the bounds as a
+# literal, not a parameter) for the planner to match the GiST index.
+STORY_PUBLICATION_WINDOW: Final[ColumnElement[Any]] = func.tstzrange(
+    StoryModel.publication_start_time,
+    StoryModel.publication_end_time,
+    literal_column("'[)'"),
+)
+
+Index(
+    'ix_story_published_window',
+    STORY_PUBLICATION_WINDOW,
+    postgresql_using='gist',
+    postgresql_where=text('NOT is_disabled'),
+)
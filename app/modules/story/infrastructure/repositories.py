@@ -1,28 +1,301 @@
-from sqlalchemy import select
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from contextlib import AbstractAsyncContextManager, nullcontext
+from datetime import datetime
+from typing import Any, Final
 
-from app.modules.story.domain.entities import StoryEntity
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    DateTime,
+    Executable,
+    Integer,
+    Result,
+    Row,
+    Select,
+    and_,
+    any_,
+    bindparam,
+    func,
+    literal,
+    not_,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import selectinload
+
+from app.infrastructure.db import read_snapshot, release_connection
+from app.infrastructure.tracing import trace_methods
+from app.modules.story.domain.criteria import StoryCriteria
+from app.modules.story.domain.entities import (
+    PageEntity,
+    PageId,
+    StoryEntity,
+    StoryId,
+    StoryVersion,
+)
+from app.modules.story.domain.exceptions import StoryPublicationWindowError
 from app.modules.story.domain.repositories import IStoryRepository
 from app.modules.story.infrastructure.mappers import (
     map_entity_to_story_model,
+    map_entity_to_story_values,
+    map_page_row_to_entity,
     map_story_model_to_entity,
+    map_story_row_to_entity,
 )
-from app.modules.story.infrastructure.models import StoryModel
+from app.modules.story.infrastructure.models import (
+    STORY_PUBLICATION_WINDOW,
+    PageModel,
+    StoryModel,
+)
+from app.seedwork.domain.exceptions import EntityNotFoundException
 from app.seedwork.infrastructure.repositories import SqlAlchemyBaseRepository
+from app.seedwork.utils.dt import get_utc_now
+from app.seedwork.utils.types import DictStrAny
 
 
 __all__ = ['SqlAlchemyStoryRepository']
 
 
+_story = StoryModel.__table__.c
+_page = PageModel.__table__.c
+
+# Reads are plain Core statements built once at import time, so each call
+# only binds parameters and hits the compiled cache right away.
+_SELECT_STORIES: Final = select(*StoryModel.__table__.c)
+_SELECT_STORY_BY_ID: Final = _SELECT_STORIES.where(_story.id == bindparam('id'))
+_SELECT_VERSION: Final = select(_story.id, _story.modified_at).where(_story.id == bindparam('id'))
+_SELECT_PAGES: Final = (
+    select(_page.id, _page.story_id, _page.created_at, _page.modified_at)
+    .where(_page.story_id == any_(bindparam('story_ids', type_=ARRAY(Integer))))
+    .order_by(_page.story_id, _page.id)
+)
+# Identity and version columns are always read, for cursors and ETags
+_STORY_KEY_COLUMNS: Final = (_story.id, _story.modified_at)
+_PAGE_KEY_COLUMNS: Final = (_page.id, _page.story_id)
+
+_ALL_PAGE_IDS: Final = StoryCriteria()
+_ALL_PAGES: Final = StoryCriteria(include_pages=True)
+_SELECT_PAGE_IDS: Final = (
+    select(_page.story_id, func.array_agg(aggregate_order_by(_page.id, _page.id)).label('ids'))
+    .where(_page.story_id == any_(bindparam('story_ids', type_=ARRAY(Integer))))
+    .group_by(_page.story_id)
+)
+# Earliest start or end of an enabled story's publication after `now`,
+# LEAST ignores the NULL of a side without any
+_SELECT_NEXT_PUBLICATION_CHANGE: Final = select(
+    func.least(
+        func.min(_story.publication_start_time).filter(_story.publication_start_time > bindparam('now')),
+        func.min(_story.publication_end_time).filter(_story.publication_end_time > bindparam('now')),
+    ),
+).where(not_(_story.is_disabled))
+
+
+@trace_methods
 class SqlAlchemyStoryRepository(
     IStoryRepository,
     SqlAlchemyBaseRepository[StoryEntity, StoryModel],
 ):
     entity_cls = StoryEntity
     model_cls = StoryModel
+    load_options = (selectinload(StoryModel.pages),)
+
+    async def get_by_id(self, entity_id: int) -> StoryEntity:
+        async with self._snapshot(_ALL_PAGES):
+            row = (await self._execute(_SELECT_STORY_BY_ID, {'id': entity_id})).one_or_none()
+            if row is None:
+                raise EntityNotFoundException(
+                    entity_type=self.entity_cls,
+                    kwargs={'id': entity_id},
+                )
+            return (await self._map_rows([row], _ALL_PAGES))[0]
 
     async def get_all(self) -> list[StoryEntity]:
-        objs = await self._session.scalars(select(self.model_cls))
-        return [self._map_model_to_entity(obj) for obj in objs]
+        async with self._snapshot(_ALL_PAGE_IDS):
+            rows = (await self._execute(_SELECT_STORIES)).all()
+            return await self._map_rows(rows, _ALL_PAGE_IDS)
+
+    async def get_list(self, criteria: StoryCriteria) -> list[StoryEntity]:
+        stmt = self._apply_filters(_select_stories(criteria.fields), criteria)
+        stmt = self._apply_pagination(stmt, criteria)
+
+        async with self._snapshot(criteria):
+            stories = await self._map_rows((await self._execute(stmt)).all(), criteria)
+        if criteria.before is not None:
+            # Rows before the cursor are fetched walking backwards
+            stories.reverse()
+        return stories
+
+    async def update_by_id(self, entity_id: int, values: Mapping[str, Any]) -> StoryEntity:
+        # One statement: the UPDATE ... RETURNING runs in a CTE and the
+        # outer SELECT adds the page ids of the updated row.
+        updated = (
+            update(StoryModel.__table__)
+            .where(_story.id == entity_id, *_publication_window_guard(values))
+            .values({**values, 'modified_at': get_utc_now()})
+            .returning(*StoryModel.__table__.c)
+            .cte('updated')
+        )
+        page_ids = (
+            select(func.array_agg(aggregate_order_by(_page.id, _page.id)))
+            .where(_page.story_id == updated.c.id)
+            .scalar_subquery()
+        )
+        row = (await self._execute(select(updated, page_ids.label('page_ids')))).one_or_none()
+        if row is None:
+            # Raises if the story does not exist, the guard failed otherwise
+            await self.get_version(entity_id)
+            raise StoryPublicationWindowError({'id': entity_id})
+        return map_story_row_to_entity(row._mapping, _page_refs(row.id, row.page_ids or ()))
+
+    async def get_version(self, entity_id: int) -> StoryVersion:
+        row = (await self._execute(_SELECT_VERSION, {'id': entity_id})).one_or_none()
+        if row is None:
+            raise EntityNotFoundException(
+                entity_type=self.entity_cls,
+                kwargs={'id': entity_id},
+            )
+        return StoryVersion(id=StoryId(row.id), modified_at=row.modified_at)
+
+    async def get_versions(self, criteria: StoryCriteria) -> list[StoryVersion]:
+        stmt = select(_story.id, _story.modified_at)
+        stmt = self._apply_pagination(self._apply_filters(stmt, criteria), criteria)
+
+        rows = await self._execute(stmt)
+        versions = [StoryVersion(id=StoryId(row.id), modified_at=row.modified_at) for row in rows]
+        if criteria.before is not None:
+            versions.reverse()
+        return versions
+
+    async def get_next_publication_change(self, after: datetime) -> datetime | None:
+        return (await self._execute(_SELECT_NEXT_PUBLICATION_CHANGE, {'now': after})).scalar()
+
+    async def iter_chunks(
+        self,
+        criteria: StoryCriteria,
+        chunk_size: int,
+    ) -> AsyncIterator[list[StoryEntity]]:
+        # Server-side cursor, only `chunk_size` rows are held in memory
+        stmt = _select_stories(criteria.fields)
+        stmt = self._apply_pagination(self._apply_filters(stmt, criteria), criteria)
+        # Cursors need a transaction, which also gives the export one snapshot
+        async with read_snapshot(self._session):
+            connection = await self._session.connection()
+            result = await connection.stream(stmt.execution_options(yield_per=chunk_size))
+            try:
+                async for rows in result.partitions():
+                    yield await self._map_rows(rows, criteria)
+            finally:
+                await result.close()
+
+    async def count(self, criteria: StoryCriteria) -> int:
+        stmt = self._apply_filters(
+            select(func.count()).select_from(StoryModel.__table__),
+            criteria,
+        )
+        return (await self._execute(stmt)).scalar() or 0
+
+    async def _execute(self, stmt: Executable, params: DictStrAny | None = None) -> Result[Any]:
+        # Core statements run on the session connection, in its transaction,
+        # but skip ORM loading, instrumentation and the identity map.
+        # Results are buffered, read-only sessions give the connection
+        # back right away instead of holding it for the whole request.
+        connection = await self._session.connection()
+        result = await connection.execute(stmt, params)
+        await release_connection(self._session)
+        return result
+
+    def _snapshot(self, criteria: StoryCriteria) -> AbstractAsyncContextManager[None]:
+        # Stories and their pages take two statements, which must agree
+        if criteria.with_pages:
+            return read_snapshot(self._session)
+        return nullcontext()
+
+    async def _map_rows(self, rows: Sequence[Row[Any]], criteria: StoryCriteria) -> list[StoryEntity]:
+        """Build entities with the pages `criteria` asks for, in one query for all rows.
+
+        Without `include_pages` only page ids are aggregated per story and
+        the page attributes are left empty.
+        """
+        if not rows:
+            return []
+        if not criteria.with_pages:
+            return [map_story_row_to_entity(row._mapping, None) for row in rows]
+
+        story_ids = [row.id for row in rows]
+        if criteria.include_pages:
+            pages = await self._get_pages(story_ids, criteria.page_fields)
+        else:
+            pages = await self._get_page_refs(story_ids)
+        return [map_story_row_to_entity(row._mapping, pages.get(row.id, [])) for row in rows]
+
+    async def _get_pages(
+        self,
+        story_ids: list[int],
+        fields: frozenset[str] | None,
+    ) -> dict[int, list[PageEntity]]:
+        stmt = _SELECT_PAGES
+        if fields is not None:
+            stmt = stmt.with_only_columns(
+                *_PAGE_KEY_COLUMNS,
+                *(column for name, column in _page.items() if name in fields),
+            )
+
+        pages: dict[int, list[PageEntity]] = defaultdict(list)
+        for row in await self._execute(stmt, {'story_ids': story_ids}):
+            pages[row.story_id].append(map_page_row_to_entity(row._mapping))
+        return pages
+
+    async def _get_page_refs(self, story_ids: list[int]) -> dict[int, list[PageEntity]]:
+        return {
+            row.story_id: _page_refs(row.story_id, row.ids)
+            for row in await self._execute(_SELECT_PAGE_IDS, {'story_ids': story_ids})
+        }
+
+    @classmethod
+    def _apply_filters(cls, stmt: Select[Any], criteria: StoryCriteria) -> Select[Any]:
+        if criteria.search:
+            # Both operators are served by the trigram GIN index on story.name
+            name = _story.name
+            stmt = stmt.where(
+                or_(
+                    name.ilike(f'%{_escape_like(criteria.search)}%', escape='/'),
+                    name.bool_op('%')(criteria.search),
+                ),
+            )
+        if criteria.story_type is not None:
+            stmt = stmt.where(_story.story_type == criteria.story_type)
+        if criteria.is_disabled is not None:
+            # `NOT is_disabled` rather than `IS false`, for partial indexes to apply
+            stmt = stmt.where(_story.is_disabled if criteria.is_disabled else not_(_story.is_disabled))
+        if criteria.is_published is not None:
+            published = _is_published_clause()
+            stmt = stmt.where(published if criteria.is_published else not_(published))
+        return stmt
+
+    @classmethod
+    def _apply_pagination(cls, stmt: Select[Any], criteria: StoryCriteria) -> Select[Any]:
+        # The only ordering key is the primary key itself, so the keyset
+        # predicate is a plain range condition on the PK index.
+        pk = _story.id
+        descending = criteria.descending
+        if criteria.after is not None:
+            stmt = stmt.where(pk < criteria.after.id if descending else pk > criteria.after.id)
+        elif criteria.before is not None:
+            stmt = stmt.where(pk > criteria.before.id if descending else pk < criteria.before.id)
+            descending = not descending
+
+        if criteria.ordering == 'relevance' and criteria.search:
+            stmt = stmt.order_by(func.similarity(_story.name, criteria.search).desc(), pk)
+        else:
+            stmt = stmt.order_by(pk.desc() if descending else pk)
+        if criteria.limit is not None:
+            stmt = stmt.limit(criteria.limit)
+        if criteria.offset:
+            stmt = stmt.offset(criteria.offset)
+        return stmt
 
     @classmethod
     def _map_entity_to_model(cls, entity: StoryEntity) -> StoryModel:
@@ -31,3 +304,56 @@ class SqlAlchemyStoryRepository(
     @classmethod
     def _map_model_to_entity(cls, model: StoryModel) -> StoryEntity:
         return map_story_model_to_entity(model)
+
+    @classmethod
+    def _map_entity_to_values(cls, entity: StoryEntity) -> DictStrAny:
+        return map_entity_to_story_values(entity)
+
+
+def _page_refs(story_id: int, page_ids: Iterable[int]) -> list[PageEntity]:
+    """Pages known by id only, their attributes are left empty."""
+    return [
+        PageEntity(id=PageId(id_), story_id=story_id, created_at=None, modified_at=None)
+        for id_ in page_ids
+    ]
+
+
+def _select_stories(fields: frozenset[str] | None) -> Select[Any]:
+    if fields is None:
+        return _SELECT_STORIES
+    return select(
+        *_STORY_KEY_COLUMNS,
+        *(column for name, column in _story.items() if name in fields),
+    )
+
+
+def _publication_window_guard(values: Mapping[str, Any]) -> list[ColumnElement[bool]]:
+    """Conditions keeping the window valid when `values` set a single bound.
+
+    Checked by the UPDATE itself against the stored bound, so a violation
+    leaves the row alone instead of failing the `publication_window`
+    constraint.
+    """
+    if ('publication_start_time' in values) == ('publication_end_time' in values):
+        # Neither bound changes, or both were validated together
+        return []
+    if 'publication_start_time' in values:
+        if (start := values['publication_start_time']) is None:
+            return []
+        return [or_(_story.publication_end_time.is_(None), _story.publication_end_time >= start)]
+    if (end := values['publication_end_time']) is None:
+        return []
+    return [or_(_story.publication_start_time.is_(None), _story.publication_start_time <= end)]
+
+
+def _is_published_clause() -> ColumnElement[bool]:
+    """Stories live right now, served by the `ix_story_published_window` GiST index."""
+    now = literal(get_utc_now(), DateTime(timezone=True))
+    return and_(
+        not_(_story.is_disabled),
+        STORY_PUBLICATION_WINDOW.op('@>')(now),
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace('/', '//').replace('%', '/%').replace('_', '/_')
@@ -4,14 +4,36 @@ from typing import Any
 from aioinject import Provider
 from aioinject.providers import Scoped
 
-from app.modules.story.application.services import StoryService
-from app.modules.story.domain.repositories import IStoryRepository
+from app.config.settings import TaskSettings
+from app.infrastructure.db import ReadOnlySession
+from app.infrastructure.saq import SaqQueue
+from app.modules.story.application.cache import IStoryCache, ReadOnlyStoryCache
+from app.modules.story.application.services import ReadOnlyStoryService, StoryService
+from app.modules.story.domain.repositories import IStoryRepository, ReadOnlyStoryRepository
+from app.modules.story.infrastructure.cache import StoryCache
 from app.modules.story.infrastructure.repositories import SqlAlchemyStoryRepository
 
 
 __all__ = ['providers']
 
+
+def create_read_only_story_repository(session: ReadOnlySession) -> ReadOnlyStoryRepository:
+    return ReadOnlyStoryRepository(SqlAlchemyStoryRepository(session))
+
+
+def create_read_only_story_service(
+    repository: ReadOnlyStoryRepository,
+    cache: IStoryCache,
+    saq_queue: SaqQueue,
+    task_settings: TaskSettings,
+) -> ReadOnlyStoryService:
+    return ReadOnlyStoryService(StoryService(repository, ReadOnlyStoryCache(cache), saq_queue, task_settings))
+
+
 providers: Iterable[Provider[Any]] = (
     Scoped(StoryService),
+    Scoped(StoryCache, IStoryCache),
     Scoped(SqlAlchemyStoryRepository, IStoryRepository),
+    Scoped(create_read_only_story_service, ReadOnlyStoryService),
+    Scoped(create_read_only_story_repository, ReadOnlyStoryRepository),
 )
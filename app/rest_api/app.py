@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Any
@@ -10,7 +12,11 @@ from app.config import settings
 from app.di.container import create_container
 from app.infrastructure.db import db_manager
 from app.infrastructure.logging import configure_logging
+from app.infrastructure.redis import RedisClient
+from app.infrastructure.tracing import configure_tracing
+from app.modules.story.infrastructure.cache import listen_for_invalidations
 from app.rest_api.exception_handlers import register_exception_handlers
+from app.rest_api.feed.snapshot import story_feed
 from app.rest_api.middlewares import register_middlewares
 from app.rest_api.openapi import custom_openapi
 from app.rest_api.responses import ORJSONResponse, default_json_responses
@@ -21,9 +27,24 @@ def create_lifespan(container: Container) -> Lifespan[FastAPI]:
     @asynccontextmanager
     async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
         # startup
-        db_manager.init(settings.database.dsn())
+        db_manager.init(settings.database.dsn(), settings.database.replica_dsns())
+        await db_manager.warm_up()
+        async with container.context() as ctx:
+            redis = await ctx.resolve(RedisClient)
+        background_tasks = [
+            asyncio.create_task(listen_for_invalidations(redis, on_invalidation=story_feed.mark_stale)),
+        ]
+        if settings.feed.ENABLED:
+            background_tasks.append(asyncio.create_task(story_feed.run(container)))
+        if db_manager.has_replicas:
+            background_tasks.append(asyncio.create_task(db_manager.monitor_replicas()))
         yield
         # shutdown
+        for task in background_tasks:
+            task.cancel()
+        for task in background_tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
         await db_manager.close()
         await container.aclose()
 
@@ -32,6 +53,7 @@ def create_lifespan(container: Container) -> Lifespan[FastAPI]:
 
 def create_app(**kwargs: Any) -> FastAPI:
     configure_logging()
+    configure_tracing()
 
     container = create_container()
     app = FastAPI(
@@ -0,0 +1,80 @@
+import datetime
+import hashlib
+from collections.abc import Iterable
+from email.utils import format_datetime, parsedate_to_datetime
+
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+__all__ = [
+    'cache_headers',
+    'has_preconditions',
+    'is_not_modified',
+    'make_etag',
+    'not_modified_response',
+]
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from hashable parts.
+
+    Datetimes are normalized to UTC so the same instant always produces
+    the same tag, whatever timezone object it was loaded with.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in _normalize(parts):
+        digest.update(repr(part).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def has_preconditions(request: Request) -> bool:
+    return 'if-none-match' in request.headers or 'if-modified-since' in request.headers
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: datetime.datetime | None = None,
+) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since as of RFC 9110, section 13.2.2."""
+    if (if_none_match := request.headers.get('if-none-match')) is not None:
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return '*' in tags or etag in tags
+
+    if last_modified is None or (if_modified_since := request.headers.get('if-modified-since')) is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=datetime.UTC)
+    # HTTP dates have a one second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def cache_headers(
+    etag: str,
+    cache_control: str,
+    last_modified: datetime.datetime | None = None,
+) -> dict[str, str]:
+    headers = {'ETag': etag, 'Cache-Control': cache_control}
+    if last_modified is not None:
+        headers['Last-Modified'] = format_datetime(last_modified.astimezone(datetime.UTC), usegmt=True)
+    return headers
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def _normalize(parts: Iterable[object]) -> Iterable[object]:
+    for part in parts:
+        if isinstance(part, datetime.datetime):
+            yield part.astimezone(datetime.UTC).isoformat()
+        elif isinstance(part, list | tuple):
+            yield tuple(_normalize(part))
+        else:
+            yield part
@@ -1,3 +1,4 @@
+from collections.abc import Mapping
 from typing import ClassVar
 
 from pydantic_core import ErrorDetails
@@ -6,6 +7,7 @@ from starlette import status
 from app.rest_api.jsonapi import (
     JSONApiError,
     JSONApiErrors,
+    JSONApiErrorSource,
 )
 
 
@@ -50,6 +52,95 @@ class ResourceNotFoundByIdError(JSONApiHTTPError):
         super().__init__(errors=errors)
 
 
+class ResourceIdConflictError(JSONApiHTTPError):
+    title = 'Resource id conflict'
+    status_code = status.HTTP_409_CONFLICT
+
+    def __init__(
+        self,
+        resource_id: str,
+        expected_id: int,
+    ) -> None:
+        title = str(self.title)
+        errors = JSONApiErrors(
+            errors=[
+                JSONApiError(
+                    status=self.status_code,
+                    title=title,
+                    detail=f'Resource id {resource_id} does not match the URL id {expected_id}',
+                    code='conflict',
+                    source=JSONApiErrorSource(pointer='/data/id'),
+                ),
+            ],
+        )
+        super().__init__(errors=errors)
+
+
+class OperationResourceNotFoundError(JSONApiHTTPError):
+    title = 'Resource not found'
+    status_code = status.HTTP_404_NOT_FOUND
+
+    def __init__(
+        self,
+        resource_type: str,
+        resource_ids: Mapping[int, int],
+    ) -> None:
+        """`resource_ids` maps atomic operation positions to missing ids."""
+        title = str(self.title)
+        errors = JSONApiErrors(
+            errors=[
+                JSONApiError(
+                    status=self.status_code,
+                    title=title,
+                    detail=f'{resource_type} with id {resource_id} not found',
+                    code='not_found',
+                    source=JSONApiErrorSource(pointer=f'/atomic:operations/{index}'),
+                )
+                for index, resource_id in sorted(resource_ids.items())
+            ],
+        )
+        super().__init__(errors=errors)
+
+
+class UnsupportedMediaTypeError(JSONApiHTTPError):
+    title = 'Unsupported media type'
+    status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+    def __init__(self, detail: str) -> None:
+        title = str(self.title)
+        errors = JSONApiErrors(
+            errors=[
+                JSONApiError(
+                    status=self.status_code,
+                    title=title,
+                    detail=detail,
+                    code='unsupported_media_type',
+                    source=JSONApiErrorSource(header='Content-Type'),
+                ),
+            ],
+        )
+        super().__init__(errors=errors)
+
+
+class ServiceUnavailableError(JSONApiHTTPError):
+    title = 'Service unavailable'
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def __init__(self, detail: str, retry_after: int) -> None:
+        title = str(self.title)
+        errors = JSONApiErrors(
+            errors=[
+                JSONApiError(
+                    status=self.status_code,
+                    title=title,
+                    detail=detail,
+                    code='unavailable',
+                ),
+            ],
+        )
+        super().__init__(errors=errors, headers={'Retry-After': str(retry_after)})
+
+
 class RequestParamValidationError(JSONApiHTTPError):
     title = 'Parameter validation error'
     status_code = status.HTTP_400_BAD_REQUEST
@@ -7,6 +7,7 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.requests import Request
 
+from app.rest_api.errors import JSONApiHTTPError
 from app.rest_api.jsonapi import (
     JSONApiError,
     JSONApiErrors,
@@ -35,6 +36,7 @@ def register_exception_handlers(app: FastAPI) -> None:
         http_exception_to_jsonapi_exception,  # type: ignore
     )
     app.add_exception_handler(JSONApiHTTPException, handle_jsonapi_http_exception)  # type: ignore
+    app.add_exception_handler(JSONApiHTTPError, handle_jsonapi_http_error)  # type: ignore
     app.add_exception_handler(RequestValidationError, handle_request_validation_error)  # type: ignore
     app.add_exception_handler(DomainException, handle_domain_exception)  # type: ignore
     app.add_exception_handler(BusinessLogicError, handle_business_logic_error)  # type: ignore
@@ -70,6 +72,17 @@ async def handle_jsonapi_http_exception(
     )
 
 
+async def handle_jsonapi_http_error(
+    _: Request,
+    exc: JSONApiHTTPError,
+) -> ORJSONResponse:
+    return ORJSONResponse(
+        content=exc.errors.model_dump(exclude_unset=True, exclude_none=True),
+        status_code=exc.status_code,
+        headers=exc.headers,
+    )
+
+
 async def handle_request_validation_error(
     _: Request,
     exc: RequestValidationError,
@@ -0,0 +1,4 @@
+from app.rest_api.feed.views import router as feed_router
+
+
+__all__ = ['feed_router']
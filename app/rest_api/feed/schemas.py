@@ -0,0 +1,11 @@
+from app.rest_api.manager.story.schemas import StoryObject
+from app.rest_api.utils import KebabCaseModel, SchemaModel
+
+
+class StoryFeedMeta(SchemaModel):
+    count: int
+
+
+class StoryFeedJsonApi(KebabCaseModel):
+    meta: StoryFeedMeta
+    data: list[StoryObject]
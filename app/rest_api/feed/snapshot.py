@@ -0,0 +1,147 @@
+"""In-process snapshot of the published stories behind the client feed.
+
+Each process keeps one immutable `FeedSnapshot` of pre-rendered documents
+and swaps it for a new one in the background, so feed requests are
+answered from memory alone.
+"""
+import asyncio
+import contextlib
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Final
+
+import orjson
+from aioinject import Container
+
+from app.config import settings
+from app.modules.story.application.dto import StoryOutDTO
+from app.modules.story.application.services import StoryService
+from app.rest_api.conditional import make_etag
+from app.rest_api.manager.story.encoders import story_resource
+from app.rest_api.responses import ORJSONResponse
+from app.seedwork.utils.dt import get_utc_now
+from app.seedwork.utils.types import DictStrAny
+
+
+__all__ = [
+    'FeedDocument',
+    'FeedSnapshot',
+    'StoryFeed',
+    'story_feed',
+]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class FeedDocument:
+    body: bytes
+    # Derived from the body, so every process serves the same tag
+    etag: str
+
+
+@dataclass(frozen=True, slots=True)
+class FeedSnapshot:
+    """Feed documents of the stories published at `built_at`.
+
+    `documents` holds one document per story type, plus the whole feed
+    under `None`. `expires_at` is the next publication start or end of
+    an enabled story, when the snapshot stops being accurate.
+    """
+
+    documents: Mapping[str | None, FeedDocument]
+    story_count: int
+    built_at: datetime
+    expires_at: datetime | None
+
+    def get(self, story_type: str | None) -> FeedDocument:
+        return self.documents.get(story_type, _EMPTY_DOCUMENT)
+
+
+class StoryFeed:
+    """Holds the current snapshot of this process and keeps it fresh.
+
+    The snapshot is rebuilt when `mark_stale` is called, when the next
+    publication change passes, and at least every `FEED_MAX_AGE_SECONDS`.
+    A failed rebuild keeps serving the previous snapshot.
+    """
+
+    def __init__(self) -> None:
+        self.snapshot: FeedSnapshot | None = None
+        self._stale: asyncio.Event | None = None
+
+    def mark_stale(self) -> None:
+        if self._stale is not None:
+            self._stale.set()
+
+    async def run(self, container: Container) -> None:
+        """Rebuild the snapshot until cancelled."""
+        # Bound to the running loop, not to the one at import time
+        self._stale = asyncio.Event()
+        while True:
+            self._stale.clear()
+            try:
+                self.snapshot = await _build_snapshot(container)
+            except Exception:
+                logger.exception('Failed to build the story feed snapshot')
+                timeout = settings.feed.RETRY_SECONDS
+            else:
+                timeout = _seconds_until_expiry(self.snapshot)
+
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stale.wait(), timeout)
+            # Let a burst of writes settle into a single rebuild
+            await asyncio.sleep(settings.feed.DEBOUNCE_SECONDS)
+
+
+story_feed: Final = StoryFeed()
+
+
+async def _build_snapshot(container: Container) -> FeedSnapshot:
+    async with container.context() as ctx:
+        service = await ctx.resolve(StoryService)
+        # Read before the stories: a change passing in between is then
+        # already reflected and only brings the next rebuild forward.
+        expires_at = await service.get_next_publication_change()
+        stories = await service.get_published_stories()
+    return _render_snapshot(stories, expires_at)
+
+
+def _render_snapshot(stories: Iterable[StoryOutDTO], expires_at: datetime | None) -> FeedSnapshot:
+    resources: list[DictStrAny] = []
+    by_type: defaultdict[str, list[DictStrAny]] = defaultdict(list)
+    for story in stories:
+        resource = story_resource(story)
+        resources.append(resource)
+        by_type[story.story_type].append(resource)
+
+    documents: dict[str | None, FeedDocument] = {None: _render_document(resources)}
+    documents.update((story_type, _render_document(items)) for story_type, items in by_type.items())
+    return FeedSnapshot(
+        documents=MappingProxyType(documents),
+        story_count=len(resources),
+        built_at=get_utc_now(),
+        expires_at=expires_at,
+    )
+
+
+def _render_document(resources: list[DictStrAny]) -> FeedDocument:
+    body = orjson.dumps(
+        {'meta': {'count': len(resources)}, 'data': resources},
+        option=ORJSONResponse.option,
+    )
+    return FeedDocument(body=body, etag=make_etag(body))
+
+
+def _seconds_until_expiry(snapshot: FeedSnapshot) -> float:
+    timeout = settings.feed.MAX_AGE_SECONDS
+    if snapshot.expires_at is not None:
+        timeout = min(timeout, (snapshot.expires_at - get_utc_now()).total_seconds())
+    return max(timeout, 0)
+
+
+_EMPTY_DOCUMENT: Final = _render_document([])
@@ -0,0 +1,49 @@
+import math
+from typing import Annotated
+
+from fastapi import APIRouter, Query, Request, Response
+from starlette import status
+
+from app.config import settings
+from app.rest_api.conditional import cache_headers, is_not_modified, not_modified_response
+from app.rest_api.errors import ServiceUnavailableError
+from app.rest_api.feed.schemas import StoryFeedJsonApi
+from app.rest_api.feed.snapshot import story_feed
+from app.rest_api.responses import JSON_API_MEDIA_TYPE, JSONApiResponse, build_responses
+
+
+router = APIRouter(prefix='/feed', tags=['feed'])
+
+
+@router.get(
+    '/stories/',
+    status_code=status.HTTP_200_OK,
+    response_model=StoryFeedJsonApi,
+    response_class=JSONApiResponse,
+    responses=build_responses(
+        status_code=status.HTTP_200_OK,
+        response_model=StoryFeedJsonApi,
+        content_type=JSON_API_MEDIA_TYPE,
+        exceptions=(ServiceUnavailableError,),
+    ),
+)
+async def get_story_feed(
+    request: Request,
+    story_type: Annotated[str | None, Query(max_length=50, alias='filter[story-type]')] = None,
+) -> Response:
+    """Stories published right now, served from the in-memory snapshot.
+
+    Never touches the database, the snapshot is rebuilt in the background.
+    """
+    snapshot = story_feed.snapshot
+    if snapshot is None:
+        raise ServiceUnavailableError(
+            detail='The story feed is not ready yet',
+            retry_after=math.ceil(settings.feed.RETRY_SECONDS),
+        )
+
+    document = snapshot.get(story_type)
+    headers = cache_headers(document.etag, settings.http_cache.STORY_FEED)
+    if is_not_modified(request, document.etag):
+        return not_modified_response(headers)
+    return JSONApiResponse(document.body, headers=headers)
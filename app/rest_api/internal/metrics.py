@@ -0,0 +1,74 @@
+import dataclasses
+
+from app.infrastructure.cache import CacheStats
+from app.infrastructure.db import db_manager
+from app.infrastructure.metrics import MetricsWriter
+from app.modules.story.infrastructure.cache import local_story_cache, story_cache_stats
+from app.rest_api.feed.snapshot import story_feed
+from app.rest_api.manager.story.documents import story_document_cache
+from app.rest_api.metrics import http_metrics
+
+
+__all__ = ['render_metrics']
+
+
+def render_metrics() -> str:
+    """Metrics of this process in the Prometheus text format."""
+    writer = MetricsWriter()
+    http_metrics.write(writer)
+    _write_pool_metrics(writer)
+    _write_cache_metrics(writer)
+    return writer.render()
+
+
+def _write_pool_metrics(writer: MetricsWriter) -> None:
+    pools = list(db_manager.pools())
+    gauges = {
+        'db_pool_size': ('Connections kept open.', lambda pool: pool.size()),
+        'db_pool_connections_in_use': ('Connections checked out.', lambda pool: pool.checkedout()),
+        'db_pool_connections_idle': ('Connections waiting in the pool.', lambda pool: pool.checkedin()),
+    }
+    for name, (help_, value) in gauges.items():
+        writer.metric(name, 'gauge', help_)
+        for pool_name, pool in pools:
+            writer.sample(name, value(pool), {'pool': pool_name})
+
+    counters = {
+        'db_pool_timeouts_total': ('Checkouts that timed out.', 'timeouts'),
+        'db_pool_connects_total': ('Connections opened.', 'connects'),
+        'db_pool_closes_total': ('Connections closed.', 'closes'),
+        'db_pool_invalidations_total': ('Connections invalidated.', 'invalidations'),
+    }
+    for name, (help_, attr) in counters.items():
+        writer.metric(name, 'counter', help_)
+        for pool_name, pool in pools:
+            writer.sample(name, getattr(pool.stats, attr), {'pool': pool_name})
+
+    writer.metric(
+        'db_pool_checkout_wait_milliseconds',
+        'histogram',
+        'Time checkouts waited for an idle connection.',
+    )
+    for pool_name, pool in pools:
+        writer.histogram('db_pool_checkout_wait_milliseconds', pool.stats.checkout_wait_ms, {'pool': pool_name})
+
+
+def _write_cache_metrics(writer: MetricsWriter) -> None:
+    caches: dict[str, CacheStats] = {
+        'story': story_cache_stats,
+        'story-local': local_story_cache.stats,
+        'story-render': story_document_cache.stats,
+    }
+    for field in dataclasses.fields(CacheStats):
+        name = f'cache_{field.name}_total'
+        writer.metric(name, 'counter', f'Cache {field.name}.')
+        for cache, stats in caches.items():
+            writer.sample(name, getattr(stats, field.name), {'cache': cache})
+
+    writer.metric('cache_size', 'gauge', 'Entries held in memory.')
+    writer.sample('cache_size', len(local_story_cache), {'cache': 'story-local'})
+    writer.sample('cache_size', len(story_document_cache), {'cache': 'story-render'})
+
+    writer.metric('story_feed_stories', 'gauge', 'Stories in the current feed snapshot.')
+    if (snapshot := story_feed.snapshot) is not None:
+        writer.sample('story_feed_stories', snapshot.story_count)
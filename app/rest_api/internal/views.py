@@ -1,5 +1,12 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 
+from app.infrastructure.db import db_manager
+from app.infrastructure.metrics import METRICS_MEDIA_TYPE
+from app.modules.story.infrastructure.cache import local_story_cache, story_cache_stats
+from app.rest_api.feed.snapshot import story_feed
+from app.rest_api.internal.metrics import render_metrics
+from app.rest_api.manager.story.documents import story_document_cache
 from app.seedwork.utils.types import DictStrAny
 from app.version import VERSION
 
@@ -10,3 +17,39 @@ router = APIRouter(prefix='/internal', tags=['internal'])
 @router.get('/oss/get-component-version/', response_model=None)
 def get_component_version() -> DictStrAny:
     return {'data': {'version': VERSION}}
+
+
+@router.get('/oss/cache-stats/', response_model=None)
+def get_cache_stats() -> DictStrAny:
+    return {
+        'data': {
+            'story': story_cache_stats.as_dict(),
+            'story-local': {
+                **local_story_cache.stats.as_dict(),
+                'size': len(local_story_cache),
+                'max-size': local_story_cache.max_size,
+            },
+            'story-render': {
+                **story_document_cache.stats.as_dict(),
+                'size': len(story_document_cache),
+                'max-size': story_document_cache.max_size,
+            },
+            'story-feed': {
+                'stories': snapshot.story_count,
+                'built-at': snapshot.built_at,
+                'expires-at': snapshot.expires_at,
+            }
+            if (snapshot := story_feed.snapshot) is not None
+            else None,
+        },
+    }
+
+
+@router.get('/oss/pool-stats/', response_model=None)
+def get_pool_stats() -> DictStrAny:
+    return {'data': db_manager.pool_stats()}
+
+
+@router.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(render_metrics(), media_type=METRICS_MEDIA_TYPE)
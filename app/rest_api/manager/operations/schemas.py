@@ -0,0 +1,82 @@
+from typing import Literal, Self
+
+from pydantic import Field, model_validator
+
+from app.config import settings
+from app.rest_api.manager.story.schemas import StoryAttributes, StoryObject, StoryPatchAttributes
+from app.rest_api.utils import SchemaModel, to_kebab_case
+
+
+def _kebab_names(names: set[str]) -> str:
+    return ', '.join(sorted(to_kebab_case(name) for name in names))
+
+
+class StoryOperationRef(SchemaModel):
+    type: Literal['stories'] = 'stories'
+    id: int
+
+
+class StoryOperationData(SchemaModel):
+    id: int | None = None
+    type: Literal['stories'] = 'stories'
+    # Updates change only the given attributes, as a PATCH of the resource
+    # does; adds are checked to give all of them.
+    attributes: StoryPatchAttributes = StoryPatchAttributes()
+
+
+class StoryOperation(SchemaModel):
+    op: Literal['add', 'update', 'remove']
+    ref: StoryOperationRef | None = None
+    data: StoryOperationData | None = None
+
+    @model_validator(mode='after')
+    def check_target(self) -> Self:
+        if self.op == 'remove':
+            if self.ref is None:
+                msg = 'remove operations require a ref'
+                raise ValueError(msg)
+            if self.data is not None:
+                msg = 'remove operations cannot have data'
+                raise ValueError(msg)
+            return self
+
+        if self.data is None:
+            msg = f'{self.op} operations require data'
+            raise ValueError(msg)
+        if self.op == 'add':
+            if self.ref is not None or self.data.id is not None:
+                msg = 'add operations cannot target an existing resource'
+                raise ValueError(msg)
+            if missing := StoryAttributes.model_fields.keys() - self.data.attributes.model_fields_set:
+                msg = f'add operations require every attribute, missing: {_kebab_names(missing)}'
+                raise ValueError(msg)
+        if self.op == 'update':
+            if self.target_id is None:
+                msg = 'update operations require data.id or a ref'
+                raise ValueError(msg)
+            if self.ref is not None and self.data.id is not None and self.ref.id != self.data.id:
+                msg = 'ref and data identify different resources'
+                raise ValueError(msg)
+        return self
+
+    @property
+    def target_id(self) -> int | None:
+        if self.ref is not None:
+            return self.ref.id
+        return self.data.id if self.data is not None else None
+
+
+class StoryAtomicOperationsJsonApi(SchemaModel):
+    operations: list[StoryOperation] = Field(
+        alias='atomic:operations',
+        min_length=1,
+        max_length=settings.story.ATOMIC_MAX_OPERATIONS,
+    )
+
+
+class StoryAtomicResult(SchemaModel):
+    data: StoryObject | None = None
+
+
+class StoryAtomicResultsJsonApi(SchemaModel):
+    results: list[StoryAtomicResult] = Field(alias='atomic:results')
@@ -0,0 +1,112 @@
+from typing import Annotated, cast
+
+from aioinject import Inject
+from aioinject.ext.fastapi import inject
+from fastapi import APIRouter, Body, Request, Response
+from starlette import status
+
+from app.modules.story.application.dto import (
+    StoryCreateDTO,
+    StoryOperationDTO,
+    StoryPatchDTO,
+    StoryRemoveDTO,
+)
+from app.modules.story.application.services import StoryService
+from app.modules.story.domain.exceptions import StoryOperationsError
+from app.rest_api.errors import (
+    OperationResourceNotFoundError,
+    RequestParamValidationError,
+    UnsupportedMediaTypeError,
+)
+from app.rest_api.manager.operations.schemas import (
+    StoryAtomicOperationsJsonApi,
+    StoryAtomicResultsJsonApi,
+    StoryOperation,
+    StoryOperationData,
+)
+from app.rest_api.manager.story.encoders import encode_story_atomic_results
+from app.rest_api.responses import (
+    JSON_API_ATOMIC_EXT,
+    JSON_API_ATOMIC_MEDIA_TYPE,
+    JSONApiResponse,
+    build_responses,
+)
+from app.seedwork.domain.exceptions import EntityNotFoundException
+
+
+StoryServiceDep = Annotated[StoryService, Inject]
+
+
+router = APIRouter(
+    prefix='/operations',
+    tags=['operations'],
+)
+
+
+class AtomicResponse(JSONApiResponse):
+    media_type = JSON_API_ATOMIC_MEDIA_TYPE
+
+
+@router.post(
+    '/',
+    status_code=status.HTTP_200_OK,
+    response_model=StoryAtomicResultsJsonApi,
+    response_class=AtomicResponse,
+    responses=build_responses(
+        status_code=status.HTTP_200_OK,
+        response_model=StoryAtomicResultsJsonApi,
+        content_type=JSON_API_ATOMIC_MEDIA_TYPE,
+        exceptions=(
+            RequestParamValidationError,
+            OperationResourceNotFoundError,
+            UnsupportedMediaTypeError,
+        ),
+    ),
+)
+@inject
+async def apply_operations(
+    request: Request,
+    service: StoryServiceDep,
+    data: Annotated[StoryAtomicOperationsJsonApi, Body(media_type=JSON_API_ATOMIC_MEDIA_TYPE)],
+) -> Response:
+    """Apply story operations of the JSON:API Atomic Operations extension.
+
+    See Also: https://jsonapi.org/ext/atomic/
+
+    """
+    if f'ext="{JSON_API_ATOMIC_EXT}"' not in request.headers.get('content-type', ''):
+        msg = f'Requests must use the {JSON_API_ATOMIC_MEDIA_TYPE} media type'
+        raise UnsupportedMediaTypeError(msg)
+
+    try:
+        results = await service.apply_operations([_to_dto(op) for op in data.operations])
+    except StoryOperationsError as e:
+        if not all(isinstance(error, EntityNotFoundException) for error in e.errors.values()):
+            raise
+        raise OperationResourceNotFoundError(
+            resource_type='stories',
+            resource_ids={
+                index: error.kwargs['id']
+                for index, error in e.errors.items()
+                if isinstance(error, EntityNotFoundException)
+            },
+        ) from e
+
+    if all(result is None for result in results):
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return AtomicResponse(encode_story_atomic_results(results))
+
+
+def _to_dto(operation: StoryOperation) -> StoryOperationDTO:
+    # `StoryOperation` validation guarantees the target and data of each op
+    if operation.op == 'remove':
+        return StoryRemoveDTO(id=cast(int, operation.target_id))
+
+    attrs = cast(StoryOperationData, operation.data).attributes
+    if operation.op == 'add':
+        return StoryCreateDTO(**attrs.model_dump())
+
+    return StoryPatchDTO(
+        id=cast(int, operation.target_id),
+        changes=attrs.model_dump(exclude_unset=True),
+    )
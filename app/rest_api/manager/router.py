@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.rest_api.manager.operations.views import router as operations_router
 from app.rest_api.manager.story.views import router as story_router
 
 
@@ -7,3 +8,4 @@ __all__ = ['manager_router']
 
 manager_router = APIRouter(prefix='/manager')
 manager_router.include_router(story_router)
+manager_router.include_router(operations_router)
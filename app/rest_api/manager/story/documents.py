@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Final, TypeAlias
+
+from app.config import settings
+from app.infrastructure.cache import LRUCache
+from app.modules.story.application.dto import StoryOutDTO
+from app.rest_api.manager.story.encoders import encode_story_document
+
+
+__all__ = [
+    'render_story_document',
+    'story_document_cache',
+]
+
+
+_Fieldset: TypeAlias = frozenset[str] | None
+
+# (story id, included pages, fieldsets) -> (story version, rendered document)
+story_document_cache: Final[
+    LRUCache[tuple[int, bool, _Fieldset, _Fieldset], tuple[datetime | None, bytes]]
+] = LRUCache(
+    max_size=settings.local_cache.RENDER_MAX_ITEMS if settings.local_cache.ENABLED else 0,
+    ttl=settings.local_cache.RENDER_TTL_SECONDS,
+)
+
+
+def render_story_document(
+    story: StoryOutDTO,
+    *,
+    include_pages: bool = False,
+    fields: _Fieldset = None,
+    page_fields: _Fieldset = None,
+) -> bytes:
+    """Return the `StoryJsonApi` document of a story as JSON bytes.
+
+    Documents are cached per story and representation, and reused while
+    `modified_at` stays the same. Rendering is lazy: a stale entry is
+    replaced by the first response needing the new version, which for
+    the writing process is the response to the write itself. The story
+    is still decoded from the story cache on a local miss.
+    """
+    key = (story.id, include_pages, fields, page_fields)
+    cached = story_document_cache.get(key)
+    if cached is not None and cached[0] == story.modified_at:
+        return cached[1]
+
+    body = encode_story_document(
+        story,
+        include_pages=include_pages,
+        fields=fields,
+        page_fields=page_fields,
+    )
+    story_document_cache.set(key, (story.modified_at, body))
+    return body
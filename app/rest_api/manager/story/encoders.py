@@ -0,0 +1,147 @@
+"""Direct JSON:API encoding of story DTOs.
+
+Produces the same documents as dumping `StoryJsonApi`/`StoryListJsonApi`
+with `by_alias=True, exclude_unset=True, exclude_none=True`, but builds
+plain dicts from precomputed kebab-case field maps instead of pydantic
+models. The schemas stay the source of the OpenAPI documentation.
+"""
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from functools import lru_cache
+from typing import Final
+
+import orjson
+
+from app.modules.story.application.dto import PageOutDTO, StoryOutDTO
+from app.rest_api.manager.page.schemas import PageAttributes
+from app.rest_api.manager.story.schemas import StoryAttributes
+from app.rest_api.responses import ORJSONResponse
+from app.rest_api.utils import to_kebab_case
+from app.seedwork.utils.types import DictStrAny
+
+
+__all__ = [
+    'encode_story_atomic_results',
+    'encode_story_document',
+    'encode_story_list_document',
+    'page_resource',
+    'stream_story_list_document',
+    'stream_story_ndjson',
+    'story_resource',
+]
+
+
+# (document key, DTO attribute) pairs, in schema order
+_STORY_ATTRIBUTES: Final = tuple(
+    (to_kebab_case(name), name) for name in StoryAttributes.model_fields
+)
+_PAGE_ATTRIBUTES: Final = tuple(
+    (to_kebab_case(name), name) for name in PageAttributes.model_fields
+)
+
+
+def story_resource(story: StoryOutDTO, fields: frozenset[str] | None = None) -> DictStrAny:
+    """Resource object of a story, `fields` is its sparse fieldset (snake case)."""
+    resource: DictStrAny = {
+        'id': str(story.id),
+        'type': 'stories',
+        'attributes': {
+            key: value
+            for key, name in _select_fields(_STORY_ATTRIBUTES, fields)
+            if (value := getattr(story, name)) is not None
+        },
+    }
+    if fields is None or 'pages' in fields:
+        resource['relationships'] = {
+            'pages': {
+                'data': [{'id': str(page.id), 'type': 'pages'} for page in story.pages or ()],
+            },
+        }
+    return resource
+
+
+def page_resource(page: PageOutDTO, fields: frozenset[str] | None = None) -> DictStrAny:
+    return {
+        'id': str(page.id),
+        'type': 'pages',
+        'attributes': {
+            key: value
+            for key, name in _select_fields(_PAGE_ATTRIBUTES, fields)
+            if (value := getattr(page, name)) is not None
+        },
+    }
+
+
+def encode_story_document(
+    story: StoryOutDTO,
+    *,
+    include_pages: bool = False,
+    fields: frozenset[str] | None = None,
+    page_fields: frozenset[str] | None = None,
+) -> bytes:
+    document: DictStrAny = {'data': story_resource(story, fields)}
+    if include_pages:
+        document['included'] = [page_resource(page, page_fields) for page in story.pages or ()]
+    return orjson.dumps(document, option=ORJSONResponse.option)
+
+
+def encode_story_list_document(
+    stories: Iterable[StoryOutDTO],
+    meta: DictStrAny,
+    links: DictStrAny | None = None,
+    *,
+    include_pages: bool = False,
+    fields: frozenset[str] | None = None,
+    page_fields: frozenset[str] | None = None,
+) -> bytes:
+    document: DictStrAny = {'meta': meta}
+    if links:
+        document['links'] = links
+    stories = list(stories)
+    document['data'] = [story_resource(story, fields) for story in stories]
+    if include_pages:
+        # A page belongs to a single story, there are no duplicates to drop
+        document['included'] = [
+            page_resource(page, page_fields) for story in stories for page in story.pages or ()
+        ]
+    return orjson.dumps(document, option=ORJSONResponse.option)
+
+
+def encode_story_atomic_results(results: Iterable[StoryOutDTO | None]) -> bytes:
+    document = {
+        'atomic:results': [
+            {'data': story_resource(story)} if story is not None else {}
+            for story in results
+        ],
+    }
+    return orjson.dumps(document, option=ORJSONResponse.option)
+
+
+@lru_cache(maxsize=256)
+def _select_fields(
+    attributes: tuple[tuple[str, str], ...],
+    fields: frozenset[str] | None,
+) -> tuple[tuple[str, str], ...]:
+    if fields is None:
+        return attributes
+    return tuple((key, name) for key, name in attributes if name in fields)
+
+
+async def stream_story_ndjson(chunks: AsyncIterable[list[StoryOutDTO]]) -> AsyncIterator[bytes]:
+    """Encode chunks of stories as newline-delimited resource objects."""
+    option = ORJSONResponse.option | orjson.OPT_APPEND_NEWLINE
+    async for stories in chunks:
+        yield b''.join(orjson.dumps(story_resource(story), option=option) for story in stories)
+
+
+async def stream_story_list_document(chunks: AsyncIterable[list[StoryOutDTO]]) -> AsyncIterator[bytes]:
+    """Encode chunks of stories as a single JSON:API document, piece by piece."""
+    yield b'{"data":['
+    separator = b''
+    async for stories in chunks:
+        if not stories:
+            continue
+        yield separator + b','.join(
+            orjson.dumps(story_resource(story), option=ORJSONResponse.option) for story in stories
+        )
+        separator = b','
+    yield b']}'
@@ -1,10 +1,22 @@
-from typing import Literal, Self
+import types
+from datetime import datetime
+from typing import Final, Literal, Self
 
-from pydantic import AwareDatetime
+from pydantic import AwareDatetime, model_validator
 
 from app.modules.story.application.dto import StoryOutDTO
-from app.rest_api.manager.page.schemas import PageListRelatedObject, PageRelatedObject
-from app.rest_api.utils import KebabCaseModel, SchemaModel
+from app.rest_api.manager.page.schemas import (
+    PageListRelatedObject,
+    PageObject,
+    PageRelatedObject,
+)
+from app.rest_api.utils import KebabCaseModel, SchemaModel, to_kebab_case
+
+
+def _check_publication_window(start: datetime | None, end: datetime | None) -> None:
+    if start is not None and end is not None and end < start:
+        msg = 'publication-end-time must not be earlier than publication-start-time'
+        raise ValueError(msg)
 
 
 class StoryAttributes(KebabCaseModel):
@@ -20,6 +32,48 @@ class StoryAttributes(KebabCaseModel):
     publication_start_time: AwareDatetime | None
     publication_end_time: AwareDatetime | None
 
+    @model_validator(mode='after')
+    def check_publication_window(self) -> Self:
+        _check_publication_window(self.publication_start_time, self.publication_end_time)
+        return self
+
+
+_NOT_NULL_ATTRIBUTES: Final = frozenset(
+    name
+    for name, field in StoryAttributes.model_fields.items()
+    if not (isinstance(field.annotation, types.UnionType) and types.NoneType in field.annotation.__args__)
+)
+
+
+class StoryPatchAttributes(KebabCaseModel):
+    """`StoryAttributes` where every attribute may be left out."""
+
+    name: str | None = None
+    story_type: str | None = None
+    delay: int | None = None
+    is_disabled: bool | None = None
+    is_blocking: bool | None = None
+    is_preview: bool | None = None
+    is_repetitive: bool | None = None
+    is_autoscroll: bool | None = None
+
+    publication_start_time: AwareDatetime | None = None
+    publication_end_time: AwareDatetime | None = None
+
+    @model_validator(mode='after')
+    def check_not_null(self) -> Self:
+        for name in sorted(self.model_fields_set & _NOT_NULL_ATTRIBUTES):
+            if getattr(self, name) is None:
+                msg = f'{to_kebab_case(name)} cannot be null'
+                raise ValueError(msg)
+        return self
+
+    @model_validator(mode='after')
+    def check_publication_window(self) -> Self:
+        # With a single bound given, the update checks it against the stored one
+        _check_publication_window(self.publication_start_time, self.publication_end_time)
+        return self
+
 
 class StoryRelationships(KebabCaseModel):
     pages: PageListRelatedObject | None
@@ -37,6 +91,12 @@ class StoryUpdateObject(SchemaModel):
     relationships: StoryRelationships
 
 
+class StoryPatchObject(SchemaModel):
+    id: str | None = None
+    type: Literal['stories'] = 'stories'
+    attributes: StoryPatchAttributes = StoryPatchAttributes()
+
+
 class StoryObject(SchemaModel):
     id: str | None = None
     type: Literal['stories'] = 'stories'
@@ -78,15 +138,28 @@ class StoryUpdateJsonApi(SchemaModel):
     data: StoryUpdateObject
 
 
+class StoryPatchJsonApi(SchemaModel):
+    data: StoryPatchObject
+
+
 class StoryJsonApi(SchemaModel):
     data: StoryObject
+    included: list[PageObject] | None = None
 
 
 class LimitOffsetPaginationMeta(SchemaModel):
     limit: int
     offset: int
+    total: int | None = None
+
+
+class PaginationLinks(SchemaModel):
+    next: str | None = None
+    prev: str | None = None
 
 
 class StoryListJsonApi(KebabCaseModel):
     meta: LimitOffsetPaginationMeta
+    links: PaginationLinks | None = None
     data: list[StoryObject]
+    included: list[PageObject] | None = None
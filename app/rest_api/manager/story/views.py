@@ -1,26 +1,64 @@
 from dataclasses import dataclass
-from typing import Annotated, Literal
+from typing import Annotated, Final, Literal
 
 from aioinject import Inject
 from aioinject.ext.fastapi import inject
-from fastapi import APIRouter, Body, Depends, Query
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from pydantic_core import ErrorDetails
 from starlette import status
+from starlette.responses import StreamingResponse
 
-from app.modules.story.application.dto import StoryCreateDTO, StoryUpdateDTO
-from app.modules.story.application.services import StoryService
-from app.rest_api.errors import RequestParamValidationError, ResourceNotFoundByIdError
+from app.config import settings
+from app.modules.story.application.dto import (
+    StoryCreateDTO,
+    StoryPageDTO,
+    StoryPatchDTO,
+    StoryUpdateDTO,
+    StoryVersionPageDTO,
+)
+from app.modules.story.application.services import ReadOnlyStoryService, StoryService
+from app.modules.story.domain.criteria import StoryCriteria, StoryCursor, StoryOrdering
+from app.rest_api.conditional import (
+    cache_headers,
+    has_preconditions,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
+from app.rest_api.errors import (
+    RequestParamValidationError,
+    ResourceIdConflictError,
+    ResourceNotFoundByIdError,
+)
+from app.rest_api.manager.page.schemas import PageAttributes
+from app.rest_api.manager.story.documents import render_story_document
+from app.rest_api.manager.story.encoders import (
+    encode_story_list_document,
+    stream_story_list_document,
+    stream_story_ndjson,
+)
 from app.rest_api.manager.story.schemas import (
-    LimitOffsetPaginationMeta,
+    StoryAttributes,
     StoryCreateJsonApi,
     StoryJsonApi,
     StoryListJsonApi,
-    StoryObject,
+    StoryPatchJsonApi,
     StoryUpdateJsonApi,
 )
-from app.rest_api.responses import JSON_API_MEDIA_TYPE, build_responses
+from app.rest_api.pagination import decode_cursor, encode_cursor
+from app.rest_api.responses import (
+    JSON_API_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    JSONApiResponse,
+    build_responses,
+)
+from app.rest_api.utils import to_kebab_case
+from app.seedwork.utils.types import DictStrAny
 
 
 StoryServiceDep = Annotated[StoryService, Inject]
+# Reads may be served by a replica, see `route_database_reads`
+ReadOnlyStoryServiceDep = Annotated[ReadOnlyStoryService, Inject]
 
 
 router = APIRouter(
@@ -28,62 +66,254 @@ router = APIRouter(
     tags=['stories'],
 )
 
+# Sparse fieldset member -> attribute name
+_STORY_FIELDS: Final = {
+    **{to_kebab_case(name): name for name in StoryAttributes.model_fields},
+    'pages': 'pages',
+}
+_PAGE_FIELDS: Final = {to_kebab_case(name): name for name in PageAttributes.model_fields}
+
+StoryFieldsQuery = Annotated[str | None, Query(max_length=300, alias='fields[stories]')]
+PageFieldsQuery = Annotated[str | None, Query(max_length=100, alias='fields[pages]')]
+
 
 @dataclass(slots=True, kw_only=True)
 class ListStoryQueryParams:
-    ordering: Annotated[Literal['id', '-id'], Query(max_length=3)] = 'id'
+    ordering: Annotated[StoryOrdering, Query(max_length=9)] = 'id'
     search: Annotated[str | None, Query(max_length=50)] = None
 
     story_type: Annotated[
         str | None,
         Query(max_length=50, alias='filter[story-type]'),
     ] = None
-    platform_id: Annotated[
-        str | None,
-        Query(max_length=50, alias='filter[platform-id]'),
-    ] = None
-    app_version: Annotated[
-        str | None,
-        Query(max_length=50, alias='filter[app-version]'),
-    ] = None
-    segment: Annotated[int | None, Query(alias='filter[segment]')] = None
     is_published: Annotated[bool | None, Query(alias='filter[is-published]')] = None
     is_disabled: Annotated[bool | None, Query(alias='filter[is-disabled]')] = None
 
     limit: Annotated[int, Query(ge=1, le=100)] = 20
     offset: Annotated[int, Query(ge=0)] = 0
+    after: Annotated[str | None, Query(max_length=100, alias='page[after]')] = None
+    before: Annotated[str | None, Query(max_length=100, alias='page[before]')] = None
+    with_total: Annotated[bool, Query(alias='meta[total]')] = False
+    include: Annotated[str | None, Query(max_length=50)] = None
+    fields: StoryFieldsQuery = None
+    page_fields: PageFieldsQuery = None
+
+    def to_criteria(self) -> StoryCriteria:
+        if self.after is not None and self.before is not None:
+            raise _invalid_query_param(
+                'page[before]',
+                self.before,
+                'page[after] and page[before] are mutually exclusive',
+            )
+        if self.after is not None or self.before is not None:
+            if self.offset:
+                raise _invalid_query_param(
+                    'offset',
+                    self.offset,
+                    'offset cannot be combined with a page cursor',
+                )
+            if self.ordering == 'relevance':
+                raise _invalid_query_param(
+                    'ordering',
+                    self.ordering,
+                    'relevance ordering cannot be combined with a page cursor',
+                )
+
+        return StoryCriteria(
+            ordering=self.ordering,
+            search=self.search,
+            story_type=self.story_type,
+            is_published=self.is_published,
+            is_disabled=self.is_disabled,
+            limit=self.limit,
+            offset=self.offset,
+            after=_decode_story_cursor('page[after]', self.after),
+            before=_decode_story_cursor('page[before]', self.before),
+            include_pages=_include_pages(self.include),
+            fields=_parse_fieldset('fields[stories]', self.fields, _STORY_FIELDS),
+            page_fields=_parse_fieldset('fields[pages]', self.page_fields, _PAGE_FIELDS),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class ExportStoryQueryParams:
+    format: Annotated[Literal['ndjson', 'jsonapi'], Query(max_length=7)] = 'ndjson'
+    ordering: Annotated[Literal['id', '-id'], Query(max_length=3)] = 'id'
+
+    story_type: Annotated[
+        str | None,
+        Query(max_length=50, alias='filter[story-type]'),
+    ] = None
+    is_published: Annotated[bool | None, Query(alias='filter[is-published]')] = None
+    is_disabled: Annotated[bool | None, Query(alias='filter[is-disabled]')] = None
+
+    def to_criteria(self) -> StoryCriteria:
+        return StoryCriteria(
+            ordering=self.ordering,
+            story_type=self.story_type,
+            is_published=self.is_published,
+            is_disabled=self.is_disabled,
+        )
+
+
+def _include_pages(include: str | None) -> bool:
+    """Validate the JSON:API `include` parameter, `pages` is the only path."""
+    if include is None:
+        return False
+    paths = set(include.split(','))
+    if unsupported := paths - {'pages'}:
+        raise _invalid_query_param(
+            'include',
+            include,
+            f'Unsupported include paths: {", ".join(sorted(unsupported))}',
+        )
+    return True
+
+
+def _parse_fieldset(
+    param: str,
+    value: str | None,
+    known: dict[str, str],
+) -> frozenset[str] | None:
+    """Map a JSON:API sparse fieldset to attribute names."""
+    if value is None:
+        return None
+    members = {member for member in value.split(',') if member}
+    if unknown := members - known.keys():
+        raise _invalid_query_param(
+            param,
+            value,
+            f'Unknown fields: {", ".join(sorted(unknown))}',
+        )
+    return frozenset(known[member] for member in members)
+
+
+def _decode_story_cursor(param: str, token: str | None) -> StoryCursor | None:
+    if token is None:
+        return None
+    try:
+        key, id_ = decode_cursor(token, size=2)
+    except ValueError as e:
+        raise _invalid_query_param(param, token, str(e)) from e
+    return StoryCursor(key=key, id=id_)
+
+
+def _invalid_query_param(param: str, value: object, msg: str) -> RequestParamValidationError:
+    return RequestParamValidationError(
+        errors=[ErrorDetails(type='value_error', loc=('query', param), msg=msg, input=value)],
+    )
+
+
+def _build_pagination_links(request: Request, page: StoryPageDTO) -> DictStrAny | None:
+    url = request.url.remove_query_params(['page[after]', 'page[before]', 'offset'])
+    links: DictStrAny = {}
+    if page.next_cursor is not None:
+        token = _encode_story_cursor(page.next_cursor)
+        links['next'] = str(url.include_query_params(**{'page[after]': token}))
+    if page.prev_cursor is not None:
+        token = _encode_story_cursor(page.prev_cursor)
+        links['prev'] = str(url.include_query_params(**{'page[before]': token}))
+    return links or None
+
+
+def _encode_story_cursor(cursor: StoryCursor) -> str:
+    return encode_cursor(cursor.key, cursor.id)
+
+
+def _make_list_etag(
+    request: Request,
+    page: StoryPageDTO | StoryVersionPageDTO,
+    total: int | None,
+) -> str:
+    return make_etag(
+        sorted(request.query_params.multi_items()),
+        [(story.id, story.modified_at) for story in page.items],
+        page.next_cursor,
+        page.prev_cursor,
+        total,
+    )
 
 
 @router.get(
     '/',
     status_code=status.HTTP_200_OK,
+    response_model=StoryListJsonApi,
+    response_class=JSONApiResponse,
     responses=build_responses(
         status_code=status.HTTP_200_OK,
         response_model=StoryListJsonApi,
         content_type=JSON_API_MEDIA_TYPE,
     ),
-    response_model_exclude_unset=True,
-    response_model_exclude_none=True,
 )
 @inject
 async def list_stories(
+    request: Request,
     p: Annotated[ListStoryQueryParams, Depends()],
-    service: StoryServiceDep,
-) -> StoryListJsonApi:
-    stories = await service.get_all_stories()
+    service: ReadOnlyStoryServiceDep,
+) -> Response:
+    criteria = p.to_criteria()
+    cache_control = settings.http_cache.STORY_LIST
+
+    if has_preconditions(request):
+        # Answer unchanged pages from ids and versions alone
+        versions = await service.get_stories_page_versions(criteria)
+        total = await service.count_stories(criteria) if p.with_total else None
+        etag = _make_list_etag(request, versions, total)
+        if is_not_modified(request, etag):
+            return not_modified_response(cache_headers(etag, cache_control))
+
+    page = await service.get_stories_page(criteria)
+    total = await service.count_stories(criteria) if p.with_total else None
+    meta: DictStrAny = {'limit': p.limit, 'offset': p.offset}
+    if total is not None:
+        meta['total'] = total
 
-    return StoryListJsonApi(
-        meta=LimitOffsetPaginationMeta(
-            limit=p.limit,
-            offset=p.offset,
+    return JSONApiResponse(
+        encode_story_list_document(
+            page.items,
+            meta=meta,
+            links=_build_pagination_links(request, page),
+            include_pages=criteria.include_pages,
+            fields=criteria.fields,
+            page_fields=criteria.page_fields,
         ),
-        data=[StoryObject.from_dto(dto) for dto in stories],
+        # No Last-Modified here: removing a story from the page does not
+        # move the newest modified_at, only the ETag catches that.
+        headers=cache_headers(_make_list_etag(request, page, total), cache_control),
     )
 
 
+@router.get(
+    '/export/',
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            'content': {
+                NDJSON_MEDIA_TYPE: {},
+                JSON_API_MEDIA_TYPE: {'schema': StoryListJsonApi.model_json_schema()},
+            },
+        },
+    },
+)
+@inject
+async def export_stories(
+    p: Annotated[ExportStoryQueryParams, Depends()],
+    service: ReadOnlyStoryServiceDep,
+) -> StreamingResponse:
+    # StreamingResponse awaits every send, so a slow client throttles the
+    # database cursor, and it stops iterating once the client disconnects.
+    chunks = service.export_stories(p.to_criteria(), settings.story.EXPORT_CHUNK_SIZE)
+    if p.format == 'ndjson':
+        return StreamingResponse(stream_story_ndjson(chunks), media_type=NDJSON_MEDIA_TYPE)
+    return StreamingResponse(stream_story_list_document(chunks), media_type=JSON_API_MEDIA_TYPE)
+
+
 @router.get(
     '/{story_id}/',
     status_code=status.HTTP_200_OK,
+    response_model=StoryJsonApi,
+    response_class=JSONApiResponse,
     responses=build_responses(
         status_code=status.HTTP_200_OK,
         response_model=StoryJsonApi,
@@ -93,36 +323,70 @@ async def list_stories(
             ResourceNotFoundByIdError,
         ),
     ),
-    response_model_exclude_unset=True,
-    response_model_exclude_none=True,
 )
 @inject
 async def get_story(
+    request: Request,
     story_id: int,
     service: StoryServiceDep,
-) -> StoryJsonApi:
+    include: Annotated[str | None, Query(max_length=50)] = None,
+    fields: StoryFieldsQuery = None,
+    page_fields: PageFieldsQuery = None,
+) -> Response:
+    # Single stories are served from the story cache, which keeps whole
+    # stories, so fieldsets only trim the rendered document here. Misses
+    # are read from the primary: the cache must not be filled from a
+    # replica that may lag behind.
+    include_pages = _include_pages(include)
+    story_fields = _parse_fieldset('fields[stories]', fields, _STORY_FIELDS)
+    page_fieldset = _parse_fieldset('fields[pages]', page_fields, _PAGE_FIELDS)
+    representation = (
+        include_pages,
+        sorted(story_fields) if story_fields is not None else None,
+        sorted(page_fieldset) if page_fieldset is not None else None,
+    )
+    cache_control = settings.http_cache.STORY_DETAIL
+
+    if has_preconditions(request):
+        version = await service.get_story_version(story_id)
+        etag = make_etag(version.id, version.modified_at, representation)
+        if is_not_modified(request, etag, version.modified_at):
+            return not_modified_response(cache_headers(etag, cache_control, version.modified_at))
+
     story = await service.get_story(story_id)
 
-    return StoryJsonApi(data=StoryObject.from_dto(story))
+    return JSONApiResponse(
+        render_story_document(
+            story,
+            include_pages=include_pages,
+            fields=story_fields,
+            page_fields=page_fieldset,
+        ),
+        headers=cache_headers(
+            make_etag(story.id, story.modified_at, representation),
+            cache_control,
+            story.modified_at,
+        ),
+    )
 
 
 @router.post(
     '/',
     status_code=status.HTTP_201_CREATED,
+    response_model=StoryJsonApi,
+    response_class=JSONApiResponse,
     responses=build_responses(
         status_code=status.HTTP_201_CREATED,
         response_model=StoryJsonApi,
         content_type=JSON_API_MEDIA_TYPE,
         exceptions=(RequestParamValidationError,),
     ),
-    response_model_exclude_unset=True,
-    response_model_exclude_none=True,
 )
 @inject
 async def create_story(
     service: StoryServiceDep,
     data: Annotated[StoryCreateJsonApi, Body(media_type=JSON_API_MEDIA_TYPE)],
-) -> StoryJsonApi:
+) -> JSONApiResponse:
     attrs = data.data.attributes
     story = await service.create_story(
         StoryCreateDTO(
@@ -138,12 +402,17 @@ async def create_story(
             publication_end_time=attrs.publication_end_time,
         ),
     )
-    return StoryJsonApi(data=StoryObject.from_dto(story))
+    return JSONApiResponse(
+        render_story_document(story),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.put(
     '/{story_id}/',
     status_code=status.HTTP_200_OK,
+    response_model=StoryJsonApi,
+    response_class=JSONApiResponse,
     responses=build_responses(
         status_code=status.HTTP_200_OK,
         response_model=StoryJsonApi,
@@ -153,15 +422,13 @@ async def create_story(
             ResourceNotFoundByIdError,
         ),
     ),
-    response_model_exclude_unset=True,
-    response_model_exclude_none=True,
 )
 @inject
 async def update_story(
     story_id: int,
     service: StoryServiceDep,
     data: Annotated[StoryUpdateJsonApi, Body(media_type=JSON_API_MEDIA_TYPE)],
-) -> StoryJsonApi:
+) -> JSONApiResponse:
     attrs = data.data.attributes
     story = await service.update_story(
         StoryUpdateDTO(
@@ -179,7 +446,41 @@ async def update_story(
             pages=[],
         ),
     )
-    return StoryJsonApi(data=StoryObject.from_dto(story))
+    return JSONApiResponse(render_story_document(story))
+
+
+@router.patch(
+    '/{story_id}/',
+    status_code=status.HTTP_200_OK,
+    response_model=StoryJsonApi,
+    response_class=JSONApiResponse,
+    responses=build_responses(
+        status_code=status.HTTP_200_OK,
+        response_model=StoryJsonApi,
+        content_type=JSON_API_MEDIA_TYPE,
+        exceptions=(
+            RequestParamValidationError,
+            ResourceIdConflictError,
+            ResourceNotFoundByIdError,
+        ),
+    ),
+)
+@inject
+async def patch_story(
+    story_id: int,
+    service: StoryServiceDep,
+    data: Annotated[StoryPatchJsonApi, Body(media_type=JSON_API_MEDIA_TYPE)],
+) -> JSONApiResponse:
+    if data.data.id is not None and data.data.id != str(story_id):
+        raise ResourceIdConflictError(resource_id=data.data.id, expected_id=story_id)
+
+    story = await service.patch_story(
+        StoryPatchDTO(
+            id=story_id,
+            changes=data.data.attributes.model_dump(exclude_unset=True),
+        ),
+    )
+    return JSONApiResponse(render_story_document(story))
 
 
 @router.delete(
@@ -0,0 +1,128 @@
+"""Per-process HTTP request metrics, recorded by `MetricsMiddleware`."""
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Final
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.metrics import Histogram, MetricsWriter
+
+
+__all__ = [
+    'HttpMetrics',
+    'MetricsMiddleware',
+    'http_metrics',
+]
+
+
+# Upper bounds of the request duration buckets, in seconds
+_DURATION_BUCKETS: Final = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Upper bounds of the response size buckets, in bytes
+_SIZE_BUCKETS: Final = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+_METHODS: Final = frozenset({'GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'})
+# Labels of requests no route matched and of unknown methods
+_UNMATCHED_ROUTE: Final = 'unmatched'
+_OTHER_METHOD: Final = 'other'
+
+
+@dataclass(slots=True)
+class RouteMetrics:
+    duration_seconds: Histogram = field(default_factory=lambda: Histogram(_DURATION_BUCKETS))
+    response_size_bytes: Histogram = field(default_factory=lambda: Histogram(_SIZE_BUCKETS))
+    # status code -> responses
+    responses: defaultdict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class HttpMetrics:
+    """Request metrics labelled by method and route template.
+
+    Route templates keep the label set bounded by the routes of the app.
+    In-flight requests are counted per method alone, the route is only
+    known once the router has matched the request.
+    """
+
+    def __init__(self) -> None:
+        # method -> requests being handled
+        self.in_flight: defaultdict[str, int] = defaultdict(int)
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+
+    def observe(self, method: str, route: str, status: int, duration: float, size: int) -> None:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[method, route] = RouteMetrics()
+        metrics.duration_seconds.observe(duration)
+        metrics.response_size_bytes.observe(size)
+        metrics.responses[status] += 1
+
+    def write(self, writer: MetricsWriter) -> None:
+        writer.metric('http_requests_in_flight', 'gauge', 'Requests being handled.')
+        for method, count in self.in_flight.items():
+            writer.sample('http_requests_in_flight', count, {'method': method})
+
+        writer.metric('http_responses_total', 'counter', 'Responses sent, by status code.')
+        for (method, route), metrics in self.routes.items():
+            for status, count in metrics.responses.items():
+                labels = {'method': method, 'route': route, 'status': str(status)}
+                writer.sample('http_responses_total', count, labels)
+
+        writer.metric(
+            'http_request_duration_seconds',
+            'histogram',
+            'Time from receiving a request to sending the last byte of its response.',
+        )
+        for (method, route), metrics in self.routes.items():
+            labels = {'method': method, 'route': route}
+            writer.histogram('http_request_duration_seconds', metrics.duration_seconds, labels)
+
+        writer.metric('http_response_size_bytes', 'histogram', 'Response body sizes.')
+        for (method, route), metrics in self.routes.items():
+            labels = {'method': method, 'route': route}
+            writer.histogram('http_response_size_bytes', metrics.response_size_bytes, labels)
+
+
+http_metrics: Final = HttpMetrics()
+
+
+class MetricsMiddleware:
+    """Records every HTTP request of the app in `http_metrics`.
+
+    A plain ASGI middleware, unlike `BaseHTTPMiddleware` it adds no task
+    or stream per request. The route template is read from the `route`
+    the router stores in the scope.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method'] if scope['method'] in _METHODS else _OTHER_METHOD
+        status, size = 500, 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+            await send(message)
+
+        http_metrics.in_flight[method] += 1
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            http_metrics.in_flight[method] -= 1
+            route = scope.get('route')
+            http_metrics.observe(
+                method,
+                getattr(route, 'path', _UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - started_at,
+                size,
+            )
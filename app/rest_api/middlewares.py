@@ -1,15 +1,31 @@
+import math
+import time
+from typing import Final
+
 from aioinject import Container
 from aioinject.ext.fastapi import AioInjectMiddleware
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from log_utils.extensions.starlette import log_http_middleware
+from starlette.middleware.base import RequestResponseEndpoint
 from starlette.middleware.cors import CORSMiddleware
 
+from app.config import settings
+from app.infrastructure.db import db_manager, pin_to_primary
+from app.rest_api.metrics import MetricsMiddleware
+from app.rest_api.tracing import TracingMiddleware
+
 
 __all__ = ['register_middlewares']
 
 
+_SAFE_METHODS: Final = frozenset({'GET', 'HEAD', 'OPTIONS'})
+# Unix time until which the client reads from the primary
+_PRIMARY_UNTIL_COOKIE: Final = 'db-primary-until'
+
+
 def register_middlewares(app: FastAPI, container: Container) -> None:
     app.add_middleware(AioInjectMiddleware, container=container)
+    app.middleware('http')(route_database_reads)
     app.middleware('http')(log_http_middleware)
     app.add_middleware(
         CORSMiddleware,
@@ -18,3 +34,43 @@ def register_middlewares(app: FastAPI, container: Container) -> None:
         allow_methods=['*'],
         allow_headers=['*'],
     )
+    # Outermost, so the time spent in the other middlewares is included
+    if settings.tracing.ENABLED:
+        app.add_middleware(TracingMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
+
+async def route_database_reads(request: Request, call_next: RequestResponseEndpoint) -> Response:
+    """Keep the reads of a client on the primary right after its writes.
+
+    Routes opt into replicas by depending on a read-only service, see
+    `ReadOnlySession`. A successful write marks its client with a cookie,
+    until it expires the read-only sessions of the client use the primary,
+    so it sees its own changes. Only clients that keep cookies get this:
+    others, or another client of the same user, may read from a replica
+    that has not caught up yet, for up to the replication lag.
+    """
+    if request.method in _SAFE_METHODS:
+        if _primary_until(request) > time.time():
+            with pin_to_primary():
+                return await call_next(request)
+        return await call_next(request)
+
+    response = await call_next(request)
+    if db_manager.has_replicas and response.status_code < 400:
+        sticky_seconds = settings.database.REPLICA_STICKY_SECONDS
+        response.set_cookie(
+            _PRIMARY_UNTIL_COOKIE,
+            str(time.time() + sticky_seconds),
+            max_age=math.ceil(sticky_seconds),
+            httponly=True,
+            samesite='lax',
+        )
+    return response
+
+
+def _primary_until(request: Request) -> float:
+    try:
+        return float(request.cookies.get(_PRIMARY_UNTIL_COOKIE, 0))
+    except ValueError:
+        return 0
@@ -0,0 +1,38 @@
+import base64
+
+import orjson
+
+
+__all__ = [
+    'decode_cursor',
+    'encode_cursor',
+]
+
+
+def encode_cursor(*values: int) -> str:
+    """Pack cursor values into an opaque url-safe token."""
+    raw = orjson.dumps(values)
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(token: str, size: int) -> tuple[int, ...]:
+    """Unpack a token made by `encode_cursor`.
+
+    Raises `ValueError` if the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = orjson.loads(raw)
+    except ValueError as e:
+        msg = 'Malformed cursor'
+        raise ValueError(msg) from e
+
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(type(value) is int for value in values)
+    ):
+        msg = 'Malformed cursor'
+        raise ValueError(msg)
+
+    return tuple(values)
@@ -12,14 +12,21 @@ __all__ = [
     'Response',
     'ListResponse',
     'ORJSONResponse',
+    'JSONApiResponse',
     'build_responses',
     'default_json_responses',
     'JSON_MEDIA_TYPE',
     'JSON_API_MEDIA_TYPE',
+    'JSON_API_ATOMIC_EXT',
+    'JSON_API_ATOMIC_MEDIA_TYPE',
+    'NDJSON_MEDIA_TYPE',
 ]
 
 JSON_MEDIA_TYPE: Final = 'application/json'
 JSON_API_MEDIA_TYPE: Final = 'application/vnd.api+json'
+JSON_API_ATOMIC_EXT: Final = 'https://jsonapi.org/ext/atomic'
+JSON_API_ATOMIC_MEDIA_TYPE: Final = f'{JSON_API_MEDIA_TYPE}; ext="{JSON_API_ATOMIC_EXT}"'
+NDJSON_MEDIA_TYPE: Final = 'application/x-ndjson'
 
 DataT = TypeVar('DataT')
 
@@ -39,6 +46,12 @@ class ORJSONResponse(DefaultJSONResponse):
 class JSONApiResponse(ORJSONResponse):
     media_type = JSON_API_MEDIA_TYPE
 
+    def render(self, content: Any) -> bytes:
+        # Pre-rendered documents are sent as is
+        if isinstance(content, bytes):
+            return content
+        return super().render(content)
+
 
 class _BaseResponse(BaseModel):
     pass
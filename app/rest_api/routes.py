@@ -1,5 +1,6 @@
 from fastapi import APIRouter, FastAPI
 
+from app.rest_api.feed.router import feed_router
 from app.rest_api.internal.router import internal_router
 from app.rest_api.manager.router import manager_router
 
@@ -11,5 +12,6 @@ def register_routes(app: FastAPI) -> None:
     api_router = APIRouter(prefix='/api')
     api_router.include_router(manager_router)
     api_router.include_router(internal_router)
+    api_router.include_router(feed_router)
 
     app.include_router(api_router)
@@ -0,0 +1,48 @@
+from opentelemetry import propagate
+from opentelemetry.trace import SpanKind, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.tracing import tracer
+
+
+__all__ = ['TracingMiddleware']
+
+
+class TracingMiddleware:
+    """Runs every HTTP request in a server span, continuing the caller's trace.
+
+    The span is renamed after the route template once the router has
+    matched the request, like the labels of `MetricsMiddleware`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+        with tracer.start_as_current_span(
+            method,
+            context=propagate.extract(headers),
+            kind=SpanKind.SERVER,
+            attributes={'http.request.method': method, 'url.path': scope['path']},
+        ) as span:
+
+            async def send_with_status(message: Message) -> None:
+                if message['type'] == 'http.response.start':
+                    status = message['status']
+                    span.set_attribute('http.response.status_code', status)
+                    if status >= 500:
+                        span.set_status(StatusCode.ERROR)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                if (route := scope.get('route')) is not None:
+                    span.set_attribute('http.route', route.path)
+                    span.update_name(f'{method} {route.path}')
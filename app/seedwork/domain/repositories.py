@@ -1,4 +1,6 @@
 import abc
+from collections.abc import Sequence
+from contextlib import AbstractAsyncContextManager
 from typing import Generic
 
 from app.seedwork.domain.entities import EntityId, EntityT
@@ -14,10 +16,18 @@ class IBaseRepository(Generic[EntityT], metaclass=abc.ABCMeta):
     async def add(self, entity: EntityT) -> EntityT:
         ...
 
+    @abc.abstractmethod
+    async def add_many(self, entities: Sequence[EntityT]) -> list[EntityT]:
+        """Insert entities, returning them in the same order."""
+
     @abc.abstractmethod
     async def update(self, entity: EntityT) -> EntityT:
         ...
 
+    @abc.abstractmethod
+    async def update_many(self, entities: Sequence[EntityT]) -> list[EntityT]:
+        """Update existing entities, entities without a row are skipped."""
+
     @abc.abstractmethod
     async def remove(self, entity: EntityT) -> None:
         ...
@@ -26,6 +36,14 @@ class IBaseRepository(Generic[EntityT], metaclass=abc.ABCMeta):
     async def remove_by_id(self, entity_id: EntityId) -> None:
         ...
 
+    @abc.abstractmethod
+    async def remove_many(self, entity_ids: Sequence[EntityId]) -> list[EntityId]:
+        """Delete entities by id, returning the ids that existed."""
+
     @abc.abstractmethod
     async def get_by_id(self, entity_id: EntityId) -> EntityT:
         ...
+
+    @abc.abstractmethod
+    def atomic(self) -> AbstractAsyncContextManager[None]:
+        """Undo all changes made inside the block when it raises."""
@@ -1,12 +1,28 @@
 import abc
-from typing import Generic, TypeVar
-
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from typing import ClassVar, Generic, TypeVar
+
+from sqlalchemy import (
+    ARRAY,
+    any_,
+    cast,
+    column,
+    delete,
+    insert,
+    inspect,
+    literal,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
 from app.infrastructure.db import Base
 from app.seedwork.domain.entities import EntityId, EntityT
 from app.seedwork.domain.exceptions import EntityNotFoundException
 from app.seedwork.domain.repositories import IBaseRepository
+from app.seedwork.utils.types import DictStrAny
 
 
 __all__ = [
@@ -17,6 +33,10 @@ __all__ = [
 
 ModelT = TypeVar('ModelT', bound=Base)
 
+# Rows per `UPDATE ... FROM (VALUES ...)`, keeps the statement well below
+# the 32767 bind parameters allowed by the Postgres protocol
+_UPDATE_BATCH_SIZE = 1000
+
 
 class SqlAlchemyBaseRepository(
     IBaseRepository[EntityT],
@@ -25,6 +45,9 @@ class SqlAlchemyBaseRepository(
 ):
     entity_cls: type[EntityT]
     model_cls: type[ModelT]
+    # Loader options of every ORM query that maps models to entities,
+    # relationships read by `_map_model_to_entity` must be loaded here
+    load_options: ClassVar[Sequence[ORMOption]] = ()
 
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
@@ -35,27 +58,92 @@ class SqlAlchemyBaseRepository(
         await self._session.flush()
         return self._map_model_to_entity(mapped_model)
 
+    async def add_many(self, entities: Sequence[EntityT]) -> list[EntityT]:
+        """Insert entities with multi-row `INSERT ... RETURNING`, in order."""
+        if not entities:
+            return []
+        models = await self._session.scalars(
+            insert(self.model_cls)
+            .returning(self.model_cls, sort_by_parameter_order=True)
+            .options(*self.load_options),
+            [self._map_entity_to_values(entity) for entity in entities],
+        )
+        return [self._map_model_to_entity(model) for model in models]
+
     async def update(self, entity: EntityT) -> EntityT:
         mapped_model = self._map_entity_to_model(entity)
-        merged = await self._session.merge(mapped_model)
+        merged = await self._session.merge(mapped_model, options=self.load_options)
         self._session.add(merged)
+        await self._session.flush()
         return self._map_model_to_entity(merged)
 
+    async def update_many(self, entities: Sequence[EntityT]) -> list[EntityT]:
+        """Update entities with `UPDATE ... FROM (VALUES ...) ... RETURNING`.
+
+        Entities without a matching row are skipped, so callers compare
+        the returned ids with the requested ones. The order of the result
+        is unspecified.
+        """
+        table = self.model_cls.__table__
+        pk = inspect(self.model_cls).primary_key[0]
+        updated: list[EntityT] = []
+        for start in range(0, len(entities), _UPDATE_BATCH_SIZE):
+            batch = entities[start:start + _UPDATE_BATCH_SIZE]
+            rows = [{pk.key: entity.id, **self._map_entity_to_values(entity)} for entity in batch]
+            keys = list(rows[0])
+            data = values(
+                *(column(key, table.c[key].type) for key in keys),
+                name='data',
+            ).data([tuple(row.values()) for row in rows])
+            stmt = (
+                update(self.model_cls)
+                .where(pk == data.c[pk.key])
+                # NULLs in VALUES are untyped, a column of only NULLs would be text
+                .values({key: cast(data.c[key], table.c[key].type) for key in keys if key != pk.key})
+                .returning(self.model_cls)
+                .options(*self.load_options)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            models = await self._session.scalars(stmt)
+            updated.extend(self._map_model_to_entity(model) for model in models)
+        return updated
+
     async def remove(self, entity: EntityT) -> None:
-        model = await self._session.get(self.model_cls, entity.id)
-        await self._session.delete(model)
+        await self.remove_by_id(entity.id)
 
     async def remove_by_id(self, entity_id: EntityId) -> None:
-        model = await self._session.get(self.model_cls, entity_id)
-        if not model:
+        """Delete a row with a single `DELETE ... RETURNING`.
+
+        Dependent rows are left to the `ON DELETE` rules of their foreign keys.
+        """
+        pk = inspect(self.model_cls).primary_key[0]
+        deleted = await self._session.scalar(
+            delete(self.model_cls)
+            .where(pk == entity_id)
+            .returning(pk)
+            .execution_options(synchronize_session=False),
+        )
+        if deleted is None:
             raise EntityNotFoundException(
                 entity_type=self.entity_cls,
                 kwargs={'id': entity_id},
             )
-        await self._session.delete(model)
+
+    async def remove_many(self, entity_ids: Sequence[EntityId]) -> list[EntityId]:
+        """Delete rows with `DELETE ... WHERE id = ANY(...)`, return the deleted ids."""
+        if not entity_ids:
+            return []
+        pk = inspect(self.model_cls).primary_key[0]
+        stmt = (
+            delete(self.model_cls)
+            .where(pk == any_(literal(list(entity_ids), ARRAY(pk.type))))
+            .returning(pk)
+            .execution_options(synchronize_session=False)
+        )
+        return list(await self._session.scalars(stmt))
 
     async def get_by_id(self, entity_id: EntityId) -> EntityT:
-        model = await self._session.get(self.model_cls, entity_id)
+        model = await self._session.get(self.model_cls, entity_id, options=self.load_options)
         if not model:
             raise EntityNotFoundException(
                 entity_type=self.entity_cls,
@@ -63,6 +151,12 @@ class SqlAlchemyBaseRepository(
             )
         return self._map_model_to_entity(model)
 
+    @asynccontextmanager
+    async def atomic(self) -> AsyncIterator[None]:
+        """Roll back everything done inside the block if it raises."""
+        async with self._session.begin_nested():
+            yield
+
     @classmethod
     @abc.abstractmethod
     def _map_entity_to_model(cls, entity: EntityT) -> ModelT:
@@ -72,3 +166,8 @@ class SqlAlchemyBaseRepository(
     @abc.abstractmethod
     def _map_model_to_entity(cls, model: ModelT) -> EntityT:
         ...
+
+    @classmethod
+    @abc.abstractmethod
+    def _map_entity_to_values(cls, entity: EntityT) -> DictStrAny:
+        """Column values written by bulk inserts and updates, keyed by attribute."""
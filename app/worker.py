@@ -5,7 +5,14 @@ import saq
 from app.config import settings
 from app.di.container import create_container
 from app.infrastructure.logging import configure_logging
-from app.infrastructure.saq import SaqQueue, TaskContext, saq_queue
+from app.infrastructure.saq import (
+    SaqQueue,
+    TaskContext,
+    end_job_span,
+    saq_queue,
+    start_job_span,
+)
+from app.infrastructure.tracing import configure_tracing
 from app.modules.story.application.tasks import (
     refresh_all_stories_job,
     refresh_story_task,
@@ -17,6 +24,7 @@ logger = logging.getLogger(__name__)
 
 async def startup(ctx: TaskContext) -> None:
     configure_logging()
+    configure_tracing()
 
     logger.info('Worker init')
     if logger.isEnabledFor(logging.DEBUG):
@@ -69,4 +77,6 @@ saq_settings = {
     ],
     'startup': startup,
     'shutdown': shutdown,
+    'before_process': start_job_span,
+    'after_process': end_job_span,
 }
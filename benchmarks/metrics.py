@@ -0,0 +1,61 @@
+"""Per-request overhead of `MetricsMiddleware` and the cost of a scrape.
+
+Requests are sent straight to a trivial ASGI app, with and without the
+middleware around it, so the difference is what the middleware adds.
+The scrape renders `/api/internal/metrics` after the requests, with the
+samples of the routes they went to.
+
+Run with `python -m benchmarks.metrics [--requests N] [--routes N]`.
+"""
+import argparse
+import asyncio
+from collections.abc import Sequence
+from types import SimpleNamespace
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.rest_api.internal.metrics import render_metrics
+from app.rest_api.metrics import MetricsMiddleware
+from benchmarks.timing import time_async, time_sync
+
+
+async def plain_app(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b'{}'})
+
+
+async def receive() -> Message:
+    return {'type': 'http.request', 'body': b''}
+
+
+async def send(message: Message) -> None:
+    pass
+
+
+def make_request(route: str) -> Scope:
+    # The router stores the matched route in the scope, the middleware reads its path
+    return {'type': 'http', 'method': 'GET', 'path': route, 'route': SimpleNamespace(path=route)}
+
+
+async def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.metrics')
+    parser.add_argument('--requests', type=int, default=10_000, help='requests per timing')
+    parser.add_argument('--routes', type=int, default=20, help='distinct routes requested')
+    args = parser.parse_args(argv)
+
+    routes = [f'/api/route-{number}/' for number in range(args.routes)]
+    instrumented_app = MetricsMiddleware(plain_app)
+
+    async def requests(app: ASGIApp) -> None:
+        for number in range(args.requests):
+            await app(make_request(routes[number % len(routes)]), receive, send)
+
+    plain = await time_async('plain app', lambda: requests(plain_app), number=1)
+    instrumented = await time_async('with MetricsMiddleware', lambda: requests(instrumented_app), number=1)
+    print(f'{"overhead per request":<40} {(instrumented - plain) / args.requests * 1000:10.3f} us')
+
+    time_sync(f'render metrics, {args.routes} routes', render_metrics)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""Story reads under each `STATEMENT_CACHE_MODE`.
+
+Every mode gets its own engine and runs the same repository reads in a
+single connection: a page of stories with their pages, a count and a
+story by id. Statements are prepared on the first run, the timings show
+what each later execution costs. The seeded rows are rolled back at the end.
+
+Needs a migrated database, `DB_*` settings select it. Point them at a
+pgbouncer in transaction mode to include its overhead. Run with
+`python -m benchmarks.statement_cache [--stories N] [--limit N]`.
+"""
+import argparse
+import asyncio
+from collections.abc import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.config.settings import StatementCacheMode
+from app.infrastructure.db.manager import DatabaseSessionManager
+from app.modules.story.domain.criteria import StoryCriteria
+from app.modules.story.infrastructure.repositories import SqlAlchemyStoryRepository
+from benchmarks.story_reads import seed
+from benchmarks.timing import time_async
+
+
+async def run(mode: StatementCacheMode, stories: int, limit: int) -> None:
+    settings.database.STATEMENT_CACHE_MODE = mode
+    engine = DatabaseSessionManager._create_engine(settings.database.dsn())
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            session = AsyncSession(bind=connection, join_transaction_mode='create_savepoint')
+            await seed(session, stories, pages=3)
+            repository = SqlAlchemyStoryRepository(session)
+            criteria = StoryCriteria(limit=limit, include_pages=True)
+            [story] = await repository.get_list(StoryCriteria(limit=1))
+
+            await time_async(f'{mode}, list {limit} stories', lambda: repository.get_list(criteria), number=50)
+            await time_async(f'{mode}, count', lambda: repository.count(criteria), number=50)
+            await time_async(f'{mode}, story by id', lambda: repository.get_by_id(story.id), number=50)
+
+            await session.close()
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+async def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.statement_cache')
+    parser.add_argument('--stories', type=int, default=1000, help='stories to seed')
+    parser.add_argument('--limit', type=int, default=20, help='stories per list read')
+    args = parser.parse_args(argv)
+
+    for mode in StatementCacheMode:
+        await run(mode, args.stories, args.limit)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""Story list documents: pydantic schemas against the direct encoder.
+
+The schema path is what the list route did before `encoders.py`: build
+`StoryListJsonApi` from the DTOs and serialize it like `response_model`
+does. Run with `python -m benchmarks.story_encoders [--stories N ...]`.
+"""
+import argparse
+import datetime as dt
+from collections.abc import Sequence
+
+import orjson
+
+from app.modules.story.application.dto import PageOutDTO, StoryOutDTO
+from app.rest_api.manager.page.schemas import PageObject
+from app.rest_api.manager.story.encoders import encode_story_list_document
+from app.rest_api.manager.story.schemas import LimitOffsetPaginationMeta, StoryListJsonApi, StoryObject
+from app.rest_api.responses import ORJSONResponse
+from benchmarks.timing import time_sync
+
+
+def make_stories(count: int, pages: int) -> list[StoryOutDTO]:
+    now = dt.datetime.now(dt.UTC)
+    return [
+        StoryOutDTO(
+            id=id_,
+            name=f'Story {id_}',
+            story_type='info',
+            delay=id_ % 30 or None,
+            is_disabled=False,
+            is_blocking=id_ % 2 == 0,
+            is_preview=False,
+            is_repetitive=True,
+            is_autoscroll=False,
+            publication_start_time=now,
+            publication_end_time=None,
+            created_at=now,
+            modified_at=now,
+            pages=[
+                PageOutDTO(id=id_ * pages + page, created_at=now, modified_at=now)
+                for page in range(pages)
+            ],
+        )
+        for id_ in range(1, count + 1)
+    ]
+
+
+def encode_with_schemas(stories: list[StoryOutDTO], include_pages: bool) -> bytes:
+    document = StoryListJsonApi(
+        meta=LimitOffsetPaginationMeta(limit=len(stories), offset=0, total=len(stories)),
+        data=[StoryObject.from_dto(story) for story in stories],
+        included=[PageObject.from_dto(page) for story in stories for page in story.pages or ()]
+        if include_pages
+        else None,
+    )
+    content = document.model_dump(mode='json', by_alias=True, exclude_unset=True, exclude_none=True)
+    return orjson.dumps(content, option=ORJSONResponse.option)
+
+
+def encode_directly(stories: list[StoryOutDTO], include_pages: bool) -> bytes:
+    meta = {'limit': len(stories), 'offset': 0, 'total': len(stories)}
+    return encode_story_list_document(stories, meta, include_pages=include_pages)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.story_encoders')
+    parser.add_argument('--stories', type=int, nargs='+', default=[100, 10_000])
+    parser.add_argument('--pages', type=int, default=3, help='pages per story')
+    args = parser.parse_args(argv)
+
+    for count in args.stories:
+        stories = make_stories(count, args.pages)
+        number = max(1, 10_000 // count)
+        for include_pages in (False, True):
+            suffix = f'{count} stories' + (', include=pages' if include_pages else '')
+            time_sync(f'schemas, {suffix}', lambda: encode_with_schemas(stories, include_pages), number=number)
+            time_sync(f'encoder, {suffix}', lambda: encode_directly(stories, include_pages), number=number)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Story list reads: ORM models against the Core statements of the repository.
+
+The ORM path is what `SqlAlchemyStoryRepository.get_list` did before it
+read rows with Core: load `StoryModel`s with their pages and map them to
+entities. Both paths read the same page of seeded stories in a single
+connection. The seeded rows are rolled back at the end.
+
+Needs a migrated database, `DB_*` settings select it. Run with
+`python -m benchmarks.story_reads [--stories N] [--limit N] [--pages N]`.
+"""
+import argparse
+import asyncio
+from collections.abc import Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from app.config import settings
+from app.modules.story.domain.criteria import StoryCriteria
+from app.modules.story.domain.entities import StoryEntity
+from app.modules.story.infrastructure.mappers import map_story_model_to_entity
+from app.modules.story.infrastructure.models import PageModel, StoryModel
+from app.modules.story.infrastructure.repositories import SqlAlchemyStoryRepository
+from app.seedwork.utils.dt import get_utc_now
+from benchmarks.timing import time_async
+
+
+async def seed(session: AsyncSession, stories: int, pages: int) -> None:
+    now = get_utc_now()
+    story_ids = (
+        await session.scalars(
+            insert(StoryModel).returning(StoryModel.id),
+            [
+                {'name': f'Story {number}', 'story_type': 'info', 'created_at': now, 'modified_at': now}
+                for number in range(stories)
+            ],
+        )
+    ).all()
+    if pages:
+        await session.execute(
+            insert(PageModel),
+            [
+                {'story_id': story_id, 'created_at': now, 'modified_at': now}
+                for story_id in story_ids
+                for _ in range(pages)
+            ],
+        )
+
+
+async def read_with_orm(session: AsyncSession, limit: int) -> list[StoryEntity]:
+    stmt = (
+        select(StoryModel)
+        .options(selectinload(StoryModel.pages))
+        .order_by(StoryModel.id)
+        .limit(limit)
+    )
+    stories = [map_story_model_to_entity(model) for model in await session.scalars(stmt)]
+    # Later reads must load the rows again, not find them in the identity map
+    session.expunge_all()
+    return stories
+
+
+async def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.story_reads')
+    parser.add_argument('--stories', type=int, default=10_000, help='stories to seed')
+    parser.add_argument('--pages', type=int, default=3, help='pages per story')
+    parser.add_argument('--limit', type=int, nargs='+', default=[20, 100, 1000], help='stories per read')
+    args = parser.parse_args(argv)
+
+    engine = create_async_engine(settings.database.dsn())
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            session = AsyncSession(bind=connection, join_transaction_mode='create_savepoint')
+            await seed(session, args.stories, args.pages)
+            repository = SqlAlchemyStoryRepository(session)
+
+            for limit in args.limit:
+                number = max(1, 1000 // limit)
+                criteria = StoryCriteria(limit=limit, include_pages=True)
+                await time_async(f'orm, {limit} stories', lambda: read_with_orm(session, limit), number=number)
+                await time_async(f'core, {limit} stories', lambda: repository.get_list(criteria), number=number)
+
+            await session.close()
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
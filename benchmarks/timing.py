@@ -0,0 +1,34 @@
+"""Shared timing helpers of the benchmark scripts."""
+import time
+import timeit
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+__all__ = ['time_async', 'time_sync']
+
+
+def time_sync(label: str, function: Callable[[], Any], *, repeat: int = 5, number: int = 10) -> float:
+    """Print and return the best time of `function` per call, in milliseconds."""
+    best = min(timeit.repeat(function, repeat=repeat, number=number)) / number * 1000
+    print(f'{label:<40} {best:10.3f} ms')
+    return best
+
+
+async def time_async(
+    label: str,
+    function: Callable[[], Awaitable[Any]],
+    *,
+    repeat: int = 5,
+    number: int = 10,
+) -> float:
+    """`time_sync` for coroutine functions, awaited one call at a time."""
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for _ in range(number):
+            await function()
+        timings.append(time.perf_counter() - started_at)
+    best = min(timings) / number * 1000
+    print(f'{label:<40} {best:10.3f} ms')
+    return best
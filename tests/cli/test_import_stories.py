@@ -0,0 +1,125 @@
+import io
+import logging
+from typing import Any
+
+import orjson
+import pytest
+
+from app.cli.import_stories import ImportFormat, StoryImportError, _read_rows, _validate
+
+
+_STORY: dict[str, Any] = {
+    'id': '7',
+    'type': 'stories',
+    'attributes': {
+        'name': 'Summer sale',
+        'story-type': 'promo',
+        'is-disabled': False,
+        'is-blocking': False,
+        'is-preview': False,
+        'is-repetitive': False,
+        'is-autoscroll': False,
+    },
+    'relationships': {'pages': {'data': [{'id': '70', 'type': 'pages'}, {'id': '71', 'type': 'pages'}]}},
+}
+
+_CSV_HEADER = 'id,name,story_type,is_disabled,is_blocking,is_preview,is_repetitive,is_autoscroll,pages\n'
+
+
+def _rows(content: str, format_: ImportFormat) -> list[tuple[int, Any]]:
+    return list(_read_rows(io.StringIO(content, newline=''), format_))
+
+
+def _ndjson(*lines: str) -> str:
+    return ''.join(f'{line}\n' for line in lines)
+
+
+def test_exported_ndjson_line_is_parsed() -> None:
+    [row] = _validate(_rows(_ndjson(orjson.dumps(_STORY).decode()), 'ndjson'), skip_invalid=False)
+
+    assert row.id == 7
+    assert row.attributes.name == 'Summer sale'
+    # Exports leave out null attributes
+    assert row.attributes.delay is None
+    assert row.page_ids == [70, 71]
+
+
+@pytest.mark.parametrize(
+    'line',
+    [
+        '{"id": "7", "type": "stories"',
+        '[1, 2]',
+        '"story"',
+        orjson.dumps({**_STORY, 'attributes': {**_STORY['attributes'], 'is-preview': 'maybe'}}).decode(),
+        orjson.dumps({**_STORY, 'attributes': {**_STORY['attributes'], 'name': None}}).decode(),
+        orjson.dumps({**_STORY, 'id': 'seven'}).decode(),
+    ],
+    ids=['truncated', 'array', 'string', 'invalid-bool', 'null-name', 'non-numeric-id'],
+)
+def test_malformed_ndjson_line_fails_with_its_line_number(line: str) -> None:
+    valid = orjson.dumps(_STORY).decode()
+    rows = _rows(_ndjson(valid, '', line), 'ndjson')
+
+    with pytest.raises(StoryImportError, match=r'^line 3: '):
+        _validate(rows, skip_invalid=False)
+
+
+def test_malformed_ndjson_lines_are_skipped_when_asked(caplog: pytest.LogCaptureFixture) -> None:
+    valid = orjson.dumps(_STORY).decode()
+    rows = _rows(_ndjson('not json', valid, '{}'), 'ndjson')
+
+    with caplog.at_level(logging.WARNING):
+        parsed = _validate(rows, skip_invalid=True)
+
+    assert [row.id for row in parsed] == [7]
+    assert [record.getMessage().split(':')[0] for record in caplog.records] == [
+        'Skipping invalid line 1',
+        'Skipping invalid line 3',
+    ]
+
+
+def test_csv_row_is_parsed() -> None:
+    content = _CSV_HEADER + '7,Summer sale,promo,false,false,false,false,false,70 71\n'
+
+    [row] = _validate(_rows(content, 'csv'), skip_invalid=False)
+
+    assert row.id == 7
+    assert row.attributes.story_type == 'promo'
+    assert row.page_ids == [70, 71]
+
+
+@pytest.mark.parametrize('column', ['delay', 'publication-start-time'])
+def test_csv_nullable_columns_are_kept_in_either_case(column: str) -> None:
+    value = '15' if column == 'delay' else '2024-06-01T00:00:00+00:00'
+    content = f'name,story_type,is_disabled,is_blocking,is_preview,is_repetitive,is_autoscroll,{column}\n'
+    content += f'Summer sale,promo,false,false,false,false,false,{value}\n'
+
+    [row] = _validate(_rows(content, 'csv'), skip_invalid=False)
+
+    assert row.id is None
+    assert getattr(row.attributes, column.replace('-', '_')) is not None
+
+
+@pytest.mark.parametrize(
+    'line',
+    [
+        '8,Winter sale,promo,false,false,false,false,false,80 eighty',
+        '8,Winter sale,promo,sometimes,false,false,false,false,',
+        '8,,promo,false,false,false,false,false,',
+        '8,Winter sale,promo',
+        'eight,Winter sale,promo,false,false,false,false,false,',
+    ],
+    ids=['non-numeric-page', 'invalid-bool', 'empty-name', 'short-row', 'non-numeric-id'],
+)
+def test_malformed_csv_row_fails_with_its_line_number(line: str) -> None:
+    content = _CSV_HEADER + '7,Summer sale,promo,false,false,false,false,false,\n' + line + '\n'
+
+    with pytest.raises(StoryImportError, match=r'^line 3: '):
+        _validate(_rows(content, 'csv'), skip_invalid=False)
+
+
+def test_csv_line_numbers_count_quoted_line_breaks() -> None:
+    content = _CSV_HEADER + '7,"Summer\nsale",promo,false,false,false,false,false,\n8,,promo,false,false,false,false,false,\n'
+
+    with pytest.raises(StoryImportError, match=r'^line 4: '):
+        _validate(_rows(content, 'csv'), skip_invalid=False)
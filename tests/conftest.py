@@ -0,0 +1,92 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+
+import anyio
+import pytest
+from aioinject import Container
+from aioinject.providers import Object
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app
+from app.config import settings
+from app.di.container import create_container
+from app.modules.story.application.cache import IStoryCache
+from app.modules.story.domain.repositories import IStoryRepository, ReadOnlyStoryRepository
+from app.rest_api import create_app
+from tests.fakes import FakeStoryCache, FakeStoryRepository, make_story
+
+
+@pytest.fixture(scope='session')
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+@pytest.fixture(scope='session')
+async def database_engine() -> AsyncIterator[AsyncEngine]:
+    """Engine of the `DB_*` database migrated to head.
+
+    Tests using it are skipped when Postgres is not reachable.
+    """
+    engine = create_async_engine(settings.database.dsn(), poolclass=NullPool)
+    try:
+        async with asyncio.timeout(5), engine.connect():
+            pass
+    except (OSError, TimeoutError, SQLAlchemyError) as e:
+        await engine.dispose()
+        pytest.skip(f'Postgres is not reachable: {e}')
+
+    config = Config()
+    config.set_main_option('script_location', str(Path(app.__file__).parent / 'alembic'))
+    # env.py runs its own event loop
+    await anyio.to_thread.run_sync(command.upgrade, config, 'head')
+
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_connection(database_engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    """Connection in a transaction that is rolled back after the test."""
+    async with database_engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            yield connection
+        finally:
+            await transaction.rollback()
+
+
+@pytest.fixture
+def story_repository() -> FakeStoryRepository:
+    return FakeStoryRepository([make_story(id_) for id_ in range(1, 6)])
+
+
+@pytest.fixture
+def story_cache() -> FakeStoryCache:
+    return FakeStoryCache()
+
+
+@pytest.fixture
+def container(story_repository: FakeStoryRepository, story_cache: FakeStoryCache) -> Iterator[Container]:
+    """The app container, with stories and their cache in memory."""
+    container = create_container()
+    with (
+        container.override(Object(story_repository, IStoryRepository)),
+        container.override(Object(story_repository, ReadOnlyStoryRepository)),
+        container.override(Object(story_cache, IStoryCache)),
+    ):
+        yield container
+
+
+@pytest.fixture
+def client(container: Container) -> TestClient:
+    """Client of the app on `container`.
+
+    The lifespan is not run, so nothing connects to Postgres or Redis.
+    """
+    return TestClient(create_app())
@@ -0,0 +1,246 @@
+"""In-memory stand-ins for the services the app talks to."""
+import copy
+import dataclasses
+import datetime as dt
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, Final, Self
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.modules.story.application.cache import IStoryCache
+from app.modules.story.application.dto import StoryOutDTO
+from app.modules.story.domain.criteria import StoryCriteria
+from app.modules.story.domain.entities import PageEntity, StoryEntity, StoryVersion
+from app.modules.story.domain.exceptions import StoryPublicationWindowError
+from app.modules.story.domain.repositories import IStoryRepository
+from app.seedwork.domain.exceptions import EntityNotFoundException
+from app.seedwork.utils.dt import get_utc_now
+
+
+__all__ = [
+    'NOW',
+    'FakeRedis',
+    'FakeStoryCache',
+    'FakeStoryRepository',
+    'make_story',
+]
+
+
+NOW: Final = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+
+
+def make_story(id_: int, **fields: Any) -> StoryEntity:
+    """A story with one page, `fields` overriding the defaults."""
+    defaults: dict[str, Any] = {
+        'id': id_,
+        'name': f'Story {id_}',
+        'story_type': 'info',
+        'delay': None,
+        'is_disabled': False,
+        'is_blocking': False,
+        'is_preview': False,
+        'is_repetitive': False,
+        'is_autoscroll': False,
+        'publication_start_time': None,
+        'publication_end_time': None,
+        'created_at': NOW,
+        'modified_at': NOW,
+        'pages': [PageEntity(id=100 + id_, created_at=NOW, modified_at=NOW, story_id=id_)],
+    }
+    return StoryEntity(**(defaults | fields))
+
+
+class FakeRedis:
+    """The subset of `redis.asyncio.Redis` the app uses, expiry ignored.
+
+    Commands named in `failing` raise a `RedisError`.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.published: list[tuple[str, str]] = []
+        self.failing: set[str] = set()
+
+    async def get(self, key: str) -> str | None:
+        self._check('get')
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str | bytes, ex: int | None = None, nx: bool = False) -> bool | None:
+        self._check('set')
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.decode() if isinstance(value, bytes) else value
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        self._check('delete')
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def publish(self, channel: str, message: str) -> int:
+        self._check('publish')
+        self.published.append((channel, message))
+        return 0
+
+    def pipeline(self, transaction: bool = True) -> '_FakePipeline':
+        return _FakePipeline(self)
+
+    def _check(self, command: str) -> None:
+        if command in self.failing:
+            msg = f'{command} failed'
+            raise RedisConnectionError(msg)
+
+
+class _FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._commands: list[Callable[[], Any]] = []
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        self._commands.clear()
+
+    def set(self, key: str, value: str, ex: int | None = None) -> Self:
+        self._commands.append(lambda: self._redis.set(key, value, ex=ex))
+        return self
+
+    async def execute(self) -> list[Any]:
+        return [await command() for command in self._commands]
+
+
+class FakeStoryRepository(IStoryRepository):
+    """Stories kept in a dict, filtered by `story_type`, `is_disabled` and `is_published` only.
+
+    Listings are ordered by id, `relevance` ordering is not supported.
+
+    `atomic` restores the stories as they were when the block raises.
+    """
+
+    def __init__(self, stories: Sequence[StoryEntity] = ()) -> None:
+        self.stories: dict[int, StoryEntity] = {story.id: story for story in stories}
+
+    async def add(self, entity: StoryEntity) -> StoryEntity:
+        entity.id = max(self.stories, default=0) + 1
+        self.stories[entity.id] = entity
+        return entity
+
+    async def add_many(self, entities: Sequence[StoryEntity]) -> list[StoryEntity]:
+        return [await self.add(entity) for entity in entities]
+
+    async def update(self, entity: StoryEntity) -> StoryEntity:
+        await self.get_by_id(entity.id)
+        self.stories[entity.id] = entity
+        return entity
+
+    async def update_many(self, entities: Sequence[StoryEntity]) -> list[StoryEntity]:
+        return [await self.update(entity) for entity in entities if entity.id in self.stories]
+
+    async def update_by_id(self, entity_id: int, values: Mapping[str, Any]) -> StoryEntity:
+        story = dataclasses.replace(await self.get_by_id(entity_id), **values, modified_at=get_utc_now())
+        start, end = story.publication_start_time, story.publication_end_time
+        if start is not None and end is not None and end < start:
+            raise StoryPublicationWindowError({'id': entity_id})
+        self.stories[entity_id] = story
+        return story
+
+    async def remove(self, entity: StoryEntity) -> None:
+        await self.remove_by_id(entity.id)
+
+    async def remove_by_id(self, entity_id: int) -> None:
+        await self.get_by_id(entity_id)
+        del self.stories[entity_id]
+
+    async def remove_many(self, entity_ids: Sequence[int]) -> list[int]:
+        return [id_ for id_ in entity_ids if self.stories.pop(id_, None) is not None]
+
+    async def get_by_id(self, entity_id: int) -> StoryEntity:
+        if (story := self.stories.get(entity_id)) is None:
+            raise EntityNotFoundException(StoryEntity, {'id': entity_id})
+        return story
+
+    async def get_all(self) -> list[StoryEntity]:
+        return list(self.stories.values())
+
+    async def get_list(self, criteria: StoryCriteria) -> list[StoryEntity]:
+        stories = list(self._filter(criteria))[criteria.offset :]
+        if criteria.before is not None:
+            # The stories right before the cursor, in listing order
+            return stories[-criteria.limit :] if criteria.limit is not None else stories
+        return stories[: criteria.limit] if criteria.limit is not None else stories
+
+    async def count(self, criteria: StoryCriteria) -> int:
+        return sum(1 for _ in self._filter(criteria))
+
+    async def get_version(self, entity_id: int) -> StoryVersion:
+        story = await self.get_by_id(entity_id)
+        return StoryVersion(id=story.id, modified_at=story.modified_at or NOW)
+
+    async def get_versions(self, criteria: StoryCriteria) -> list[StoryVersion]:
+        return [await self.get_version(story.id) for story in await self.get_list(criteria)]
+
+    async def get_next_publication_change(self, after: dt.datetime) -> dt.datetime | None:
+        changes = [
+            moment
+            for story in self.stories.values()
+            if not story.is_disabled
+            for moment in (story.publication_start_time, story.publication_end_time)
+            if moment is not None and moment > after
+        ]
+        return min(changes, default=None)
+
+    async def iter_chunks(self, criteria: StoryCriteria, chunk_size: int) -> AsyncIterator[list[StoryEntity]]:
+        stories = await self.get_list(criteria)
+        for start in range(0, len(stories), chunk_size):
+            yield stories[start : start + chunk_size]
+
+    @asynccontextmanager
+    async def atomic(self) -> AsyncIterator[None]:
+        saved = copy.deepcopy(self.stories)
+        try:
+            yield
+        except BaseException:
+            self.stories = saved
+            raise
+
+    def _filter(self, criteria: StoryCriteria) -> Iterator[StoryEntity]:
+        for story in sorted(self.stories.values(), key=lambda story: story.id, reverse=criteria.descending):
+            if criteria.after is not None and not _follows(story.id, criteria.after.id, criteria):
+                continue
+            if criteria.before is not None and not _follows(criteria.before.id, story.id, criteria):
+                continue
+            if criteria.story_type is not None and story.story_type != criteria.story_type:
+                continue
+            if criteria.is_disabled is not None and story.is_disabled != criteria.is_disabled:
+                continue
+            if criteria.is_published is not None and _is_published(story) != criteria.is_published:
+                continue
+            yield story
+
+
+def _follows(id_: int, cursor_id: int, criteria: StoryCriteria) -> bool:
+    return id_ < cursor_id if criteria.descending else id_ > cursor_id
+
+
+def _is_published(story: StoryEntity) -> bool:
+    now = get_utc_now()
+    start, end = story.publication_start_time, story.publication_end_time
+    return not story.is_disabled and (start is None or start <= now) and (end is None or now < end)
+
+
+class FakeStoryCache(IStoryCache):
+    """Caches nothing, records the ids of the stories set and invalidated."""
+
+    def __init__(self) -> None:
+        self.cached: list[int] = []
+        self.invalidated: list[int] = []
+
+    async def get(self, id_: int) -> StoryOutDTO | None:
+        return None
+
+    async def set(self, story: StoryOutDTO) -> None:
+        self.cached.append(story.id)
+
+    def invalidate_on_commit(self, *ids: int) -> None:
+        self.invalidated.extend(ids)
@@ -0,0 +1,77 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.infrastructure.db.pool import InstrumentedPool
+
+
+pytestmark = pytest.mark.anyio
+
+# SQLite stands in for Postgres, the pool is the same
+pytest.importorskip('aiosqlite')
+
+
+@pytest.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    """Engine with a single connection."""
+    engine = create_async_engine(
+        'sqlite+aiosqlite://',
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    yield engine
+    await engine.dispose()
+
+
+def _pool(engine: AsyncEngine) -> InstrumentedPool:
+    pool = engine.pool
+    assert isinstance(pool, InstrumentedPool)
+    return pool
+
+
+async def test_checkout_wait_leaves_out_opening_connections(
+    engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    create_connection = InstrumentedPool._create_connection
+
+    def slow_create_connection(pool: InstrumentedPool) -> object:
+        # Runs in the checkout greenlet, blocking it like a slow connect
+        time.sleep(0.05)
+        return create_connection(pool)
+
+    monkeypatch.setattr(InstrumentedPool, '_create_connection', slow_create_connection)
+
+    async with engine.connect():
+        pass
+
+    wait_ms = _pool(engine).stats.checkout_wait_ms
+    assert wait_ms.count == 1
+    assert wait_ms.total < 50
+
+
+async def test_checkout_wait_records_time_queued_for_a_connection(engine: AsyncEngine) -> None:
+    async with engine.connect():
+        waiting = asyncio.create_task(engine.connect().start())
+        await asyncio.sleep(0.05)
+    await (await waiting).close()
+
+    wait_ms = _pool(engine).stats.checkout_wait_ms
+    assert wait_ms.count == 2
+    assert wait_ms.total >= 40
+
+
+async def test_checkout_timeout_is_counted(engine: AsyncEngine) -> None:
+    async with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            await engine.connect().start()
+
+    stats = _pool(engine).stats
+    assert stats.timeouts == 1
+    assert stats.checkout_wait_ms.count == 2
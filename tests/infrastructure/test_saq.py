@@ -0,0 +1,131 @@
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+import saq
+from aioinject import Container
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, StatusCode
+
+from app.config import settings
+from app.infrastructure import saq as saq_module
+from app.infrastructure.saq import SaqQueue, TaskContext, end_job_span, saq_queue, start_job_span
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def queue(monkeypatch: pytest.MonkeyPatch) -> tuple[SaqQueue, list[saq.Job]]:
+    """Queue that keeps enqueued jobs in a list instead of Redis."""
+    queue = SaqQueue.from_url('redis://localhost:6379/1')
+    enqueued: list[saq.Job] = []
+
+    async def enqueue(job: saq.Job) -> saq.Job:
+        enqueued.append(job)
+        return job
+
+    monkeypatch.setattr(queue, '_enqueue', enqueue)
+    return queue, enqueued
+
+
+@pytest.fixture
+def spans(monkeypatch: pytest.MonkeyPatch) -> Iterator[Any]:
+    """Exporter of the spans of the queue and job hooks, with tracing enabled."""
+    sdk_trace = pytest.importorskip('opentelemetry.sdk.trace')
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(settings.tracing, 'ENABLED', True)
+    monkeypatch.setattr(saq_module, 'tracer', provider.get_tracer('tests'))
+    yield exporter
+    provider.shutdown()
+
+
+def test_queue_keeps_the_redis_queue_name_and_namespace() -> None:
+    assert isinstance(saq_queue, SaqQueue)
+    assert saq_queue.name == 'default'
+    assert saq_queue.namespace('incomplete') == 'saq:default:incomplete'
+
+
+async def test_untraced_enqueue_leaves_meta_alone(queue: tuple[SaqQueue, list[saq.Job]]) -> None:
+    queue_, enqueued = queue
+
+    await queue_.enqueue('upload_story_task', code=1)
+
+    [job] = enqueued
+    assert job.meta == {}
+    assert job.kwargs == {'code': 1}
+
+
+async def test_enqueue_carries_the_trace_context_in_meta(
+    queue: tuple[SaqQueue, list[saq.Job]],
+    spans: Any,
+) -> None:
+    queue_, enqueued = queue
+
+    await queue_.enqueue('upload_story_task', code=1, meta={'source': 'tests'})
+    await queue_.enqueue(saq.Job('upload_story_task', kwargs={'code': 2}))
+
+    producers = spans.get_finished_spans()
+    assert [span.name for span in producers] == ['enqueue upload_story_task'] * 2
+    assert all(span.kind == SpanKind.PRODUCER for span in producers)
+    for job, producer in zip(enqueued, producers, strict=True):
+        context = producer.get_span_context()
+        traceparent = f'00-{context.trace_id:032x}-{context.span_id:016x}-{context.trace_flags:02x}'
+        assert job.meta['trace_context'] == {'traceparent': traceparent}
+    # Arguments of the task function are left as they are
+    assert [job.kwargs for job in enqueued] == [{'code': 1}, {'code': 2}]
+    assert enqueued[0].meta['source'] == 'tests'
+
+
+async def test_job_span_continues_the_enqueuing_trace(
+    queue: tuple[SaqQueue, list[saq.Job]],
+    spans: Any,
+) -> None:
+    queue_, enqueued = queue
+    await queue_.enqueue('upload_story_task', code=1)
+    [job] = enqueued
+    ctx: TaskContext = {'container': Container(), 'job': job}
+
+    await start_job_span(ctx)
+    current = trace.get_current_span()
+    await end_job_span(ctx)
+
+    producer, consumer = spans.get_finished_spans()
+    assert current.get_span_context() == consumer.get_span_context()
+    assert consumer.name == 'process upload_story_task'
+    assert consumer.kind == SpanKind.CONSUMER
+    assert consumer.parent is not None
+    assert consumer.parent.span_id == producer.get_span_context().span_id
+    assert consumer.context.trace_id == producer.context.trace_id
+    assert consumer.attributes['messaging.message.id'] == job.key
+    # The hook context is detached again
+    assert not trace.get_current_span().get_span_context().is_valid
+    assert 'trace_span' not in ctx
+
+
+async def test_failed_job_span_records_the_exception(spans: Any) -> None:
+    job = saq.Job('upload_story_task')
+    ctx: TaskContext = {'container': Container(), 'job': job}
+
+    await start_job_span(ctx)
+    ctx['exception'] = ValueError('story 1 not found')
+    await end_job_span(ctx)
+
+    [consumer] = spans.get_finished_spans()
+    # No trace context in meta, the job starts a new trace
+    assert consumer.parent is None
+    assert consumer.status.status_code == StatusCode.ERROR
+    assert [event.name for event in consumer.events] == ['exception']
+
+
+async def test_end_job_span_without_a_span_does_nothing() -> None:
+    ctx: TaskContext = {'container': Container(), 'job': saq.Job('upload_story_task')}
+
+    await end_job_span(ctx)
+
+    assert 'trace_span' not in ctx
@@ -0,0 +1,28 @@
+import pytest
+from aioinject import Container
+
+from app.modules.story.application.cache import ReadOnlyStoryCache
+from app.modules.story.application.services import ReadOnlyStoryService, StoryService
+from tests.fakes import FakeStoryCache
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_read_only_cache_is_never_filled(story_cache: FakeStoryCache) -> None:
+    cache = ReadOnlyStoryCache(story_cache)
+
+    await cache.get(1)
+    cache.invalidate_on_commit(1, 2)
+
+    assert story_cache.cached == []
+    assert story_cache.invalidated == [1, 2]
+
+
+async def test_only_primary_reads_fill_the_story_cache(container: Container, story_cache: FakeStoryCache) -> None:
+    async with container.context() as ctx:
+        await (await ctx.resolve(ReadOnlyStoryService)).get_story(1)
+        assert story_cache.cached == []
+
+        await (await ctx.resolve(StoryService)).get_story(2)
+        assert story_cache.cached == [2]
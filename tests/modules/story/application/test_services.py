@@ -0,0 +1,86 @@
+import pytest
+
+from app.modules.story.application.services import _paginate, _with_lookahead
+from app.modules.story.domain.criteria import StoryCriteria, StoryCursor
+from app.modules.story.domain.entities import StoryEntity
+from tests.fakes import FakeStoryRepository, make_story
+
+
+@pytest.fixture
+def repository() -> FakeStoryRepository:
+    return FakeStoryRepository([make_story(id_) for id_ in range(1, 8)])
+
+
+async def _page(
+    repository: FakeStoryRepository,
+    criteria: StoryCriteria,
+) -> tuple[list[int], StoryCursor | None, StoryCursor | None]:
+    stories, next_cursor, prev_cursor = _paginate(
+        await repository.get_list(_with_lookahead(criteria)),
+        criteria,
+    )
+    return [story.id for story in stories], next_cursor, prev_cursor
+
+
+@pytest.mark.anyio
+async def test_pages_forwards_until_the_lookahead_row_runs_out(repository: FakeStoryRepository) -> None:
+    assert await _page(repository, StoryCriteria(limit=3)) == (
+        [1, 2, 3],
+        StoryCursor(key=3, id=3),
+        None,
+    )
+    assert await _page(repository, StoryCriteria(limit=3, after=StoryCursor(key=3, id=3))) == (
+        [4, 5, 6],
+        StoryCursor(key=6, id=6),
+        StoryCursor(key=4, id=4),
+    )
+    # Only the page itself is left, no lookahead row: the last page
+    assert await _page(repository, StoryCriteria(limit=1, after=StoryCursor(key=6, id=6))) == (
+        [7],
+        None,
+        StoryCursor(key=7, id=7),
+    )
+
+
+@pytest.mark.anyio
+async def test_pages_backwards_drop_the_lookahead_row_in_front(repository: FakeStoryRepository) -> None:
+    assert await _page(repository, StoryCriteria(limit=3, before=StoryCursor(key=7, id=7))) == (
+        [4, 5, 6],
+        StoryCursor(key=6, id=6),
+        StoryCursor(key=4, id=4),
+    )
+    # Back at the start, nothing before the first story
+    assert await _page(repository, StoryCriteria(limit=3, before=StoryCursor(key=4, id=4))) == (
+        [1, 2, 3],
+        StoryCursor(key=3, id=3),
+        None,
+    )
+
+
+@pytest.mark.anyio
+async def test_descending_pages_follow_the_ordering(repository: FakeStoryRepository) -> None:
+    criteria = StoryCriteria(ordering='-id', limit=3, after=StoryCursor(key=5, id=5))
+
+    assert await _page(repository, criteria) == (
+        [4, 3, 2],
+        StoryCursor(key=2, id=2),
+        StoryCursor(key=4, id=4),
+    )
+
+
+def test_page_of_exactly_limit_stories_has_no_next_cursor() -> None:
+    stories = [make_story(id_) for id_ in range(1, 4)]
+
+    assert _paginate(stories, StoryCriteria(limit=3)) == (stories, None, None)
+
+
+def test_relevance_pages_have_no_cursors() -> None:
+    stories: list[StoryEntity] = [make_story(id_) for id_ in (3, 1, 2)]
+
+    criteria = StoryCriteria(search='story', ordering='relevance', limit=2)
+
+    page, next_cursor, prev_cursor = _paginate(stories, criteria)
+
+    # Ties of the relevance rank are broken by id in SQL, see the repository tests
+    assert [story.id for story in page] == [3, 1]
+    assert (next_cursor, prev_cursor) == (None, None)
@@ -0,0 +1,94 @@
+from collections.abc import Iterator
+from typing import cast
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import StorySettings
+from app.infrastructure.redis import RedisClient
+from app.modules.story.application.dto import StoryOutDTO
+from app.modules.story.infrastructure.cache import StoryCache, local_story_cache
+from tests.fakes import FakeRedis, make_story
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def _clear_local_cache() -> Iterator[None]:
+    local_story_cache.clear()
+    yield
+    local_story_cache.clear()
+
+
+@pytest.fixture
+def redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture
+def cache(redis: FakeRedis) -> StoryCache:
+    return StoryCache(cast(RedisClient, redis), Mock(spec=AsyncSession), StorySettings())
+
+
+def _story(id_: int, name: str = 'Story') -> StoryOutDTO:
+    return StoryOutDTO.from_entity(make_story(id_, name=name))
+
+
+async def test_set_story_is_read_back_from_redis(cache: StoryCache) -> None:
+    await cache.set(_story(1))
+    local_story_cache.clear()
+
+    story = await cache.get(1)
+
+    assert story is not None
+    assert story.id == 1
+
+
+async def test_invalidated_story_reads_as_miss(cache: StoryCache) -> None:
+    await cache.set(_story(1))
+
+    await cache.invalidate(1)
+
+    assert await cache.get(1) is None
+
+
+async def test_stale_read_is_not_cached_over_invalidation(cache: StoryCache) -> None:
+    # Read before the write committed, cached after its invalidation
+    stale = _story(1, name='Before')
+    await cache.invalidate(1)
+
+    await cache.set(stale)
+
+    assert await cache.get(1) is None
+    assert local_story_cache.get(1) is None
+
+
+async def test_fresh_story_is_cached_once_tombstone_expired(cache: StoryCache, redis: FakeRedis) -> None:
+    await cache.invalidate(1)
+    del redis.data[cache._key(1)]
+
+    await cache.set(_story(1, name='After'))
+
+    story = await cache.get(1)
+    assert story is not None
+    assert story.name == 'After'
+
+
+async def test_invalidation_is_published_when_tombstone_fails(cache: StoryCache, redis: FakeRedis) -> None:
+    redis.failing.add('set')
+
+    await cache.invalidate_many((1, 2))
+
+    assert [message for _, message in redis.published] == ['1,2']
+
+
+async def test_failed_publish_keeps_tombstones(cache: StoryCache, redis: FakeRedis) -> None:
+    redis.failing.add('publish')
+
+    await cache.invalidate(1)
+
+    assert redis.published == []
+    assert await cache.get(1) is None
+    assert cache._key(1) in redis.data
@@ -0,0 +1,150 @@
+"""Plans of the story reads on a seeded database, Postgres only.
+
+Sequential scans are disabled for the planner, so one still showing up
+means no index can serve the query at all.
+"""
+import json
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import pytest
+from sqlalchemy import Executable, Select, bindparam, delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.modules.story.domain.criteria import StoryCriteria, StoryCursor
+from app.modules.story.infrastructure.models import PageModel, StoryModel
+from app.modules.story.infrastructure.repositories import (
+    _SELECT_PAGE_IDS,
+    _SELECT_PAGES,
+    SqlAlchemyStoryRepository,
+    _select_stories,
+)
+from app.seedwork.utils.types import DictStrAny
+
+
+pytestmark = pytest.mark.anyio
+
+_STORIES = 20_000
+_PAGES_PER_STORY = 3
+
+
+@pytest.fixture
+async def seeded(db_connection: AsyncConnection) -> AsyncIterator[AsyncConnection]:
+    await db_connection.execute(
+        text(
+            'INSERT INTO story (name, story_type, is_disabled, publication_start_time, '
+            'publication_end_time, created_at, modified_at) '
+            "SELECT 'Story ' || n || CASE WHEN n % 100 = 0 THEN ' summer sale' ELSE '' END, "
+            "(ARRAY['install', 'update', 'info'])[n % 3 + 1], n % 10 = 0, "
+            "CASE WHEN n % 4 = 0 THEN now() - interval '1 day' END, "
+            "CASE WHEN n % 8 = 0 THEN now() + interval '1 day' END, now(), now() "
+            'FROM generate_series(1, :stories) AS n',
+        ),
+        {'stories': _STORIES},
+    )
+    await db_connection.execute(
+        text(
+            'INSERT INTO page (story_id, created_at, modified_at) '
+            'SELECT story.id, now(), now() FROM story, generate_series(1, :pages)',
+        ),
+        {'pages': _PAGES_PER_STORY},
+    )
+    await db_connection.execute(text('ANALYZE story, page'))
+    await db_connection.execute(text('SET LOCAL enable_seqscan = off'))
+    yield db_connection
+
+
+async def _explain(connection: AsyncConnection, stmt: Executable, params: DictStrAny | None = None) -> Any:
+    compiled = stmt.compile(dialect=connection.dialect)
+    values = {**compiled.params, **(params or {})}
+    raw = await connection.get_raw_connection()
+    # asyncpg directly, EXPLAIN takes the bound parameters of the statement
+    return await raw.driver_connection.fetchval(
+        f'EXPLAIN (FORMAT JSON) {compiled}',
+        *(values[name] for name in compiled.positiontup or ()),
+    )
+
+
+def _scans(plan: DictStrAny) -> Iterator[tuple[str, str | None]]:
+    yield plan['Node Type'], plan.get('Relation Name')
+    for child in plan.get('Plans', ()):
+        yield from _scans(child)
+
+
+def _seq_scans(explained: Any) -> list[str | None]:
+    # asyncpg returns json values as text
+    [root] = json.loads(explained)
+    return [relation for node, relation in _scans(root['Plan']) if node == 'Seq Scan']
+
+
+def _list_statement(criteria: StoryCriteria) -> Select[Any]:
+    stmt = SqlAlchemyStoryRepository._apply_filters(_select_stories(criteria.fields), criteria)
+    return SqlAlchemyStoryRepository._apply_pagination(stmt, criteria)
+
+
+@pytest.mark.parametrize(
+    'criteria',
+    [
+        StoryCriteria(limit=20),
+        StoryCriteria(limit=20, offset=1000),
+        StoryCriteria(ordering='-id', limit=20, after=StoryCursor(key=5000, id=5000)),
+        StoryCriteria(limit=20, before=StoryCursor(key=5000, id=5000)),
+        StoryCriteria(story_type='promo', limit=20),
+        StoryCriteria(story_type='update', limit=20, after=StoryCursor(key=100, id=100)),
+        StoryCriteria(is_disabled=False, limit=20),
+        StoryCriteria(is_published=True, limit=20),
+        StoryCriteria(is_published=True),
+        StoryCriteria(search='summer', limit=20),
+        StoryCriteria(search='summer', ordering='relevance', limit=20),
+        StoryCriteria(fields=frozenset({'name'}), limit=20),
+    ],
+    ids=[
+        'first-page',
+        'offset',
+        'keyset-descending',
+        'keyset-before',
+        'filter-type-missing',
+        'filter-type',
+        'filter-enabled',
+        'filter-published',
+        'filter-published-all',
+        'search',
+        'search-relevance',
+        'sparse-fieldset',
+    ],
+)
+async def test_story_list_uses_indexes(seeded: AsyncConnection, criteria: StoryCriteria) -> None:
+    assert _seq_scans(await _explain(seeded, _list_statement(criteria))) == []
+
+
+@pytest.mark.parametrize('stmt', [_SELECT_PAGES, _SELECT_PAGE_IDS], ids=['pages', 'page-ids'])
+async def test_pages_of_listed_stories_use_indexes(seeded: AsyncConnection, stmt: Select[Any]) -> None:
+    explained = await _explain(seeded, stmt, {'story_ids': list(range(100, 120))})
+
+    assert _seq_scans(explained) == []
+
+
+@pytest.mark.parametrize(
+    'criteria',
+    [
+        StoryCriteria(story_type='update'),
+        StoryCriteria(is_disabled=False),
+        StoryCriteria(is_published=True),
+        StoryCriteria(search='summer'),
+    ],
+    ids=['filter-type', 'filter-enabled', 'filter-published', 'search'],
+)
+async def test_story_count_uses_indexes(seeded: AsyncConnection, criteria: StoryCriteria) -> None:
+    stmt = SqlAlchemyStoryRepository._apply_filters(
+        select(func.count()).select_from(StoryModel.__table__),
+        criteria,
+    )
+
+    assert _seq_scans(await _explain(seeded, stmt)) == []
+
+
+async def test_page_cascade_of_story_removal_uses_index(seeded: AsyncConnection) -> None:
+    # The statement the ON DELETE CASCADE trigger runs for every deleted story
+    stmt = delete(PageModel.__table__).where(PageModel.story_id == bindparam('story_id'))
+
+    assert _seq_scans(await _explain(seeded, stmt, {'story_id': 100})) == []
@@ -0,0 +1,225 @@
+import datetime as dt
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from sqlalchemy import Executable, Select, event, func, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.modules.story.domain.criteria import StoryCriteria
+from app.modules.story.domain.exceptions import StoryPublicationWindowError
+from app.modules.story.infrastructure.models import PageModel, StoryModel
+from app.modules.story.infrastructure.repositories import _SELECT_PAGES, SqlAlchemyStoryRepository
+from app.seedwork.domain.exceptions import EntityNotFoundException
+from app.seedwork.utils.types import DictStrAny
+from tests.fakes import NOW, make_story
+
+
+def _compile(stmt: Select[Any]) -> str:
+    return str(stmt.compile(dialect=postgresql.asyncpg.dialect(), compile_kwargs={'literal_binds': True}))
+
+
+def _filtered(criteria: StoryCriteria) -> str:
+    stmt = select(StoryModel.__table__.c.id)
+    stmt = SqlAlchemyStoryRepository._apply_filters(stmt, criteria)
+    return _compile(SqlAlchemyStoryRepository._apply_pagination(stmt, criteria))
+
+
+def test_search_uses_trigram_operators() -> None:
+    sql = _filtered(StoryCriteria(search='summer'))
+
+    # Both are served by the `gin_trgm_ops` index on story.name
+    assert "story.name ILIKE '%summer%' ESCAPE '/'" in sql
+    assert "story.name % 'summer'" in sql
+
+
+def test_search_escapes_like_wildcards() -> None:
+    sql = _filtered(StoryCriteria(search='50%_off'))
+
+    assert "ILIKE '%50/%/_off%' ESCAPE '/'" in sql
+
+
+def test_relevance_ordering_ranks_by_similarity() -> None:
+    sql = _filtered(StoryCriteria(search='summer', ordering='relevance'))
+
+    assert "ORDER BY similarity(story.name, 'summer') DESC, story.id" in sql
+
+
+def test_no_search_leaves_name_unfiltered() -> None:
+    assert 'story.name' not in _filtered(StoryCriteria())
+
+
+@pytest.mark.parametrize(
+    ('criteria', 'clause'),
+    [
+        (StoryCriteria(story_type='promo'), "story.story_type = 'promo'"),
+        (StoryCriteria(is_disabled=True), 'WHERE story.is_disabled ORDER BY'),
+        (StoryCriteria(is_disabled=False), 'WHERE NOT story.is_disabled'),
+        (StoryCriteria(is_published=True), 'WHERE NOT story.is_disabled AND'),
+        (StoryCriteria(is_published=False), 'WHERE NOT (NOT story.is_disabled AND'),
+    ],
+    ids=['story-type', 'disabled', 'enabled', 'published', 'unpublished'],
+)
+def test_filters_are_applied_in_sql(criteria: StoryCriteria, clause: str) -> None:
+    assert clause in _filtered(criteria)
+
+
+def test_filters_are_combined() -> None:
+    sql = _filtered(StoryCriteria(story_type='promo', is_disabled=False))
+
+    assert "WHERE story.story_type = 'promo' AND NOT story.is_disabled" in sql
+
+
+class _Rows(list[Any]):
+    def all(self) -> list[Any]:
+        return self
+
+
+class _Row(dict[str, Any]):
+    """Row stand-in, read through attributes and `_mapping`."""
+
+    def __getattr__(self, name: str) -> Any:
+        if name == '_mapping':
+            return self
+        return self[name]
+
+
+@pytest.mark.anyio
+async def test_pages_of_listed_stories_are_loaded_in_one_query(monkeypatch: pytest.MonkeyPatch) -> None:
+    story_rows = [_Row(id=id_, modified_at=NOW) for id_ in (1, 2, 3)]
+    page_rows = [_Row(id=100 + id_, story_id=id_, created_at=NOW, modified_at=NOW) for id_ in (1, 1, 3)]
+    executed: list[tuple[Executable, DictStrAny | None]] = []
+
+    async def execute(stmt: Executable, params: DictStrAny | None = None) -> _Rows:
+        executed.append((stmt, params))
+        return _Rows(story_rows if len(executed) == 1 else page_rows)
+
+    repository = SqlAlchemyStoryRepository(AsyncSession())
+    monkeypatch.setattr(repository, '_execute', execute)
+
+    stories = await repository.get_list(StoryCriteria(include_pages=True))
+
+    assert len(executed) == 2
+    assert executed[1] == (_SELECT_PAGES, {'story_ids': [1, 2, 3]})
+    assert [len(story.pages or ()) for story in stories] == [2, 0, 1]
+
+
+@pytest.fixture
+async def repository(db_connection: AsyncConnection) -> AsyncIterator[SqlAlchemyStoryRepository]:
+    session = AsyncSession(bind=db_connection, join_transaction_mode='create_savepoint')
+    yield SqlAlchemyStoryRepository(session)
+    await session.close()
+
+
+async def _add_story(repository: SqlAlchemyStoryRepository, **fields: Any) -> int:
+    story = await repository.add(make_story(0, created_at=None, modified_at=None, pages=[], **fields))
+    return story.id
+
+
+@pytest.mark.anyio
+async def test_update_of_single_bound_is_checked_against_stored_one(repository: SqlAlchemyStoryRepository) -> None:
+    story_id = await _add_story(repository, publication_start_time=NOW)
+
+    with pytest.raises(StoryPublicationWindowError):
+        await repository.update_by_id(story_id, {'publication_end_time': NOW - dt.timedelta(days=1)})
+
+    story = await repository.get_by_id(story_id)
+    assert story.publication_end_time is None
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    'values',
+    [
+        {'publication_end_time': NOW + dt.timedelta(days=1)},
+        {'publication_end_time': NOW},
+        {'publication_start_time': None},
+        {'publication_start_time': NOW - dt.timedelta(days=1)},
+    ],
+    ids=['later-end', 'same-end', 'open-start', 'earlier-start'],
+)
+async def test_update_of_single_bound_keeping_window_valid(
+    repository: SqlAlchemyStoryRepository,
+    values: DictStrAny,
+) -> None:
+    story_id = await _add_story(repository, publication_start_time=NOW)
+
+    story = await repository.update_by_id(story_id, values)
+
+    for name, value in values.items():
+        assert getattr(story, name) == value
+
+
+@pytest.mark.anyio
+async def test_update_of_missing_story_is_not_found(repository: SqlAlchemyStoryRepository) -> None:
+    with pytest.raises(EntityNotFoundException):
+        await repository.update_by_id(2**31 - 1, {'publication_end_time': NOW})
+
+
+@pytest.mark.anyio
+async def test_listed_pages_are_read_in_one_statement(
+    repository: SqlAlchemyStoryRepository,
+    db_connection: AsyncConnection,
+) -> None:
+    story_ids = [await _add_story(repository) for _ in range(3)]
+    await db_connection.execute(insert(PageModel.__table__), [{'story_id': id_} for id_ in story_ids * 2])
+    statements: list[str] = []
+
+    def record(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(db_connection.sync_connection, 'before_cursor_execute', record)
+    try:
+        stories = await repository.get_list(StoryCriteria(include_pages=True, limit=3, ordering='-id'))
+    finally:
+        event.remove(db_connection.sync_connection, 'before_cursor_execute', record)
+
+    assert [story.id for story in stories] == story_ids[::-1]
+    assert all(len(story.pages or ()) == 2 for story in stories)
+    assert sum('FROM page' in statement for statement in statements) == 1
+
+
+async def _add_pages(connection: AsyncConnection, story_id: int, count: int = 2) -> None:
+    await connection.execute(insert(PageModel.__table__), [{'story_id': story_id}] * count)
+
+
+async def _page_count(connection: AsyncConnection, story_id: int) -> int:
+    stmt = select(func.count()).select_from(PageModel.__table__).where(PageModel.story_id == story_id)
+    return (await connection.execute(stmt)).scalar_one()
+
+
+@pytest.mark.anyio
+async def test_removed_story_takes_its_pages_along(
+    repository: SqlAlchemyStoryRepository,
+    db_connection: AsyncConnection,
+) -> None:
+    removed_id, kept_id = await _add_story(repository), await _add_story(repository)
+    await _add_pages(db_connection, removed_id)
+    await _add_pages(db_connection, kept_id)
+
+    await repository.remove_by_id(removed_id)
+
+    with pytest.raises(EntityNotFoundException):
+        await repository.get_by_id(removed_id)
+    assert await _page_count(db_connection, removed_id) == 0
+    assert await _page_count(db_connection, kept_id) == 2
+
+
+@pytest.mark.anyio
+async def test_removed_stories_take_their_pages_along(
+    repository: SqlAlchemyStoryRepository,
+    db_connection: AsyncConnection,
+) -> None:
+    story_ids = [await _add_story(repository) for _ in range(2)]
+    for story_id in story_ids:
+        await _add_pages(db_connection, story_id)
+
+    assert sorted(await repository.remove_many([*story_ids, 2**31 - 1])) == story_ids
+    assert [await _page_count(db_connection, story_id) for story_id in story_ids] == [0, 0]
+
+
+@pytest.mark.anyio
+async def test_removal_of_missing_story_is_not_found(repository: SqlAlchemyStoryRepository) -> None:
+    with pytest.raises(EntityNotFoundException):
+        await repository.remove_by_id(2**31 - 1)
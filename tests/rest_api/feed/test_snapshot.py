@@ -0,0 +1,140 @@
+import asyncio
+import datetime as dt
+from collections.abc import AsyncIterator, Callable
+
+import orjson
+import pytest
+from aioinject import Container
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.modules.story.application.dto import StoryOutDTO
+from app.rest_api.feed.snapshot import StoryFeed, _render_snapshot, story_feed
+from app.seedwork.utils.dt import get_utc_now
+from tests.fakes import FakeStoryRepository, make_story
+
+
+_URL = '/api/feed/stories/'
+
+
+@pytest.fixture(autouse=True)
+def _fast_rebuilds(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings.feed, 'DEBOUNCE_SECONDS', 0)
+    monkeypatch.setattr(settings.feed, 'RETRY_SECONDS', 0.05)
+
+
+@pytest.fixture
+async def feed(container: Container) -> AsyncIterator[StoryFeed]:
+    feed = StoryFeed()
+    task = asyncio.create_task(feed.run(container))
+    try:
+        await _wait_for(lambda: feed.snapshot is not None)
+        yield feed
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    async with asyncio.timeout(2):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+def _ids(feed: StoryFeed, story_type: str | None = None) -> list[str]:
+    assert feed.snapshot is not None
+    return [story['id'] for story in orjson.loads(feed.snapshot.get(story_type).body)['data']]
+
+
+@pytest.mark.anyio
+async def test_snapshot_holds_published_stories_by_type(feed: StoryFeed) -> None:
+    assert _ids(feed) == ['1', '2', '3', '4', '5']
+    assert _ids(feed, 'info') == ['1', '2', '3', '4', '5']
+    assert _ids(feed, 'install') == []
+
+
+@pytest.mark.anyio
+async def test_stale_snapshot_is_rebuilt(feed: StoryFeed, story_repository: FakeStoryRepository) -> None:
+    built = feed.snapshot
+    story_repository.stories[2].is_disabled = True
+    story_repository.stories[6] = make_story(6, story_type='install')
+
+    feed.mark_stale()
+    await _wait_for(lambda: feed.snapshot is not built)
+
+    assert _ids(feed) == ['1', '3', '4', '5', '6']
+    assert _ids(feed, 'install') == ['6']
+    assert feed.snapshot is not None
+    assert feed.snapshot.story_count == 5
+
+
+@pytest.mark.anyio
+async def test_snapshot_is_rebuilt_when_publication_changes(
+    container: Container,
+    story_repository: FakeStoryRepository,
+) -> None:
+    starts_at = get_utc_now() + dt.timedelta(milliseconds=200)
+    story_repository.stories[6] = make_story(6, publication_start_time=starts_at)
+    feed = StoryFeed()
+    task = asyncio.create_task(feed.run(container))
+    try:
+        await _wait_for(lambda: feed.snapshot is not None)
+        assert feed.snapshot is not None
+        assert feed.snapshot.expires_at == starts_at
+        assert '6' not in _ids(feed)
+
+        await _wait_for(lambda: '6' in _ids(feed))
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+@pytest.mark.anyio
+async def test_failed_rebuild_keeps_previous_snapshot(
+    feed: StoryFeed,
+    story_repository: FakeStoryRepository,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    built = feed.snapshot
+    calls = 0
+    get_list = story_repository.get_list
+
+    async def fail_once(*args: object) -> object:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ConnectionError
+        return await get_list(*args)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(story_repository, 'get_list', fail_once)
+    story_repository.stories[2].is_disabled = True
+
+    feed.mark_stale()
+    await _wait_for(lambda: calls == 1)
+    assert feed.snapshot is built
+
+    # Retried after `RETRY_SECONDS`
+    await _wait_for(lambda: feed.snapshot is not built)
+    assert _ids(feed) == ['1', '3', '4', '5']
+
+
+def test_feed_is_served_from_the_snapshot(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(story_feed, 'snapshot', None)
+    assert client.get(_URL).status_code == 503
+
+    stories = [make_story(1), make_story(2, story_type='install')]
+    snapshot = _render_snapshot([StoryOutDTO.from_entity(story) for story in stories], None)
+    monkeypatch.setattr(story_feed, 'snapshot', snapshot)
+
+    response = client.get(_URL, params={'filter[story-type]': 'install'})
+    assert response.status_code == 200
+    assert [story['id'] for story in response.json()['data']] == ['2']
+
+    not_modified = client.get(
+        _URL,
+        params={'filter[story-type]': 'install'},
+        headers={'if-none-match': response.headers['etag']},
+    )
+    assert not_modified.status_code == 304
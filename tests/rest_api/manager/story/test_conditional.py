@@ -0,0 +1,159 @@
+import datetime as dt
+from email.utils import format_datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.fakes import NOW, FakeStoryRepository
+
+
+_URL = '/api/manager/stories/'
+
+
+def _http_date(moment: dt.datetime) -> str:
+    return format_datetime(moment, usegmt=True)
+
+
+def test_story_carries_validators(client: TestClient) -> None:
+    response = client.get(f'{_URL}1/')
+
+    assert response.status_code == 200
+    assert response.headers['etag'].startswith('"')
+    assert response.headers['last-modified'] == _http_date(NOW)
+    assert 'cache-control' in response.headers
+
+
+def test_story_matching_etag_is_not_modified(client: TestClient) -> None:
+    etag = client.get(f'{_URL}1/').headers['etag']
+
+    response = client.get(f'{_URL}1/', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['etag'] == etag
+
+
+def test_story_etag_among_several_is_not_modified(client: TestClient) -> None:
+    etag = client.get(f'{_URL}1/').headers['etag']
+
+    response = client.get(f'{_URL}1/', headers={'If-None-Match': f'"other", {etag}'})
+
+    assert response.status_code == 304
+
+
+def test_story_weak_form_of_its_etag_is_not_modified(client: TestClient) -> None:
+    # If-None-Match uses the weak comparison, RFC 9110 section 13.1.2
+    etag = client.get(f'{_URL}1/').headers['etag']
+
+    response = client.get(f'{_URL}1/', headers={'If-None-Match': f'W/{etag}'})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize('if_none_match', ['"mismatched"', 'W/"mismatched"'])
+def test_story_other_etag_is_served(client: TestClient, if_none_match: str) -> None:
+    response = client.get(f'{_URL}1/', headers={'If-None-Match': if_none_match})
+
+    assert response.status_code == 200
+    assert response.json()['data']['id'] == '1'
+    assert response.headers['etag'] != if_none_match
+
+
+def test_story_etag_depends_on_representation(client: TestClient) -> None:
+    etag = client.get(f'{_URL}1/').headers['etag']
+
+    response = client.get(f'{_URL}1/', params={'include': 'pages'}, headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
+
+
+def test_story_modified_after_etag_is_served(client: TestClient, story_repository: FakeStoryRepository) -> None:
+    etag = client.get(f'{_URL}1/').headers['etag']
+    story_repository.stories[1].modified_at = NOW + dt.timedelta(minutes=1)
+
+    response = client.get(f'{_URL}1/', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
+
+
+@pytest.mark.parametrize(
+    ('since', 'status_code'),
+    [
+        (NOW, 304),
+        (NOW + dt.timedelta(hours=1), 304),
+        (NOW - dt.timedelta(seconds=1), 200),
+    ],
+)
+def test_story_if_modified_since(client: TestClient, since: dt.datetime, status_code: int) -> None:
+    response = client.get(f'{_URL}1/', headers={'If-Modified-Since': _http_date(since)})
+
+    assert response.status_code == status_code
+
+
+def test_story_unparsable_if_modified_since_is_ignored(client: TestClient) -> None:
+    response = client.get(f'{_URL}1/', headers={'If-Modified-Since': 'yesterday'})
+
+    assert response.status_code == 200
+
+
+def test_story_if_none_match_takes_precedence_over_if_modified_since(client: TestClient) -> None:
+    response = client.get(
+        f'{_URL}1/',
+        headers={'If-None-Match': '"mismatched"', 'If-Modified-Since': _http_date(NOW)},
+    )
+
+    assert response.status_code == 200
+
+
+def test_missing_story_with_preconditions_is_not_found(client: TestClient) -> None:
+    response = client.get(f'{_URL}404/', headers={'If-None-Match': '*'})
+
+    assert response.status_code == 404
+
+
+def test_unchanged_list_is_not_modified(client: TestClient) -> None:
+    params = {'limit': 2, 'meta[total]': 'true'}
+    etag = client.get(_URL, params=params).headers['etag']
+
+    response = client.get(_URL, params=params, headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.headers['etag'] == etag
+    assert 'last-modified' not in response.headers
+
+
+def test_list_probe_sees_modified_story(client: TestClient, story_repository: FakeStoryRepository) -> None:
+    etag = client.get(_URL, params={'limit': 2}).headers['etag']
+    story_repository.stories[2].modified_at = NOW + dt.timedelta(minutes=1)
+
+    response = client.get(_URL, params={'limit': 2}, headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
+
+
+def test_list_probe_sees_removed_story(client: TestClient, story_repository: FakeStoryRepository) -> None:
+    etag = client.get(_URL).headers['etag']
+    del story_repository.stories[5]
+
+    response = client.get(_URL, headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert [story['id'] for story in response.json()['data']] == ['1', '2', '3', '4']
+
+
+def test_list_etag_depends_on_query(client: TestClient) -> None:
+    etag = client.get(_URL, params={'limit': 2}).headers['etag']
+
+    response = client.get(_URL, params={'limit': 3}, headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+
+
+def test_list_mismatched_etag_is_served(client: TestClient) -> None:
+    response = client.get(_URL, headers={'If-None-Match': '"mismatched"'})
+
+    assert response.status_code == 200
+    assert len(response.json()['data']) == 5
@@ -0,0 +1,47 @@
+import dataclasses
+import datetime as dt
+from collections.abc import Iterator
+
+import orjson
+import pytest
+
+from app.modules.story.application.dto import StoryOutDTO
+from app.rest_api.manager.story.documents import render_story_document, story_document_cache
+from tests.fakes import NOW, make_story
+
+
+@pytest.fixture(autouse=True)
+def _clear_document_cache() -> Iterator[None]:
+    story_document_cache.clear()
+    yield
+    story_document_cache.clear()
+
+
+def test_document_is_reused_while_version_is_unchanged() -> None:
+    story = StoryOutDTO.from_entity(make_story(1))
+
+    first = render_story_document(story)
+    second = render_story_document(dataclasses.replace(story, name='Unversioned edit'))
+
+    assert second is first
+
+
+def test_newer_version_is_rendered_again() -> None:
+    story = StoryOutDTO.from_entity(make_story(1))
+    render_story_document(story)
+
+    updated = dataclasses.replace(story, name='Renamed', modified_at=NOW + dt.timedelta(seconds=1))
+    document = orjson.loads(render_story_document(updated))
+
+    assert document['data']['attributes']['name'] == 'Renamed'
+
+
+def test_representations_are_cached_separately() -> None:
+    story = StoryOutDTO.from_entity(make_story(1))
+
+    full = orjson.loads(render_story_document(story, include_pages=True))
+    sparse = orjson.loads(render_story_document(story, fields=frozenset({'name'})))
+
+    assert [page['id'] for page in full['included']] == ['101']
+    assert sparse['data']['attributes'] == {'name': 'Story 1'}
+    assert 'included' not in sparse
@@ -0,0 +1,131 @@
+import datetime as dt
+from typing import Any
+
+import orjson
+import pytest
+
+from app.modules.story.application.dto import StoryOutDTO
+from app.modules.story.domain.entities import PageEntity
+from app.rest_api.manager.page.schemas import PageObject
+from app.rest_api.manager.story.encoders import encode_story_document, encode_story_list_document
+from app.rest_api.manager.story.schemas import (
+    LimitOffsetPaginationMeta,
+    PaginationLinks,
+    StoryJsonApi,
+    StoryListJsonApi,
+    StoryObject,
+)
+from app.rest_api.utils import to_kebab_case
+from app.seedwork.utils.types import DictStrAny
+from tests.fakes import NOW, make_story
+
+
+_STORIES = [
+    StoryOutDTO.from_entity(make_story(1)),
+    StoryOutDTO.from_entity(
+        make_story(
+            2,
+            delay=15,
+            is_preview=True,
+            publication_start_time=NOW,
+            publication_end_time=NOW + dt.timedelta(days=7),
+            pages=[
+                PageEntity(id=201, created_at=NOW, modified_at=None, story_id=2),
+                PageEntity(id=202, created_at=None, modified_at=None, story_id=2),
+            ],
+        ),
+    ),
+    StoryOutDTO.from_entity(make_story(3, pages=[])),
+]
+
+_FIELDSETS = [
+    None,
+    frozenset({'name'}),
+    frozenset({'name', 'delay', 'pages'}),
+    frozenset({'publication_start_time', 'publication_end_time'}),
+    frozenset(),
+]
+
+
+def _dump(model: Any) -> DictStrAny:
+    return model.model_dump(mode='json', by_alias=True, exclude_unset=True, exclude_none=True)
+
+
+def _included(stories: list[StoryOutDTO]) -> list[PageObject]:
+    return [PageObject.from_dto(page) for story in stories for page in story.pages or ()]
+
+
+def _trim(
+    resource: DictStrAny,
+    fields: frozenset[str] | None,
+    *,
+    relationships: bool = True,
+) -> DictStrAny:
+    """`resource` restricted to a sparse fieldset, as the encoders apply it."""
+    if fields is None:
+        return resource
+    keys = {to_kebab_case(name) for name in fields}
+    trimmed = {**resource, 'attributes': {k: v for k, v in resource['attributes'].items() if k in keys}}
+    if relationships and 'pages' not in fields:
+        trimmed.pop('relationships', None)
+    return trimmed
+
+
+@pytest.mark.parametrize('story', _STORIES, ids=lambda story: f'story-{story.id}')
+@pytest.mark.parametrize('include_pages', [False, True])
+def test_story_document_matches_schema_dump(story: StoryOutDTO, include_pages: bool) -> None:
+    expected = StoryJsonApi(
+        data=StoryObject.from_dto(story),
+        **({'included': _included([story])} if include_pages else {}),
+    )
+
+    encoded = encode_story_document(story, include_pages=include_pages)
+
+    assert orjson.loads(encoded) == _dump(expected)
+
+
+@pytest.mark.parametrize('links', [None, PaginationLinks(next='/api/stories/?page[after]=3')])
+@pytest.mark.parametrize('include_pages', [False, True])
+def test_story_list_document_matches_schema_dump(links: PaginationLinks | None, include_pages: bool) -> None:
+    meta = LimitOffsetPaginationMeta(limit=10, offset=0, total=len(_STORIES))
+    expected = StoryListJsonApi(
+        meta=meta,
+        data=[StoryObject.from_dto(story) for story in _STORIES],
+        **({'links': links} if links is not None else {}),
+        **({'included': _included(_STORIES)} if include_pages else {}),
+    )
+
+    encoded = encode_story_list_document(
+        _STORIES,
+        _dump(meta),
+        _dump(links) if links is not None else None,
+        include_pages=include_pages,
+    )
+
+    assert orjson.loads(encoded) == _dump(expected)
+
+
+def test_empty_story_list_document_matches_schema_dump() -> None:
+    meta = LimitOffsetPaginationMeta(limit=10, offset=20, total=3)
+    expected = StoryListJsonApi(meta=meta, data=[])
+
+    assert orjson.loads(encode_story_list_document([], _dump(meta))) == _dump(expected)
+
+
+@pytest.mark.parametrize('fields', _FIELDSETS, ids=repr)
+@pytest.mark.parametrize('page_fields', [None, frozenset({'created_at'}), frozenset()], ids=repr)
+def test_sparse_fieldsets_trim_schema_dump(
+    fields: frozenset[str] | None,
+    page_fields: frozenset[str] | None,
+) -> None:
+    story = _STORIES[1]
+    full = _dump(StoryJsonApi(data=StoryObject.from_dto(story), included=_included([story])))
+
+    encoded = orjson.loads(
+        encode_story_document(story, include_pages=True, fields=fields, page_fields=page_fields),
+    )
+
+    assert encoded == {
+        'data': _trim(full['data'], fields),
+        'included': [_trim(page, page_fields, relationships=False) for page in full['included']],
+    }
@@ -0,0 +1,86 @@
+from collections.abc import AsyncIterator
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.modules.story.application.dto import StoryOutDTO
+from app.rest_api.manager.story.encoders import stream_story_list_document, stream_story_ndjson
+from tests.fakes import FakeStoryRepository, make_story
+
+
+_URL = '/api/manager/stories/export/'
+
+
+async def _chunks(*sizes: int) -> AsyncIterator[list[StoryOutDTO]]:
+    next_id = 1
+    for size in sizes:
+        yield [StoryOutDTO.from_entity(make_story(id_)) for id_ in range(next_id, next_id + size)]
+        next_id += size
+
+
+async def _collect(pieces: AsyncIterator[bytes]) -> list[bytes]:
+    return [piece async for piece in pieces]
+
+
+@pytest.fixture
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings.story, 'EXPORT_CHUNK_SIZE', 2)
+
+
+@pytest.mark.anyio
+async def test_ndjson_chunks_end_on_line_boundaries() -> None:
+    pieces = await _collect(stream_story_ndjson(_chunks(2, 2, 1)))
+
+    assert [piece.count(b'\n') for piece in pieces] == [2, 2, 1]
+    assert all(piece.endswith(b'\n') for piece in pieces)
+    lines = b''.join(pieces).splitlines()
+    assert [orjson.loads(line)['id'] for line in lines] == ['1', '2', '3', '4', '5']
+
+
+@pytest.mark.anyio
+async def test_document_chunks_are_joined_with_separators() -> None:
+    pieces = await _collect(stream_story_list_document(_chunks(2, 0, 1)))
+
+    document = orjson.loads(b''.join(pieces))
+    assert [story['id'] for story in document['data']] == ['1', '2', '3']
+
+
+@pytest.mark.anyio
+async def test_empty_stream_is_valid() -> None:
+    assert await _collect(stream_story_ndjson(_chunks())) == []
+    assert orjson.loads(b''.join(await _collect(stream_story_list_document(_chunks())))) == {'data': []}
+
+
+@pytest.mark.usefixtures('small_chunks')
+def test_export_streams_every_story_as_ndjson(client: TestClient) -> None:
+    response = client.get(_URL)
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    lines = response.content.splitlines()
+    assert [orjson.loads(line)['id'] for line in lines] == ['1', '2', '3', '4', '5']
+
+
+@pytest.mark.usefixtures('small_chunks')
+def test_export_streams_jsonapi_document(client: TestClient) -> None:
+    response = client.get(_URL, params={'format': 'jsonapi', 'ordering': '-id'})
+
+    assert response.status_code == 200
+    assert [story['id'] for story in response.json()['data']] == ['5', '4', '3', '2', '1']
+
+
+@pytest.mark.parametrize(('format_', 'body'), [('ndjson', b''), ('jsonapi', b'{"data":[]}')])
+def test_export_of_no_stories(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+    format_: str,
+    body: bytes,
+) -> None:
+    story_repository.stories.clear()
+
+    response = client.get(_URL, params={'format': format_})
+
+    assert response.status_code == 200
+    assert response.content == body
@@ -0,0 +1,84 @@
+import pytest
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from app.rest_api.pagination import encode_cursor
+from tests.fakes import FakeStoryRepository, make_story
+
+
+_URL = '/api/manager/stories/'
+
+
+@pytest.fixture(autouse=True)
+def _seven_stories(story_repository: FakeStoryRepository) -> None:
+    story_repository.stories.update({id_: make_story(id_) for id_ in range(6, 8)})
+
+
+def _ids(response: Response) -> list[str]:
+    assert response.status_code == 200, response.json()
+    return [story['id'] for story in response.json()['data']]
+
+
+def _links(response: Response) -> dict[str, str]:
+    return response.json().get('links') or {}
+
+
+def test_pages_are_walked_forwards_and_backwards_through_links(client: TestClient) -> None:
+    first = client.get(_URL, params={'limit': 3})
+    assert _ids(first) == ['1', '2', '3']
+    assert 'prev' not in _links(first)
+
+    second = client.get(_links(first)['next'])
+    assert _ids(second) == ['4', '5', '6']
+
+    last = client.get(_links(second)['next'])
+    assert _ids(last) == ['7']
+    assert 'next' not in _links(last)
+
+    back = client.get(_links(last)['prev'])
+    assert _ids(back) == ['4', '5', '6']
+    start = client.get(_links(back)['prev'])
+    assert _ids(start) == ['1', '2', '3']
+    assert 'prev' not in _links(start)
+
+
+def test_links_keep_the_other_query_parameters(client: TestClient) -> None:
+    first = client.get(_URL, params={'limit': 2, 'ordering': '-id', 'filter[story-type]': 'info'})
+
+    second = client.get(_links(first)['next'])
+
+    assert _ids(second) == ['5', '4']
+    assert 'filter%5Bstory-type%5D=info' in _links(first)['next']
+
+
+def test_single_page_has_no_links(client: TestClient) -> None:
+    response = client.get(_URL, params={'limit': 10})
+
+    assert len(_ids(response)) == 7
+    assert not _links(response)
+
+
+@pytest.mark.parametrize(
+    'token',
+    [
+        'not a cursor',
+        encode_cursor(3),
+        encode_cursor(3, 3, 3),
+        'WyJ4IiwgM10',  # ["x", 3]
+        encode_cursor(3, 3)[:-2],
+    ],
+    ids=['garbage', 'short', 'long', 'non-integer', 'truncated'],
+)
+@pytest.mark.parametrize('param', ['page[after]', 'page[before]'])
+def test_malformed_cursor_is_rejected(client: TestClient, param: str, token: str) -> None:
+    response = client.get(_URL, params={param: token})
+
+    assert response.status_code == 400
+    [error] = response.json()['errors']
+    assert error['source'] == {'parameter': param}
+
+
+def test_cursor_cannot_be_combined_with_offset(client: TestClient) -> None:
+    response = client.get(_URL, params={'page[after]': encode_cursor(3, 3), 'offset': 1})
+
+    assert response.status_code == 400
@@ -0,0 +1,264 @@
+import pytest
+from aioinject import Container
+from aioinject.providers import Object
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from app.modules.story.domain.repositories import ReadOnlyStoryRepository
+from app.seedwork.utils.types import DictStrAny
+from tests.fakes import NOW, FakeStoryCache, FakeStoryRepository, make_story
+
+
+_URL = '/api/manager/stories/'
+
+
+def test_sparse_fieldset_trims_story(client: TestClient) -> None:
+    response = client.get(f'{_URL}1/', params={'fields[stories]': 'name,story-type'})
+
+    assert response.status_code == 200
+    data = response.json()['data']
+    assert data['attributes'] == {'name': 'Story 1', 'story-type': 'info'}
+    assert 'relationships' not in data
+
+
+def test_sparse_fieldset_trims_listed_stories_and_pages(client: TestClient) -> None:
+    response = client.get(
+        _URL,
+        params={'include': 'pages', 'fields[stories]': 'name,pages', 'fields[pages]': 'created-at'},
+    )
+
+    assert response.status_code == 200
+    document = response.json()
+    assert {tuple(story['attributes']) for story in document['data']} == {('name',)}
+    assert all('relationships' in story for story in document['data'])
+    assert {tuple(page['attributes']) for page in document['included']} == {('created-at',)}
+
+
+def test_unknown_sparse_field_is_rejected(client: TestClient) -> None:
+    response = client.get(f'{_URL}1/', params={'fields[stories]': 'name,colour'})
+
+    assert response.status_code == 400
+    [error] = response.json()['errors']
+    assert error['source'] == {'parameter': 'fields[stories]'}
+
+
+def _patch(client: TestClient, story_id: int, attributes: DictStrAny) -> Response:
+    return client.patch(
+        f'{_URL}{story_id}/',
+        json={'data': {'type': 'stories', 'id': str(story_id), 'attributes': attributes}},
+    )
+
+
+def test_patch_changes_only_given_attributes(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+    story_cache: FakeStoryCache,
+) -> None:
+    story_repository.stories[1] = make_story(1, delay=5, publication_start_time=NOW)
+
+    response = _patch(client, 1, {'name': 'Renamed', 'is-blocking': True})
+
+    assert response.status_code == 200
+    attributes = response.json()['data']['attributes']
+    assert attributes['name'] == 'Renamed'
+    assert attributes['is-blocking'] is True
+    assert attributes['delay'] == 5
+    assert attributes['story-type'] == 'info'
+    assert attributes['publication-start-time'] == '2024-01-01T00:00:00Z'
+    story = story_repository.stories[1]
+    assert (story.name, story.is_blocking, story.delay) == ('Renamed', True, 5)
+    assert story_cache.invalidated == [1]
+
+
+def test_patch_can_clear_nullable_attribute(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+) -> None:
+    story_repository.stories[1].delay = 5
+
+    response = _patch(client, 1, {'delay': None})
+
+    assert response.status_code == 200
+    assert story_repository.stories[1].delay is None
+
+
+def test_patch_cannot_clear_required_attribute(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+) -> None:
+    response = _patch(client, 1, {'name': None})
+
+    assert response.status_code == 400
+    assert story_repository.stories[1].name == 'Story 1'
+
+
+def test_patch_of_missing_story_is_not_found(client: TestClient, story_cache: FakeStoryCache) -> None:
+    response = _patch(client, 404, {'name': 'Renamed'})
+
+    assert response.status_code == 404
+    assert story_cache.invalidated == []
+
+
+def test_patch_with_other_id_in_body_conflicts(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+    story_cache: FakeStoryCache,
+) -> None:
+    response = client.patch(
+        f'{_URL}1/',
+        json={'data': {'type': 'stories', 'id': '2', 'attributes': {'name': 'Renamed'}}},
+    )
+
+    assert response.status_code == 409
+    [error] = response.json()['errors']
+    assert error['detail'] == 'Resource id 2 does not match the URL id 1'
+    assert [story_repository.stories[id_].name for id_ in (1, 2)] == ['Story 1', 'Story 2']
+    assert story_cache.invalidated == []
+
+
+def test_patch_of_single_bound_is_checked_against_stored_one(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+) -> None:
+    story_repository.stories[1].publication_start_time = NOW
+
+    response = _patch(client, 1, {'publication-end-time': '2023-12-31T00:00:00Z'})
+
+    assert response.status_code == 409
+    [error] = response.json()['errors']
+    assert error['detail'] == (
+        'publication-end-time of story 1 must not be earlier than its publication-start-time'
+    )
+    assert story_repository.stories[1].publication_end_time is None
+
+
+def test_patch_of_single_bound_after_stored_one(client: TestClient, story_repository: FakeStoryRepository) -> None:
+    story_repository.stories[1].publication_start_time = NOW
+
+    response = _patch(client, 1, {'publication-end-time': '2024-01-02T00:00:00Z'})
+
+    assert response.status_code == 200
+    assert response.json()['data']['attributes']['publication-end-time'] == '2024-01-02T00:00:00Z'
+
+
+def test_patch_of_inverted_window_is_rejected(client: TestClient) -> None:
+    response = _patch(
+        client,
+        1,
+        {'publication-start-time': '2024-01-02T00:00:00Z', 'publication-end-time': '2024-01-01T00:00:00Z'},
+    )
+
+    assert response.status_code == 400
+
+
+def _listed_ids(response: Response) -> list[str]:
+    assert response.status_code == 200
+    return [story['id'] for story in response.json()['data']]
+
+
+def test_list_is_filtered_and_counted(client: TestClient, story_repository: FakeStoryRepository) -> None:
+    story_repository.stories[2] = make_story(2, story_type='promo')
+    story_repository.stories[3] = make_story(3, story_type='promo', is_disabled=True)
+    story_repository.stories[4] = make_story(4, story_type='promo')
+
+    params = {'filter[story-type]': 'promo', 'filter[is-disabled]': 'false', 'limit': 1, 'meta[total]': 'true'}
+
+    response = client.get(_URL, params=params)
+
+    assert _listed_ids(response) == ['2']
+    assert response.json()['meta'] == {'limit': 1, 'offset': 0, 'total': 2}
+
+
+def test_list_leaves_out_total_unless_asked(client: TestClient) -> None:
+    response = client.get(_URL)
+
+    assert 'total' not in response.json()['meta']
+
+
+def test_list_does_not_advertise_unapplied_filters(client: TestClient) -> None:
+    schema = client.get('/docs/oss/openapi.json').json()
+    parameters = schema['paths']['/api/manager/stories/']['get']['parameters']
+
+    names = {parameter['name'] for parameter in parameters}
+    assert {'filter[story-type]', 'filter[is-published]', 'filter[is-disabled]'} <= names
+    assert not names & {'filter[platform-id]', 'filter[app-version]', 'filter[segment]'}
+
+
+def test_story_detail_misses_are_read_from_the_primary(
+    client: TestClient,
+    container: Container,
+    story_cache: FakeStoryCache,
+) -> None:
+    # A replica that has not caught up with story 1 yet
+    with container.override(Object(FakeStoryRepository(), ReadOnlyStoryRepository)):
+        response = client.get(f'{_URL}1/')
+
+    assert response.status_code == 200
+    assert story_cache.cached == [1]
+
+
+def test_included_pages_of_listed_stories(client: TestClient, story_repository: FakeStoryRepository) -> None:
+    story_repository.stories[2].pages = []
+
+    response = client.get(_URL, params={'include': 'pages', 'limit': 3})
+
+    assert response.status_code == 200
+    document = response.json()
+    included = [(page['type'], page['id']) for page in document['included']]
+    assert included == [('pages', '101'), ('pages', '103')]
+    relationships = [story['relationships']['pages']['data'] for story in document['data']]
+    assert relationships == [[{'type': 'pages', 'id': '101'}], [], [{'type': 'pages', 'id': '103'}]]
+
+
+def test_included_pages_of_story(client: TestClient) -> None:
+    response = client.get(f'{_URL}1/', params={'include': 'pages'})
+
+    assert response.status_code == 200
+    [page] = response.json()['included']
+    assert page['id'] == '101'
+    assert page['attributes']['created-at'] == '2024-01-01T00:00:00Z'
+
+
+def test_pages_are_not_included_unless_asked(client: TestClient) -> None:
+    response = client.get(_URL)
+
+    assert response.status_code == 200
+    assert 'included' not in response.json()
+
+
+@pytest.mark.parametrize('url', [_URL, f'{_URL}1/'])
+@pytest.mark.parametrize('include', ['author', 'pages,author', 'pages.story'])
+def test_unknown_include_is_rejected(client: TestClient, url: str, include: str) -> None:
+    response = client.get(url, params={'include': include})
+
+    assert response.status_code == 400
+    [error] = response.json()['errors']
+    assert error['source'] == {'parameter': 'include'}
+
+
+def test_delete_removes_story(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+    story_cache: FakeStoryCache,
+) -> None:
+    response = client.delete(f'{_URL}1/')
+
+    assert response.status_code == 204
+    assert response.content == b''
+    assert 1 not in story_repository.stories
+    assert story_cache.invalidated == [1]
+    assert client.get(f'{_URL}1/').status_code == 404
+
+
+def test_delete_of_missing_story_is_not_found(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+    story_cache: FakeStoryCache,
+) -> None:
+    response = client.delete(f'{_URL}404/')
+
+    assert response.status_code == 404
+    [error] = response.json()['errors']
+    assert error['status'] == '404'
+    assert sorted(story_repository.stories) == [1, 2, 3, 4, 5]
+    assert story_cache.invalidated == []
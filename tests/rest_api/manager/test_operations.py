@@ -0,0 +1,154 @@
+import json
+
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from app.rest_api.responses import JSON_API_ATOMIC_MEDIA_TYPE
+from app.seedwork.utils.types import DictStrAny
+from tests.fakes import FakeStoryCache, FakeStoryRepository
+
+
+_URL = '/api/manager/operations/'
+
+_ATTRIBUTES: DictStrAny = {
+    'name': 'Summer sale',
+    'story-type': 'promo',
+    'delay': None,
+    'is-disabled': False,
+    'is-blocking': False,
+    'is-preview': False,
+    'is-repetitive': False,
+    'is-autoscroll': False,
+    'publication-start-time': None,
+    'publication-end-time': None,
+}
+
+
+def _post(client: TestClient, *operations: DictStrAny) -> Response:
+    return client.post(
+        _URL,
+        content=json.dumps({'atomic:operations': list(operations)}),
+        headers={'content-type': JSON_API_ATOMIC_MEDIA_TYPE},
+    )
+
+
+def _add() -> DictStrAny:
+    return {'op': 'add', 'data': {'type': 'stories', 'attributes': _ATTRIBUTES}}
+
+
+def _update(id_: int, name: str) -> DictStrAny:
+    return {
+        'op': 'update',
+        'data': {'type': 'stories', 'id': id_, 'attributes': {**_ATTRIBUTES, 'name': name}},
+    }
+
+
+def _remove(id_: int) -> DictStrAny:
+    return {'op': 'remove', 'ref': {'type': 'stories', 'id': id_}}
+
+
+def test_operations_are_applied_in_order(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+    story_cache: FakeStoryCache,
+) -> None:
+    response = _post(client, _add(), _update(1, 'Renamed'), _remove(2))
+
+    assert response.status_code == 200
+    results = response.json()['atomic:results']
+    assert [result.get('data', {}).get('id') for result in results] == ['6', '1', None]
+    assert story_repository.stories[1].name == 'Renamed'
+    assert 2 not in story_repository.stories
+    assert sorted(story_cache.invalidated) == [1, 2, 6]
+
+
+def test_failed_operation_rolls_back_the_batch(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+    story_cache: FakeStoryCache,
+) -> None:
+    response = _post(client, _add(), _update(1, 'Renamed'), _update(99, 'Missing'), _remove(2))
+
+    assert response.status_code == 404
+    [error] = response.json()['errors']
+    assert error['source'] == {'pointer': '/atomic:operations/2'}
+    assert error['detail'] == 'stories with id 99 not found'
+    assert sorted(story_repository.stories) == [1, 2, 3, 4, 5]
+    assert story_repository.stories[1].name == 'Story 1'
+    assert story_cache.invalidated == []
+
+
+def test_every_missing_target_is_reported(client: TestClient, story_repository: FakeStoryRepository) -> None:
+    response = _post(client, _remove(1), _remove(98), _remove(99))
+
+    assert response.status_code == 404
+    pointers = [error['source']['pointer'] for error in response.json()['errors']]
+    assert pointers == ['/atomic:operations/1', '/atomic:operations/2']
+    assert 1 in story_repository.stories
+
+
+def test_invalid_operation_points_at_its_position(client: TestClient) -> None:
+    invalid = {**_remove(1), 'data': _add()['data']}
+
+    response = _post(client, _add(), invalid)
+
+    assert response.status_code == 400
+    [error] = response.json()['errors']
+    assert error['source'] == {'pointer': '/atomic:operations/1'}
+
+
+def test_update_changes_only_given_attributes(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+    story_cache: FakeStoryCache,
+) -> None:
+    story_repository.stories[1].delay = 5
+    def disable(id_: int) -> DictStrAny:
+        return {
+            'op': 'update',
+            'ref': {'type': 'stories', 'id': id_},
+            'data': {'attributes': {'is-disabled': True}},
+        }
+
+    response = _post(client, disable(1), disable(2))
+
+    assert response.status_code == 200
+    [first, second] = response.json()['atomic:results']
+    assert first['data']['attributes']['is-disabled'] is True
+    assert first['data']['attributes']['name'] == 'Story 1'
+    assert first['data']['attributes']['delay'] == 5
+    assert second['data']['id'] == '2'
+    assert story_repository.stories[1].delay == 5
+    assert story_repository.stories[2].is_disabled is True
+    assert sorted(story_cache.invalidated) == [1, 2]
+
+
+def test_every_missing_update_target_is_reported(client: TestClient) -> None:
+    response = _post(client, _update(98, 'Missing'), _update(1, 'Renamed'), _update(99, 'Missing'))
+
+    assert response.status_code == 404
+    pointers = [error['source']['pointer'] for error in response.json()['errors']]
+    assert pointers == ['/atomic:operations/0', '/atomic:operations/2']
+
+
+def test_update_cannot_null_required_attribute(
+    client: TestClient,
+    story_repository: FakeStoryRepository,
+) -> None:
+    response = _post(client, {'op': 'update', 'data': {'id': 1, 'attributes': {'name': None}}})
+
+    assert response.status_code == 400
+    assert story_repository.stories[1].name == 'Story 1'
+
+
+def test_add_requires_every_attribute(client: TestClient, story_repository: FakeStoryRepository) -> None:
+    attributes = dict(_ATTRIBUTES)
+    del attributes['delay'], attributes['story-type']
+
+    response = _post(client, {'op': 'add', 'data': {'type': 'stories', 'attributes': attributes}})
+
+    assert response.status_code == 400
+    [error] = response.json()['errors']
+    assert error['source'] == {'pointer': '/atomic:operations/0'}
+    assert 'missing: delay, story-type' in error['detail']
+    assert sorted(story_repository.stories) == [1, 2, 3, 4, 5]
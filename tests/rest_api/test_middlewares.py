@@ -0,0 +1,60 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infrastructure.db.manager import DatabaseSessionManager, _primary_pinned
+from app.modules.story.domain.entities import StoryEntity
+from tests.fakes import FakeStoryRepository
+
+
+_URL = '/api/manager/stories/'
+
+
+@pytest.fixture
+def read_pins(monkeypatch: pytest.MonkeyPatch, story_repository: FakeStoryRepository) -> list[bool]:
+    """Whether each story lookup ran pinned to the primary, with a replica configured."""
+    monkeypatch.setattr(DatabaseSessionManager, 'has_replicas', property(lambda _: True))
+    pins: list[bool] = []
+    get_by_id = story_repository.get_by_id
+
+    async def record_pin(id_: int) -> StoryEntity:
+        pins.append(_primary_pinned.get())
+        return await get_by_id(id_)
+
+    monkeypatch.setattr(story_repository, 'get_by_id', record_pin)
+    return pins
+
+
+def _patch_name(client: TestClient, story_id: int, name: str) -> int:
+    response = client.patch(
+        f'{_URL}{story_id}/',
+        json={'data': {'type': 'stories', 'id': str(story_id), 'attributes': {'name': name}}},
+    )
+    return response.status_code
+
+
+def test_reads_after_a_write_are_pinned_to_primary(client: TestClient, read_pins: list[bool]) -> None:
+    assert client.get(f'{_URL}1/').status_code == 200
+
+    assert _patch_name(client, 1, 'Renamed') == 200
+    assert 'db-primary-until' in client.cookies
+    read_pins.clear()
+    client.get(f'{_URL}1/')
+
+    assert read_pins == [True]
+
+
+def test_failed_write_does_not_pin(client: TestClient, read_pins: list[bool]) -> None:
+    assert _patch_name(client, 99, 'Missing') == 404
+    assert 'db-primary-until' not in client.cookies
+    read_pins.clear()
+    client.get(f'{_URL}1/')
+
+    assert read_pins == [False]
+
+
+def test_expired_pin_reads_from_replicas(client: TestClient, read_pins: list[bool]) -> None:
+    client.cookies.set('db-primary-until', '0')
+
+    client.get(f'{_URL}1/')
+
+    assert read_pins == [False]